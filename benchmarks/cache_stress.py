@@ -0,0 +1,176 @@
+"""
+Stress test of the price cache under a threaded server workload.
+
+Usage:
+    python benchmarks/cache_stress.py [--threads 32] [--requests 200] [--tickers 100]
+
+Many threads look up price histories in a shared PriceCache, fetching the missing
+and expired ones from a local stand-in for the price server. The pooled
+configuration (WAL, connection per thread, batched access times) is compared with
+a baseline that uses a rollback journal and writes the access time of every read,
+like the cache did before it was shared across threads.
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import requests
+
+from dafin.price_cache import PriceCache
+
+# Configurations of the cache under test
+CONFIGS = {
+    "baseline": {"wal": False, "touch_batch": 1},
+    "pooled": {"wal": True},
+}
+
+
+def price_history(ticker: str, n_days: int = 250) -> pd.DataFrame:
+    """
+    Generates a deterministic synthetic price history of a ticker.
+
+    Parameters:
+        ticker (str): The ticker.
+        n_days (int, optional): Number of bars. Defaults to 250.
+
+    Returns:
+        pd.DataFrame: The Open and Close prices.
+    """
+
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+    close = 100 * np.cumprod(1 + rng.normal(0.0005, 0.01, n_days))
+    index = pd.bdate_range("2020-01-01", periods=n_days)
+    return pd.DataFrame({"Open": close, "Close": close}, index=index)
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = price_history(self.path.rsplit("/", 1)[-1]).to_csv().encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(config: dict, args, url: str) -> dict:
+    """
+    Runs the workload against a new cache.
+
+    Parameters:
+        config (dict): Arguments of PriceCache.
+        args (argparse.Namespace): The workload parameters.
+        url (str): The address of the stand-in server.
+
+    Returns:
+        dict: The throughput in requests per second and the latency percentiles in
+            milliseconds.
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = PriceCache(Path(tmp_dir) / "prices.sqlite", **config)
+        rng = np.random.default_rng(args.seed)
+        tickers = [f"T{i}" for i in range(args.tickers)]
+
+        # Zipf-like popularity, as in a dashboard where a few tickers dominate
+        weights = 1 / np.arange(1, args.tickers + 1)
+        workloads = [
+            rng.choice(tickers, size=args.requests, p=weights / weights.sum())
+            for _ in range(args.threads)
+        ]
+        latencies = [[] for _ in range(args.threads)]
+        errors = []
+        barrier = threading.Barrier(args.threads)
+
+        def worker(i):
+            session = requests.Session()
+            barrier.wait()
+            try:
+                for ticker in workloads[i]:
+                    start = time.perf_counter()
+                    prices, fresh = cache.get(ticker)
+                    if prices is None or not fresh:
+                        response = session.get(f"{url}/{ticker}")
+                        response.raise_for_status()
+                        prices = pd.read_csv(
+                            io.StringIO(response.text), index_col=0, parse_dates=True
+                        )
+                        cache.put(ticker, prices)
+                    latencies[i].append(time.perf_counter() - start)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=worker, args=(i,)) for i in range(args.threads)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        cache.close()
+
+    if errors:
+        raise errors[0]
+
+    latencies = np.concatenate(latencies) * 1000
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": float(np.percentile(latencies, 50)),
+        "p95": float(np.percentile(latencies, 95)),
+        "p99": float(np.percentile(latencies, 99)),
+    }
+
+
+def main(argv=None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/prices"
+
+    results = {}
+    try:
+        for name, config in CONFIGS.items():
+            runs = [run(config, args, url) for _ in range(args.repeat)]
+            results[name] = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+    finally:
+        server.shutdown()
+
+    print(f"{'config':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<10}{result['throughput']:>10.0f}{result['p50']:>10.2f}"
+            f"{result['p95']:>10.2f}{result['p99']:>10.2f}"
+        )
+
+    baseline, pooled = results["baseline"], results["pooled"]
+    print(
+        f"\nThroughput x{pooled['throughput'] / baseline['throughput']:.2f}, "
+        f"p99 latency x{baseline['p99'] / pooled['p99']:.2f} lower"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Times the hot paths of dafin on synthetic return panels, fully offline.
+
+Usage:
+    python benchmarks/hot_paths.py [--sizes 10x252 100x1260] [--repeat 3]
+                                   [--baseline benchmarks/baselines.json]
+                                   [--save] [--threshold 0.25] [--filter beta]
+
+Each case is timed on every panel size (assets x days) of the grid. With --save the
+timings are stored as the baseline; otherwise they are compared with the stored
+baseline, and the run fails if any case is slower by more than the threshold, if the
+baseline file is missing, or if a case has no stored timing (see make bench_baseline).
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from dafin import Performance, SyntheticMarket, screen
+from dafin.plot import Plot
+from dafin.utils import (
+    calc_returns_cum,
+    calculate_alpha,
+    calculate_beta,
+    calculate_sharpe_ratio,
+    calculate_tail_risk,
+    calculate_treynor_ratio,
+    price_to_return,
+    regression,
+    rolling_tail_risk,
+)
+
+DEFAULT_SIZES = ["10x252", "100x1260"]
+DEFAULT_BASELINE = Path(__file__).parent / "baselines.json"
+
+
+def synthetic_panel(n_assets: int, n_days: int, seed: int = 0) -> dict:
+    """
+    Generates a synthetic panel of prices and returns, with a risk-free asset and the
+    market factor as benchmark, see `dafin.synthetic.SyntheticMarket`.
+
+    Parameters:
+        n_assets (int): Number of assets.
+        n_days (int): Number of trading days.
+        seed (int, optional): Seed of the random generator. Defaults to 0.
+
+    Returns:
+        dict: The prices and returns of the assets, risk-free asset and benchmark.
+    """
+
+    market = SyntheticMarket(n_assets=n_assets, n_days=n_days + 1, seed=seed)
+    prices = market.prices()
+
+    returns = price_to_return(prices)
+    return {
+        "prices": prices,
+        "returns": returns,
+        "rf": pd.DataFrame({"RiskFree": np.full(n_days, 0.0001)}, returns.index),
+        "benchmark": market.factor_returns().set_axis(["Benchmark"], axis=1),
+    }
+
+
+def plot_case(method: str, **kwargs):
+    """
+    Returns a benchmark case that draws a plot and closes its figure.
+
+    Parameters:
+        method (str): The name of the Plot method.
+        **kwargs: Arguments of the method, as functions of the panel.
+
+    Returns:
+        Callable: The benchmark case.
+    """
+
+    def case(panel, performance):
+        fig, _ = getattr(Plot(), method)(
+            **{k: v(panel, performance) for k, v in kwargs.items()}
+        )
+        plt.close(fig)
+
+    return case
+
+
+def add_assets_case(performance, returns):
+    """
+    Adds one asset to a shallow copy of the Performance, leaving the shared one as is.
+    """
+
+    performance_copy = Performance.__new__(Performance)
+    performance_copy.__dict__.update(performance.__dict__)
+    performance_copy.add_assets(returns.rename(columns=lambda c: f"{c}_added"))
+
+
+CASES = {
+    "price_to_return": lambda d, p: price_to_return(d["prices"]),
+    "calc_returns_cum": lambda d, p: calc_returns_cum(d["returns"]),
+    "calculate_beta": lambda d, p: calculate_beta(d["returns"], d["benchmark"]),
+    "calculate_alpha": lambda d, p: calculate_alpha(
+        d["returns"], d["rf"], d["benchmark"]
+    ),
+    "regression": lambda d, p: regression(d["returns"], d["benchmark"]),
+    "calculate_sharpe_ratio": lambda d, p: calculate_sharpe_ratio(
+        d["returns"], d["rf"]
+    ),
+    "calculate_treynor_ratio": lambda d, p: calculate_treynor_ratio(
+        d["returns"], d["rf"], d["benchmark"]
+    ),
+    "calculate_tail_risk": lambda d, p: calculate_tail_risk(d["returns"], [0.95, 0.99]),
+    "rolling_tail_risk": lambda d, p: rolling_tail_risk(d["returns"], 60, [0.95, 0.99]),
+    "Performance.__init__": lambda d, p: Performance(
+        d["returns"], d["rf"], d["benchmark"]
+    ),
+    "Performance.summary": lambda d, p: p.summary,
+    "Performance.add_assets": lambda d, p: add_assets_case(p, d["benchmark"]),
+    "screen": lambda d, p: screen(
+        d["returns"], "Sharpe Ratio", "M", k=10, returns_rf=d["rf"]
+    ),
+    "Plot.plot_box": plot_case("plot_box", df=lambda d, p: d["returns"]),
+    "Plot.plot_heatmap": plot_case(
+        "plot_heatmap",
+        df=lambda d, p: d["returns"],
+        relation_type=lambda d, p: "corr",
+        relations=lambda d, p: p.corr,
+    ),
+    "Plot.plot_trend": plot_case("plot_trend", df=lambda d, p: p.returns_cum),
+    "Plot.plot_bar": plot_case("plot_bar", df=lambda d, p: p.returns_total),
+    "Plot.plot_scatter": plot_case("plot_scatter", df=lambda d, p: p.mean_sd),
+}
+
+
+def time_case(case, panel, performance, repeat: int) -> float:
+    """
+    Times a benchmark case.
+
+    Parameters:
+        case (Callable): The benchmark case.
+        panel (dict): The synthetic panel.
+        performance (Performance): The Performance of the panel.
+        repeat (int): Number of repetitions.
+
+    Returns:
+        float: The fastest time in seconds.
+    """
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case(panel, performance)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def main(argv=None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--filter", default="")
+    args = parser.parse_args(argv)
+
+    if not args.save and not args.baseline.exists():
+        print(f"FAIL: no baseline at {args.baseline}, create it with --save")
+        return 1
+
+    results = {}
+    for size in args.sizes:
+        n_assets, n_days = map(int, size.split("x"))
+        panel = synthetic_panel(n_assets, n_days, args.seed)
+        performance = Performance(panel["returns"], panel["rf"], panel["benchmark"])
+
+        for name, case in CASES.items():
+            if args.filter not in name:
+                continue
+            key = f"{name}[{size}]"
+            results[key] = time_case(case, panel, performance, args.repeat)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+
+    regressions = []
+    missing = []
+    for key, seconds in results.items():
+        line = f"{key:<40} {seconds * 1000:10.2f} ms"
+        if key not in baseline:
+            missing.append(key)
+            line += "  NO BASELINE"
+        else:
+            change = seconds / baseline[key] - 1
+            line += f"  {change:+7.1%}"
+            if change > args.threshold:
+                regressions.append(key)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save:
+        args.baseline.write_text(json.dumps({**baseline, **results}, indent=2))
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if missing:
+        print(f"FAIL: {len(missing)} cases missing from {args.baseline}")
+    if regressions:
+        print(f"FAIL: {len(regressions)} cases slower than {args.threshold:.0%}")
+    if missing or regressions:
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
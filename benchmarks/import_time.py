@@ -0,0 +1,85 @@
+"""
+Tracks the cost of `import dafin` with `python -X importtime`.
+
+Usage:
+    python benchmarks/import_time.py [--max-ms 1000] [--repeat 5] [--top 10]
+
+Fails if the median cumulative import time exceeds the budget, or if any of the
+modules that should only be loaded on first use is imported.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Modules that importing dafin must not load
+LAZY_MODULES = [
+    "matplotlib",
+    "seaborn",
+    "yfinance",
+    "requests_cache",
+    "requests_ratelimiter",
+    "pyrate_limiter",
+]
+
+
+def import_times(module: str = "dafin") -> dict:
+    """
+    Imports a module in a fresh interpreter and parses the `-X importtime` report.
+
+    Parameters:
+        module (str, optional): The module to import. Defaults to "dafin".
+
+    Returns:
+        dict: The cumulative import time in microseconds, keyed by module name.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def main(argv=None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-ms", type=float, default=1000.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    runs = [import_times() for _ in range(args.repeat)]
+    total_ms = statistics.median(run["dafin"] for run in runs) / 1000
+
+    print(f"import dafin: {total_ms:.1f} ms (median of {args.repeat})")
+    for name, us in sorted(runs[-1].items(), key=lambda x: -x[1])[: args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+
+    loaded = [m for m in LAZY_MODULES if m in runs[-1]]
+    if loaded:
+        print(f"FAIL: modules loaded at import time: {loaded}")
+        failed = True
+
+    if total_ms > args.max_ms:
+        print(f"FAIL: import time exceeds the budget of {args.max_ms:.0f} ms")
+        failed = True
+
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
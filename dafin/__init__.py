@@ -1,4 +1,34 @@
+from .chunked import summary_chunked
+from .compact import CompactPerformance
 from .performance import Performance
-from .plot import *
 from .returns_data import ReturnsData
+from .screening import screen
+from .snapshots import SnapshotStore
+from .synthetic import SyntheticMarket
 from .utils import *
+
+# Public names of the plotting module, which is only imported on first use since it
+# loads matplotlib and seaborn and sets their global style
+_PLOT_NAMES = (
+    "DEFAULT_HEATMAP_MAX_ANNOTATE",
+    "DEFAULT_HEATMAP_MAX_ASSETS",
+    "DEFAULT_SCATTER_MAX_LABELS",
+    "DEFAULT_SIZE",
+    "DEFAULT_SIZE_SQUARE",
+    "Plot",
+    "label_offsets",
+)
+
+
+def __getattr__(name):
+    if name in _PLOT_NAMES:
+        from . import plot
+
+        return getattr(plot, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Star imports resolve the lazy names too, as when the plotting module was imported
+# eagerly
+__all__ = [name for name in globals() if not name.startswith("_")] + list(_PLOT_NAMES)
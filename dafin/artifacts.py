@@ -0,0 +1,111 @@
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+
+
+class ArtifactManifest:
+    def __init__(self, path: Path) -> None:
+        """
+        Initializes a content-addressed manifest of the artifacts written to a directory.
+        Each artifact is recorded with the hash of its inputs, so that unchanged
+        artifacts can be skipped on the next run.
+
+        Parameters:
+            path (Path): The path of the manifest file. It is loaded if it exists.
+        """
+
+        self.logger = logging.getLogger(__name__)
+
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        self.entries = json.loads(path.read_text()) if path.exists() else {}
+
+    def hit(self, name: str, key: str) -> bool:
+        """
+        Checks whether an artifact is up to date, and counts the hit or miss.
+
+        Parameters:
+            name (str): The name of the artifact.
+            key (str): The content hash of the artifact's inputs.
+
+        Returns:
+            bool: True if the artifact was written with the same key and still exists.
+        """
+
+        entry = self.entries.get(name)
+        is_hit = (
+            entry is not None
+            and entry["key"] == key
+            and (self.path.parent / entry["file"]).exists()
+        )
+
+        if is_hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        return is_hit
+
+    def record(self, name: str, key: str, file: Path) -> None:
+        """
+        Records a written artifact.
+
+        Parameters:
+            name (str): The name of the artifact.
+            key (str): The content hash of the artifact's inputs.
+            file (Path): The path of the written file.
+        """
+
+        self.entries[name] = {"key": key, "file": file.name}
+
+    def save(self) -> None:
+        """
+        Writes the manifest to disk.
+        """
+
+        self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True))
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the cache hit and miss counts.
+
+        Returns:
+            dict: The number of hits and misses.
+        """
+
+        return {"hits": self.hits, "misses": self.misses}
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the manifest.
+
+        Returns:
+            str: The path and the cache hit and miss counts.
+        """
+
+        return f"Artifact cache {self.path}: {self.hits} hits, {self.misses} misses"
+
+
+def open_manifest(
+    path: Path, prefix: str, cache: bool = True
+) -> Optional[ArtifactManifest]:
+    """
+    Opens the manifest of the artifacts with a given prefix in a directory.
+
+    Parameters:
+        path (Path): The directory of the artifacts.
+        prefix (str): The prefix of the artifact file names.
+        cache (bool, optional): If False, no manifest is used. Defaults to True.
+
+    Returns:
+        Optional[ArtifactManifest]: The manifest, or None if caching is disabled.
+    """
+
+    if not cache:
+        return None
+
+    return ArtifactManifest(path / Path(f"{prefix}_manifest.json"))
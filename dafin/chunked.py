@@ -0,0 +1,303 @@
+"""
+Out-of-core summary of very wide universes. The returns of the assets are read in
+blocks of columns from a Parquet file or a memory-mapped array, and the per-asset
+metrics of `Performance.summary` are calculated block by block against a risk-free
+asset and a benchmark held in memory, so that peak memory is bounded by the block
+size rather than the number of assets.
+"""
+
+import json
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import scipy as sp
+
+from .utils import (
+    DEFAULT_CONFIDENCE,
+    RELATIVE_COLUMNS,
+    _historical_tail,
+    _relative_metrics,
+    _tail_levels,
+    calc_annualized_returns,
+    infer_periods_per_year,
+)
+
+# Default number of assets per block
+DEFAULT_BLOCK_SIZE = 1000
+
+# Columns of the summary, in the order of `Performance.summary`
+SUMMARY_COLUMNS = [
+    "Total Returns",
+    "Expected Returns",
+    "Standard Deviation",
+    "Alpha",
+    "Beta",
+    "Sharpe Ratio",
+    "Treynor Ratio",
+    *RELATIVE_COLUMNS,
+    "Value at Risk",
+    "Conditional Value at Risk",
+    "Slope",
+    "Intercept",
+    "Correlation",
+    "R-Squared",
+    "p-Value",
+    "Standard Error",
+]
+
+Source = Union[pd.DataFrame, Path, str]
+
+
+def write_memmap(returns: pd.DataFrame, path: Path) -> Path:
+    """
+    Writes returns as a memory-mappable array, `{path}.npy`, in column-major order so
+    that each block of assets is contiguous on disk, and their dates and assets to
+    `{path}.json`.
+
+    Parameters:
+        returns (pd.DataFrame): The returns, one column per asset.
+        path (Path): The file path without extension.
+
+    Returns:
+        Path: The path of the array file.
+    """
+
+    path = Path(path)
+    array = np.lib.format.open_memmap(
+        path.with_suffix(".npy"),
+        mode="w+",
+        dtype=np.float64,
+        shape=returns.shape,
+        fortran_order=True,
+    )
+    array[:] = returns.to_numpy(dtype=np.float64)
+    array.flush()
+
+    metadata = {
+        "index": returns.index.astype(str).tolist(),
+        "columns": returns.columns.astype(str).tolist(),
+    }
+    path.with_suffix(".json").write_text(json.dumps(metadata))
+
+    return path.with_suffix(".npy")
+
+
+def open_memmap(path: Path) -> Tuple[np.ndarray, pd.DatetimeIndex, List[str]]:
+    """
+    Opens returns written by `write_memmap` without reading them into memory.
+
+    Parameters:
+        path (Path): The path of the array file.
+
+    Returns:
+        Tuple[np.ndarray, pd.DatetimeIndex, List[str]]: The memory-mapped returns,
+            their dates and their assets.
+    """
+
+    path = Path(path)
+    metadata = json.loads(path.with_suffix(".json").read_text())
+    array = np.load(path.with_suffix(".npy"), mmap_mode="r")
+    return array, pd.DatetimeIndex(metadata["index"]), metadata["columns"]
+
+
+def iter_blocks(
+    source: Source, block_size: int = DEFAULT_BLOCK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Iterates over the returns of the assets in blocks of columns.
+
+    Parameters:
+        source (Union[pd.DataFrame, Path, str]): The returns, either in memory, in a
+            Parquet file with one column per asset, or in an array file written by
+            `write_memmap`.
+        block_size (int, optional): Number of assets per block. Defaults to
+            DEFAULT_BLOCK_SIZE.
+
+    Raises:
+        ValueError: If the file format is not supported.
+
+    Yields:
+        pd.DataFrame: The returns of a block of assets.
+    """
+
+    if isinstance(source, pd.DataFrame):
+        for i in range(0, source.shape[1], block_size):
+            yield source.iloc[:, i : i + block_size]
+        return
+
+    path = Path(source)
+
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        schema = pq.read_schema(path)
+        index_columns = {
+            c for c in schema.pandas_metadata["index_columns"] if isinstance(c, str)
+        }
+        columns = [c for c in schema.names if c not in index_columns]
+        for i in range(0, len(columns), block_size):
+            yield pd.read_parquet(path, columns=columns[i : i + block_size])
+
+    elif path.suffix == ".npy":
+        array, index, columns = open_memmap(path)
+        for i in range(0, len(columns), block_size):
+            yield pd.DataFrame(
+                np.array(array[:, i : i + block_size]),
+                index=index,
+                columns=columns[i : i + block_size],
+            )
+
+    else:
+        raise ValueError(f"Unsupported returns file: {path}")
+
+
+def summarize_block(
+    returns: pd.DataFrame,
+    returns_rf_annualized: float,
+    returns_benchmark: pd.Series,
+    returns_benchmark_annualized: float,
+    periods_per_year: float,
+) -> pd.DataFrame:
+    """
+    Calculates the summary metrics of a block of assets with vectorized array
+    operations. Missing returns are skipped, and the beta and regression use the
+    dates where both the asset and the benchmark have returns.
+
+    Parameters:
+        returns (pd.DataFrame): Daily returns of the assets.
+        returns_rf_annualized (float): Annualized return of the risk-free asset.
+        returns_benchmark (pd.Series): Daily returns of the benchmark.
+        returns_benchmark_annualized (float): Annualized return of the benchmark.
+        periods_per_year (float): Number of return periods per year.
+
+    Returns:
+        pd.DataFrame: The summary of each asset, with the columns SUMMARY_COLUMNS.
+    """
+
+    x = returns.to_numpy(dtype=np.float64)
+    y = returns_benchmark.reindex(returns.index).to_numpy(dtype=np.float64)
+
+    # Returns and risk
+    total = np.nanprod(1 + x, axis=0) - 1
+    expected = (1 + total) ** (periods_per_year / x.shape[0]) - 1
+    sd = np.nanstd(x, axis=0, ddof=1) * np.sqrt(periods_per_year)
+
+    # Co-moments over the dates where both the asset and the benchmark are available
+    mask = ~np.isnan(x) & ~np.isnan(y)[:, None]
+    n = mask.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = np.where(mask, x, 0).sum(axis=0) / n
+        y_mean = np.where(mask, y[:, None], 0).sum(axis=0) / n
+        dx = np.where(mask, x - x_mean, 0)
+        dy = np.where(mask, y[:, None] - y_mean, 0)
+        sxx = (dx * dx).sum(axis=0)
+        syy = (dy * dy).sum(axis=0)
+        sxy = (dx * dy).sum(axis=0)
+        del dx, dy
+
+        # Beta against the variance of the benchmark over its own dates
+        beta = sxy / (n - 1) / np.nanvar(y, ddof=1)
+        alpha = (
+            expected
+            - returns_rf_annualized
+            - beta * (returns_benchmark_annualized - returns_rf_annualized)
+        )
+        sharpe = (expected - returns_rf_annualized) / sd
+        treynor = (expected - returns_rf_annualized) / beta
+
+        # Regression of the benchmark on the asset, as `dafin.utils.regression`
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        r = np.clip(sxy / np.sqrt(sxx * syy), -1, 1)
+        df = n - 2
+        t = r * np.sqrt(df / ((1 - r) * (1 + r)))
+        p_value = 2 * sp.stats.t.sf(np.abs(t), df)
+        std_err = np.sqrt((1 - r**2) * syy / sxx / df)
+
+    # Tracking error, information ratio and captures, from the same aligned arrays
+    relative = _relative_metrics((x, y, mask), periods_per_year)
+
+    # Historical tail risk at the default confidence level
+    var, cvar = _historical_tail(x, _tail_levels(DEFAULT_CONFIDENCE))
+
+    data = [
+        total,
+        expected,
+        sd,
+        alpha,
+        beta,
+        sharpe,
+        treynor,
+        *relative.T,
+        var[0],
+        cvar[0],
+        slope,
+        intercept,
+        r,
+        r**2,
+        p_value,
+        std_err,
+    ]
+    return pd.DataFrame(
+        np.column_stack(data), index=returns.columns, columns=SUMMARY_COLUMNS
+    )
+
+
+def summary_chunked(
+    source: Source,
+    returns_rf: Optional[pd.DataFrame] = None,
+    returns_benchmark: Optional[pd.DataFrame] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    periods_per_year: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Calculates the per-asset metrics of `Performance.summary` block by block, for
+    universes too wide to hold in memory at once.
+
+    Parameters:
+        source (Union[pd.DataFrame, Path, str]): The returns of the assets, see `iter_blocks`.
+        returns_rf (pd.DataFrame, optional): Daily returns of the risk-free asset.
+            Defaults to None, zero returns.
+        returns_benchmark (pd.DataFrame, optional): Daily returns of the benchmark.
+            Defaults to None, the risk-free returns.
+        block_size (int, optional): Number of assets per block. Defaults to
+            DEFAULT_BLOCK_SIZE.
+        periods_per_year (float, optional): Number of return periods per year. Defaults
+            to None, inferred from the dates of the returns.
+
+    Returns:
+        pd.DataFrame: The summary of each asset, with the columns SUMMARY_COLUMNS.
+    """
+
+    blocks = iter_blocks(source, block_size)
+    block = next(blocks)
+
+    # The risk-free returns default to zero, and the benchmark to the risk-free asset
+    if returns_rf is None:
+        returns_rf = pd.DataFrame(
+            data=np.zeros(len(block)), index=block.index, columns=["RiskFree"]
+        )
+    if returns_benchmark is None:
+        returns_benchmark = returns_rf
+
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(block.index)
+
+    rf_annualized = float(calc_annualized_returns(returns_rf, periods_per_year).iloc[0])
+    benchmark_annualized = float(
+        calc_annualized_returns(returns_benchmark, periods_per_year).iloc[0]
+    )
+    args = (
+        rf_annualized,
+        returns_benchmark.iloc[:, 0],
+        benchmark_annualized,
+        periods_per_year,
+    )
+
+    summaries = [summarize_block(block, *args)]
+    for block in blocks:
+        summaries.append(summarize_block(block, *args))
+
+    return pd.concat(summaries)
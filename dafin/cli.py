@@ -0,0 +1,352 @@
+"""
+Command line interface to evaluate a batch of performance reports, e.g.
+
+    dafin jobs.json --output experiments --workers 4
+
+The job file is a JSON document listing the reports. Each job has a universe of
+assets, an optional benchmark and risk-free asset, and optional date windows; the
+"defaults" apply to every job that does not set them:
+
+    {
+        "defaults": {"benchmark": "SPY", "rf": "BND"},
+        "jobs": [
+            {
+                "name": "tech",
+                "assets": ["AAPL", "AMZN", "MSFT"],
+                "windows": [["2015-01-01", "2019-12-31"], ["2020-01-01", null]],
+                "freq": "M"
+            },
+            {"name": "bonds", "assets": ["BND", "TLT"], "benchmark": "AGG"}
+        ]
+    }
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import logging
+import multiprocessing
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from . import instrument
+from .instrument import StageRecorder
+from .performance import Performance
+from .price_cache import PriceCache
+from .returns_data import ReturnsData
+
+logger = logging.getLogger(__name__)
+
+# Default directory of the reports
+DEFAULT_OUTPUT = Path("experiments")
+
+
+def read_jobs(path: Path) -> List[dict]:
+    """
+    Reads a job file and expands each job into one job per date window.
+
+    Parameters:
+        path (Path): The job file.
+
+    Raises:
+        ValueError: If a job has no assets, a window is not a pair of dates, or two
+            jobs have the same name, since they would write the same report.
+
+    Returns:
+        List[dict]: The jobs, with the keys "name", "assets", "benchmark", "rf",
+            "col_price", "freq", "date_start" and "date_end".
+    """
+
+    config = json.loads(Path(path).read_text())
+    defaults = config.get("defaults", {})
+
+    jobs = []
+    for i, job in enumerate(config["jobs"]):
+        job = {**defaults, **job}
+        name = job.get("name", f"job{i}")
+
+        if not job.get("assets"):
+            raise ValueError(f"Job {name} has no assets")
+
+        windows = job.get("windows") or [[None, None]]
+        for window in windows:
+            if len(window) != 2:
+                raise ValueError(f"Job {name} has an invalid window: {window}")
+
+            date_start, date_end = window
+            suffix = "" if len(windows) == 1 else f"_{date_start}_{date_end}"
+            jobs.append(
+                {
+                    "name": f"{name}{suffix}",
+                    "assets": _as_list(job["assets"]),
+                    "benchmark": _as_list(job.get("benchmark")),
+                    "rf": _as_list(job.get("rf")),
+                    "col_price": job.get("col_price", "Close"),
+                    "freq": job.get("freq"),
+                    "date_start": date_start,
+                    "date_end": date_end,
+                }
+            )
+
+    names = [job["name"] for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate job names: {duplicates}")
+
+    return jobs
+
+
+def _as_list(assets: Union[List[str], str, None]) -> Optional[List[str]]:
+    """Converts a single asset symbol to a list."""
+
+    return [assets] if isinstance(assets, str) else assets
+
+
+def _panel_keys(job: dict) -> List[tuple]:
+    """Returns the keys of the returns panels used by a job."""
+
+    return [
+        (tuple(assets), job["col_price"])
+        for assets in (job["assets"], job["benchmark"], job["rf"])
+        if assets
+    ]
+
+
+def load_panels(
+    jobs: List[dict], cache: Union[PriceCache, bool, None] = None
+) -> Dict[tuple, ReturnsData]:
+    """
+    Loads the returns panels of the jobs, once per distinct universe. The panels are
+    loaded concurrently and share the downloads of their common assets.
+
+    Parameters:
+        jobs (List[dict]): The jobs, as returned by `read_jobs`.
+        cache (Union[PriceCache, bool], optional): The price cache, see `ReturnsData`.
+
+    Returns:
+        Dict[tuple, ReturnsData]: The panels, keyed by assets and price column.
+    """
+
+    keys = list(dict.fromkeys(key for job in jobs for key in _panel_keys(job)))
+
+    async def load():
+        return await asyncio.gather(
+            *(
+                ReturnsData.load(list(assets), col_price=col_price, cache=cache)
+                for assets, col_price in keys
+            )
+        )
+
+    return dict(zip(keys, asyncio.run(load())))
+
+
+def _window(
+    panels: Dict[tuple, ReturnsData], assets: Optional[List[str]], job: dict
+) -> Optional[pd.DataFrame]:
+    """Returns the returns of a panel within the date window of a job."""
+
+    if not assets:
+        return None
+
+    returns_data = panels[(tuple(assets), job["col_price"])]
+    index = returns_data.returns.index
+    return returns_data.get_returns(
+        job["date_start"] or index[0], job["date_end"] or index[-1]
+    )
+
+
+def run_job(
+    job: dict,
+    returns_assets: pd.DataFrame,
+    returns_rf: Optional[pd.DataFrame],
+    returns_benchmark: Optional[pd.DataFrame],
+    path: Path,
+    cache: bool = True,
+) -> dict:
+    """
+    Evaluates the performance of a job and saves its report.
+
+    Parameters:
+        job (dict): The job, as returned by `read_jobs`.
+        returns_assets (pd.DataFrame): The returns of the assets.
+        returns_rf (pd.DataFrame, optional): The returns of the risk-free asset.
+        returns_benchmark (pd.DataFrame, optional): The returns of the benchmark.
+        path (Path): Directory of the report.
+        cache (bool, optional): If True, artifacts whose inputs are unchanged are
+            skipped. Defaults to True.
+
+    Returns:
+        dict: The job name, its summary, the cache hits and misses of its artifacts,
+            and the duration of each stage.
+    """
+
+    instrument.enable()
+
+    performance = Performance(
+        returns_assets, returns_rf, returns_benchmark, freq=job["freq"]
+    )
+    stats = performance.save_results(path, prefix=job["name"], cache=cache)
+
+    return {
+        "name": job["name"],
+        "summary": performance.summary,
+        "stats": stats,
+        "timings": dict(performance.timings),
+    }
+
+
+def run(
+    path_jobs: Path,
+    path: Path = DEFAULT_OUTPUT,
+    workers: Optional[int] = None,
+    cache: bool = True,
+    price_cache: Union[PriceCache, bool, None] = None,
+) -> dict:
+    """
+    Evaluates and saves the reports of a job file. The returns panels are loaded
+    once, and the jobs are evaluated in parallel worker processes.
+
+    Parameters:
+        path_jobs (Path): The job file, see the module documentation.
+        path (Path, optional): Directory of the reports. Defaults to DEFAULT_OUTPUT.
+        workers (int, optional): Number of worker processes. Defaults to None, one
+            per CPU. With 1, the jobs are evaluated in this process.
+        cache (bool, optional): If True, artifacts whose inputs are unchanged are
+            skipped. Defaults to True.
+        price_cache (Union[PriceCache, bool], optional): The price cache, see `ReturnsData`.
+
+    Returns:
+        dict: The summaries of the jobs, keyed by name, the total cache hits and
+            misses of the artifacts, and the total duration of each stage.
+    """
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    recorder = StageRecorder("cli")
+    enabled = instrument.is_enabled()
+    instrument.enable()
+    try:
+        return _run(path_jobs, path, workers, cache, price_cache, recorder)
+    finally:
+        if not enabled:
+            instrument.disable()
+
+
+def _run(
+    path_jobs: Path,
+    path: Path,
+    workers: Optional[int],
+    cache: bool,
+    price_cache: Union[PriceCache, bool, None],
+    recorder: StageRecorder,
+) -> dict:
+    """Runs the stages of `run`, timed by the recorder."""
+
+    with recorder.stage("read_jobs"):
+        jobs = read_jobs(path_jobs)
+
+    with recorder.stage("load"):
+        panels = load_panels(jobs, cache=price_cache)
+
+    with recorder.stage("evaluate"):
+        args = [
+            (
+                job,
+                _window(panels, job["assets"], job),
+                _window(panels, job["rf"], job),
+                _window(panels, job["benchmark"], job),
+                path,
+                cache,
+            )
+            for job in jobs
+        ]
+
+        if workers == 1:
+            results = [run_job(*arg) for arg in args]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                results = list(executor.map(run_job, *zip(*args)))
+
+    with recorder.stage("write_summary"):
+        summary = pd.concat(
+            {result["name"]: result["summary"] for result in results},
+            names=["job", "asset"],
+        )
+        summary.to_csv(path / "summary.csv")
+
+    timings = dict(recorder.timings)
+    for result in results:
+        for stage, seconds in result["timings"].items():
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+    return {
+        "summaries": {result["name"]: result["summary"] for result in results},
+        "stats": {
+            k: sum(result["stats"][k] for result in results) for k in ("hits", "misses")
+        },
+        "timings": timings,
+    }
+
+
+def format_timings(timings: dict) -> str:
+    """
+    Formats the duration of each stage as a table, slowest first.
+
+    Parameters:
+        timings (dict): The duration in seconds, keyed by stage.
+
+    Returns:
+        str: The table.
+    """
+
+    timings = pd.Series(timings, name="seconds").sort_values(ascending=False)
+    share = (100 * timings / timings.sum()).rename("%")
+    return pd.concat([timings, share], axis=1).round(3).to_string()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Runs the command line interface.
+
+    Parameters:
+        argv (List[str], optional): The arguments. Defaults to None, the arguments
+            of the process.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="dafin", description="Evaluates the performance reports of a job file."
+    )
+    parser.add_argument("jobs", type=Path, help="The job file (JSON).")
+    parser.add_argument(
+        "-o", "--output", type=Path, default=DEFAULT_OUTPUT, help="Report directory."
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Number of worker processes."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rewrite the artifacts even if their inputs are unchanged.",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    result = run(args.jobs, args.output, args.workers, cache=not args.no_cache)
+
+    stats = result["stats"]
+    print(
+        f"{len(result['summaries'])} reports saved to {args.output}: "
+        f"{stats['hits']} artifacts unchanged, {stats['misses']} written"
+    )
+    print(format_timings(result["timings"]))
+
+
+if __name__ == "__main__":
+    main()
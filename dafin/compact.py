@@ -0,0 +1,196 @@
+"""
+Compact results of `Performance` for sweeps that keep many results alive, e.g. to
+compare thousands of universes or windows. A `CompactPerformance` only holds the
+per-asset summary metrics in a single array, and drops the returns, cumulative
+returns and covariance and correlation matrices of the full result.
+"""
+
+import sys
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .performance import Performance
+
+
+class CompactPerformance:
+
+    __slots__ = (
+        "values",
+        "assets",
+        "metrics",
+        "asset_rf",
+        "asset_benchmark",
+        "date_start_str",
+        "date_end_str",
+        "periods_per_year",
+    )
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        assets: Sequence[str],
+        metrics: Sequence[str],
+        asset_rf: str,
+        asset_benchmark: str,
+        date_start_str: str,
+        date_end_str: str,
+        periods_per_year: float,
+    ) -> None:
+        """
+        Initializes the compact result from the summary metrics of the assets.
+
+        Parameters:
+            values (np.ndarray): The metrics, one row per asset and one column per metric.
+            assets (Sequence[str]): The assets.
+            metrics (Sequence[str]): The names of the metrics, e.g. "Sharpe Ratio".
+            asset_rf (str): The risk-free asset.
+            asset_benchmark (str): The benchmark asset.
+            date_start_str (str): The first date of the returns.
+            date_end_str (str): The last date of the returns.
+            periods_per_year (float): Number of return periods per year.
+
+        Raises:
+            ValueError: If the shape of the values does not match the assets and metrics.
+        """
+
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        if values.shape != (len(assets), len(metrics)):
+            raise ValueError(
+                f"Values of shape {values.shape} do not match "
+                f"{len(assets)} assets and {len(metrics)} metrics"
+            )
+
+        self.values = values
+        self.assets = tuple(assets)
+        self.metrics = tuple(metrics)
+        self.asset_rf = asset_rf
+        self.asset_benchmark = asset_benchmark
+        self.date_start_str = date_start_str
+        self.date_end_str = date_end_str
+        self.periods_per_year = periods_per_year
+
+    @classmethod
+    def from_performance(cls, performance: Performance) -> "CompactPerformance":
+        """
+        Creates the compact result of a Performance.
+
+        Parameters:
+            performance (Performance): The full result.
+
+        Returns:
+            CompactPerformance: The compact result.
+        """
+
+        summary = performance.summary
+        return cls(
+            summary.to_numpy(dtype=np.float64),
+            summary.index.tolist(),
+            summary.columns.tolist(),
+            performance.asset_rf,
+            performance.asset_benchmark,
+            performance.date_start_str,
+            performance.date_end_str,
+            performance.periods_per_year,
+        )
+
+    @property
+    def summary(self) -> pd.DataFrame:
+        """
+        Returns the summary of the performance, as `Performance.summary`, without
+        copying the metrics.
+
+        Returns:
+            pd.DataFrame: Summary of the performance.
+        """
+
+        return pd.DataFrame(
+            self.values, index=list(self.assets), columns=list(self.metrics), copy=False
+        )
+
+    def __getitem__(self, metric: str) -> pd.Series:
+        """
+        Returns a metric of every asset, e.g. `compact["Sharpe Ratio"]`.
+
+        Parameters:
+            metric (str): The name of the metric.
+
+        Raises:
+            KeyError: If the metric is not in the summary.
+
+        Returns:
+            pd.Series: The metric, one value per asset.
+        """
+
+        if metric not in self.metrics:
+            raise KeyError(metric)
+
+        return pd.Series(
+            self.values[:, self.metrics.index(metric)],
+            index=list(self.assets),
+            name=metric,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the memory used by the compact result, including its labels.
+
+        Returns:
+            int: The size in bytes.
+        """
+
+        labels: List[object] = [
+            *self.assets,
+            *self.metrics,
+            self.asset_rf,
+            self.asset_benchmark,
+            self.date_start_str,
+            self.date_end_str,
+        ]
+        return (
+            sys.getsizeof(self)
+            + self.values.nbytes
+            + sys.getsizeof(self.assets)
+            + sys.getsizeof(self.metrics)
+            + sum(sys.getsizeof(label) for label in labels)
+        )
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state for pickling.
+
+        Returns:
+            dict: The value of each slot.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores the compact result from the pickled state.
+
+        Parameters:
+            state (dict): The state returned by `__getstate__`.
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the compact result.
+
+        Returns:
+            str: String representation of the compact result.
+        """
+
+        return (
+            "Compact Performance:\n"
+            + f"- List of Assets: {list(self.assets)}\n"
+            + f"- Risk-Free Asset: {self.asset_rf}\n"
+            + f"- Benchmark Asset: {self.asset_benchmark}\n"
+            + f"- Start Date: {self.date_start_str}\n"
+            + f"- End Date: {self.date_end_str}\n"
+            + f"- Memory: {self.nbytes} bytes\n"
+            + f"- Performance Summary:\n{self.summary}\n\n\n"
+        )
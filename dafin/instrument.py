@@ -0,0 +1,136 @@
+import contextlib
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+# Callbacks that receive every stage event, e.g. to forward them to a metrics system
+_LISTENERS: List[Callable[[dict], None]] = []
+
+# Global switches of the instrumentation
+_CONFIG = {"enabled": False, "memory": False, "owns_tracemalloc": False}
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+def enable(memory: bool = False) -> None:
+    """
+    Enables recording of stage timings, and optionally of their peak memory. Memory
+    is traced with tracemalloc, which slows down the traced code.
+
+    Parameters:
+        memory (bool, optional): If True, the peak memory of each stage is recorded.
+            Defaults to False.
+    """
+    _CONFIG["enabled"] = True
+    _CONFIG["memory"] = memory
+
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _CONFIG["owns_tracemalloc"] = True
+
+
+def disable() -> None:
+    """
+    Disables recording of stage timings and memory, and stops tracemalloc if it was
+    started by `enable`.
+    """
+    _CONFIG["enabled"] = False
+    _CONFIG["memory"] = False
+
+    if _CONFIG["owns_tracemalloc"]:
+        tracemalloc.stop()
+        _CONFIG["owns_tracemalloc"] = False
+
+
+def is_enabled() -> bool:
+    """
+    Returns whether recording of stage timings is enabled.
+
+    Returns:
+        bool: True if enabled.
+    """
+    return _CONFIG["enabled"]
+
+
+def add_listener(listener: Callable[[dict], None]) -> None:
+    """
+    Registers a callback for stage events, and enables recording while any callback
+    is registered. Each event is a dict with the keys "owner", "stage", "seconds",
+    "memory_peak" (bytes, or None if memory is not traced) and "timestamp".
+
+    Parameters:
+        listener (Callable[[dict], None]): The callback.
+    """
+    _LISTENERS.append(listener)
+
+
+def remove_listener(listener: Callable[[dict], None]) -> None:
+    """
+    Unregisters a callback for stage events.
+
+    Parameters:
+        listener (Callable[[dict], None]): The callback.
+    """
+    _LISTENERS.remove(listener)
+
+
+class StageRecorder:
+    def __init__(self, owner: str) -> None:
+        """
+        Initializes the recorder of the stages of one object. Stages are only timed
+        while instrumentation is enabled or a listener is registered; otherwise
+        `stage` returns a shared no-op context.
+
+        Parameters:
+            owner (str): The name of the instrumented class, reported in the events.
+        """
+
+        self.owner = owner
+        self.timings: Dict[str, float] = {}
+        self.memory: Dict[str, int] = {}
+
+    def stage(self, name: str):
+        """
+        Returns a context that records the duration of a stage.
+
+        Parameters:
+            name (str): The name of the stage.
+
+        Returns:
+            ContextManager: The recording context.
+        """
+
+        if not (_CONFIG["enabled"] or _LISTENERS):
+            return _NULL_CONTEXT
+
+        return self._record(name)
+
+    @contextlib.contextmanager
+    def _record(self, name: str):
+
+        trace_memory = _CONFIG["memory"] and tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.reset_peak()
+            memory_start, _ = tracemalloc.get_traced_memory()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+            memory_peak = None
+            if trace_memory:
+                memory_peak = tracemalloc.get_traced_memory()[1] - memory_start
+                self.memory[name] = max(self.memory.get(name, 0), memory_peak)
+
+            event = {
+                "owner": self.owner,
+                "stage": name,
+                "seconds": seconds,
+                "memory_peak": memory_peak,
+                "timestamp": time.time(),
+            }
+            for listener in list(_LISTENERS):
+                listener(event)
@@ -1,10 +1,28 @@
+import inspect
+import json
+import logging
+import tempfile
+import zipfile
 from pathlib import Path
+from typing import Sequence, Union
 
 import numpy as np
 import pandas as pd
 
-from .plot import Plot
+from .artifacts import ArtifactManifest, open_manifest
+from .instrument import StageRecorder
+from .serialize import frame_from_state, frame_to_state
 from .utils import *
+from .utils import _beta, _relative_metrics
+
+logger = logging.getLogger(__name__)
+
+# Version of the single-file data bundle written by `Performance.save_data`
+BUNDLE_VERSION = 1
+
+# Version of the rendering and layout of the saved figures and files, part of the
+# manifest keys so that a change to it invalidates the cached artifacts
+ARTIFACT_VERSION = 1
 
 
 class Performance:
@@ -13,6 +31,8 @@ class Performance:
         returns_assets: pd.DataFrame,
         returns_rf: pd.DataFrame = None,
         returns_benchmark: pd.DataFrame = None,
+        freq: str = None,
+        periods_per_year: float = None,
     ) -> None:
         """
         Initializes the Performance object with provided assets, risk-free, and benchmark returns.
@@ -21,6 +41,10 @@ class Performance:
         - returns_assets: A DataFrame containing the returns of multiple assets.
         - returns_rf: A DataFrame containing the returns of the risk-free asset (optional).
         - returns_benchmark: A DataFrame containing the returns of the benchmark asset (optional).
+        - freq: Frequency to compound the daily returns to before the analysis, one of
+          `dafin.utils.PERIODS_PER_YEAR`, e.g. "M" (optional).
+        - periods_per_year: Number of return periods per year used to annualize (optional).
+          Defaults to the number of periods of `freq`, or the one inferred from the dates.
 
         Raises:
         - ValueError: If returns_assets DataFrame is empty.
@@ -29,7 +53,45 @@ class Performance:
         if returns_assets.empty:
             raise ValueError("returns_assets cannot be empty")
 
+        if freq is not None:
+            returns_assets, returns_rf, returns_benchmark = (
+                None if returns is None else resample_returns(returns, freq)
+                for returns in (returns_assets, returns_rf, returns_benchmark)
+            )
+            if periods_per_year is None:
+                periods_per_year = get_periods_per_year(freq)
+
+        self._set_inputs(
+            returns_assets, returns_rf, returns_benchmark, periods_per_year
+        )
+        self._calculate_metrics()
+
+    def _set_inputs(
+        self,
+        returns_assets: pd.DataFrame,
+        returns_rf: pd.DataFrame = None,
+        returns_benchmark: pd.DataFrame = None,
+        periods_per_year: float = None,
+    ) -> None:
+        """
+        Sets the input returns and the attributes derived from their labels.
+
+        Parameters:
+        - returns_assets: A DataFrame containing the returns of multiple assets.
+        - returns_rf: A DataFrame containing the returns of the risk-free asset (optional).
+        - returns_benchmark: A DataFrame containing the returns of the benchmark asset (optional).
+        - periods_per_year: Number of return periods per year (optional). Defaults to
+          the one inferred from the dates of the returns of the assets.
+        """
+
         self.returns_assets = returns_assets
+        self.periods_per_year = (
+            periods_per_year
+            if periods_per_year is not None
+            else infer_periods_per_year(returns_assets.index)
+        )
+        self._default_rf = returns_rf is None
+        self._default_benchmark = returns_benchmark is None
 
         # If risk-free returns are not provided, create a DataFrame with zeros
         if returns_rf is None:
@@ -41,11 +103,9 @@ class Performance:
         else:
             self.returns_rf = returns_rf
 
-        # If benchmark returns are not provided, use the risk-free returns as benchmark
+        # If benchmark returns are not provided, share the risk-free returns as benchmark
         self.returns_benchmark = (
-            returns_benchmark
-            if returns_benchmark is not None
-            else self.returns_rf.copy()
+            returns_benchmark if returns_benchmark is not None else self.returns_rf
         )
 
         self.assets = self.returns_assets.columns.tolist()
@@ -54,63 +114,351 @@ class Performance:
         self.date_start_str = date_to_str(self.returns_assets.index[0])
         self.date_end_str = date_to_str(self.returns_assets.index[-1])
 
-        # Initialize plotting object
-        self.plot = Plot()
+        # Plotting object, created on first use
+        self._plot = None
+
+        # Hierarchical clustering order of the assets, computed on first use
+        self._cluster_order = None
+
+        # Content hash of the input returns, computed on first use
+        self._fingerprint = None
+
+        # Derived results are only missing while being restored from a pickle
+        self._pending = False
+
+        # Timings and memory of the stages, recorded while instrumentation is enabled
+        self.instrumentation = StageRecorder("Performance")
+
+    def _calculate_metrics(self) -> None:
+        """
+        Calculates the derived results from the input returns.
+        """
+
+        stage = self.instrumentation.stage
 
         # Calculate cumulative returns
-        self.returns_cum = calc_returns_cum(self.returns_assets)
+        with stage("returns_cum"):
+            self.returns_cum = calc_returns_cum(self.returns_assets)
 
         # Calculate total returns
-        self.returns_total = calc_returns_total(self.returns_assets)
+        with stage("returns_total"):
+            self.returns_total = calc_returns_total(self.returns_assets)
 
         # Calculate covariance and correlation matrices
-        self.cov = self.returns_assets.cov()
-        self.corr = self.returns_assets.corr()
+        with stage("cov"):
+            self.cov = self.returns_assets.cov()
+        with stage("corr"):
+            self.corr = self.returns_assets.corr()
 
         # Calculate annualzied returns
-        self.returns_assets_annualized = calc_annualized_returns(self.returns_assets)
+        with stage("returns_annualized"):
+            self.returns_assets_annualized = calc_annualized_returns(
+                self.returns_assets, self.periods_per_year
+            )
 
         # Calculate annualized standard deviation
-        self.sd_assets_annualized = calc_annualized_sd(self.returns_assets)
-
-        # Calculate annualized returns of the risk-free asset
-        self.returns_rf_annualized = calc_annualized_returns(self.returns_rf)
+        with stage("sd_annualized"):
+            self.sd_assets_annualized = calc_annualized_sd(
+                self.returns_assets, self.periods_per_year
+            )
 
-        # Calculate annualized returns of the benchmark
-        self.returns_benchmark_annualized = calc_annualized_returns(
-            self.returns_benchmark
-        )
+        # Calculate annualized returns of the risk-free asset and the benchmark
+        with stage("returns_rf_benchmark_annualized"):
+            self.returns_rf_annualized = calc_annualized_returns(
+                self.returns_rf, self.periods_per_year
+            )
+            self.returns_benchmark_annualized = calc_annualized_returns(
+                self.returns_benchmark, self.periods_per_year
+            )
 
         # Calculate the mean and standard deviation of the assets
         self.mean_sd = pd.DataFrame(index=self.assets, columns=["mean", "sd"])
         self.mean_sd["mean"] = self.returns_assets_annualized
         self.mean_sd["sd"] = self.sd_assets_annualized
 
-        # Calculate the beta of the assets
-        self.beta = calculate_beta(self.returns_assets, self.returns_benchmark)
+        # Calculate the beta of the assets, from the returns aligned to the benchmark
+        with stage("beta"):
+            aligned = align_benchmark(self.returns_assets, self.returns_benchmark)
+            self.beta = pd.DataFrame(
+                index=self.assets,
+                columns=["beta"],
+                data=_beta(aligned, self.returns_benchmark.iloc[:, 0].var()),
+            )
+
+        # Calculate the tracking error, information ratio and captures of the assets
+        with stage("relative_metrics"):
+            self.relative_metrics = pd.DataFrame(
+                _relative_metrics(aligned, self.periods_per_year),
+                index=self.assets,
+                columns=RELATIVE_COLUMNS,
+            )
 
         # Calculate the alpha of the assets
-        self.alpha = calculate_alpha(
-            self.returns_assets,
-            self.returns_rf,
-            self.returns_benchmark,
-        )
+        with stage("alpha"):
+            self.alpha = calculate_alpha(
+                self.returns_assets,
+                self.returns_rf,
+                self.returns_benchmark,
+                self.periods_per_year,
+            )
 
         # Calculate the regression of the assets
-        self.regression = regression(self.returns_assets, self.returns_benchmark)
+        with stage("regression"):
+            self.regression = regression(self.returns_assets, self.returns_benchmark)
 
         # Calculate the sharpe ratio of the assets
-        self.sharpe_ratio = calculate_sharpe_ratio(
-            self.returns_assets,
-            self.returns_rf,
-        )
+        with stage("sharpe_ratio"):
+            self.sharpe_ratio = calculate_sharpe_ratio(
+                self.returns_assets,
+                self.returns_rf,
+                self.periods_per_year,
+            )
 
         # Calculate the treynor ratio of the assets
-        self.treynor_ratio = calculate_treynor_ratio(
-            self.returns_assets,
-            self.returns_rf,
-            self.returns_benchmark,
+        with stage("treynor_ratio"):
+            self.treynor_ratio = calculate_treynor_ratio(
+                self.returns_assets,
+                self.returns_rf,
+                self.returns_benchmark,
+                self.periods_per_year,
+            )
+
+        # Calculate the historical value at risk and conditional value at risk
+        with stage("tail_risk"):
+            var, cvar = calculate_tail_risk(self.returns_assets)
+            self.var, self.cvar = var.iloc[:, 0], cvar.iloc[:, 0]
+
+    def add_assets(self, returns: pd.DataFrame) -> None:
+        """
+        Adds assets to the analysis without recomputing the results of the existing
+        assets. The covariance and correlation matrices grow by a border of new rows
+        and columns, and only the per-asset metrics of the new assets are calculated.
+
+        Parameters:
+        - returns: A DataFrame containing the returns of the new assets, on the dates of
+          the existing assets.
+
+        Raises:
+        - ValueError: If any of the assets is already analyzed.
+        """
+
+        existing = returns.columns.intersection(self.returns_assets.columns)
+        if not existing.empty:
+            raise ValueError(f"Assets already analyzed: {existing.tolist()}")
+
+        # Derived results are needed before extending them, e.g. after unpickling
+        if self._pending:
+            self._pending = False
+            self._calculate_metrics()
+
+        with self.instrumentation.stage("add_assets"):
+            returns = returns.reindex(self.returns_assets.index)
+            old = self.returns_assets
+            self.returns_assets = pd.concat([old, returns], axis=1)
+            self.assets = self.returns_assets.columns.tolist()
+
+            self.returns_cum = pd.concat(
+                [self.returns_cum, calc_returns_cum(returns)], axis=1
+            )
+            self.returns_total = pd.concat(
+                [self.returns_total, calc_returns_total(returns)]
+            )
+
+            # Border of the covariance and correlation matrices
+            self.cov = self._bordered(
+                self.cov, calc_cross_cov(self.returns_assets, returns)
+            )
+            self.corr = self._bordered(
+                self.corr, calc_cross_cov(self.returns_assets, returns, normalize=True)
+            )
+
+            self.returns_assets_annualized = pd.concat(
+                [
+                    self.returns_assets_annualized,
+                    calc_annualized_returns(returns, self.periods_per_year),
+                ]
+            )
+            self.sd_assets_annualized = pd.concat(
+                [
+                    self.sd_assets_annualized,
+                    calc_annualized_sd(returns, self.periods_per_year),
+                ]
+            )
+            self.mean_sd = pd.concat(
+                [
+                    self.mean_sd,
+                    pd.DataFrame(
+                        {
+                            "mean": self.returns_assets_annualized[returns.columns],
+                            "sd": self.sd_assets_annualized[returns.columns],
+                        }
+                    ),
+                ]
+            )
+
+            args = (self.returns_rf, self.returns_benchmark, self.periods_per_year)
+            self.beta = pd.concat(
+                [self.beta, calculate_beta(returns, self.returns_benchmark)]
+            )
+            self.alpha = pd.concat([self.alpha, calculate_alpha(returns, *args)])
+            self.regression = pd.concat(
+                [self.regression, regression(returns, self.returns_benchmark)]
+            )
+            self.sharpe_ratio = pd.concat(
+                [
+                    self.sharpe_ratio,
+                    calculate_sharpe_ratio(
+                        returns, self.returns_rf, self.periods_per_year
+                    ),
+                ]
+            )
+            self.treynor_ratio = pd.concat(
+                [self.treynor_ratio, calculate_treynor_ratio(returns, *args)]
+            )
+            self.relative_metrics = pd.concat(
+                [
+                    self.relative_metrics,
+                    calculate_relative_metrics(
+                        returns, self.returns_benchmark, self.periods_per_year
+                    ),
+                ]
+            )
+            var, cvar = calculate_tail_risk(returns)
+            self.var = pd.concat([self.var, var.iloc[:, 0]])
+            self.cvar = pd.concat([self.cvar, cvar.iloc[:, 0]])
+
+        self._cluster_order = None
+        self._fingerprint = None
+
+    def drop_assets(self, assets: list) -> None:
+        """
+        Removes assets from the analysis, together with their rows and columns of the
+        covariance and correlation matrices, without recomputing any result.
+
+        Parameters:
+        - assets: The assets to remove.
+
+        Raises:
+        - ValueError: If an asset is not analyzed, or no asset would remain.
+        """
+
+        assets = [assets] if isinstance(assets, str) else list(assets)
+
+        missing = [asset for asset in assets if asset not in self.assets]
+        if missing:
+            raise ValueError(f"Assets not analyzed: {missing}")
+        if len(set(assets)) == len(self.assets):
+            raise ValueError("returns_assets cannot be empty")
+
+        if self._pending:
+            self._pending = False
+            self._calculate_metrics()
+
+        with self.instrumentation.stage("drop_assets"):
+            self.returns_assets = self.returns_assets.drop(columns=assets)
+            self.assets = self.returns_assets.columns.tolist()
+            self.returns_cum = self.returns_cum.drop(columns=assets)
+            self.cov = self.cov.drop(index=assets, columns=assets)
+            self.corr = self.corr.drop(index=assets, columns=assets)
+
+            for name in [
+                "returns_total",
+                "returns_assets_annualized",
+                "sd_assets_annualized",
+                "mean_sd",
+                "beta",
+                "alpha",
+                "regression",
+                "sharpe_ratio",
+                "treynor_ratio",
+                "relative_metrics",
+                "var",
+                "cvar",
+            ]:
+                setattr(self, name, getattr(self, name).drop(index=assets))
+
+        self._cluster_order = None
+        self._fingerprint = None
+
+    @staticmethod
+    def _bordered(matrix: pd.DataFrame, border: pd.DataFrame) -> pd.DataFrame:
+        """
+        Extends a symmetric matrix of N assets with the rows and columns of M new assets.
+
+        Parameters:
+        - matrix: The N x N matrix.
+        - border: The (N + M) x M matrix between all the assets and the new ones.
+
+        Returns:
+        - The (N + M) x (N + M) matrix.
+        """
+
+        n = matrix.shape[0]
+        values = np.block(
+            [
+                [matrix.to_numpy(dtype=float), border.to_numpy()[:n]],
+                [border.to_numpy()[:n].T, border.to_numpy()[n:]],
+            ]
         )
+        return pd.DataFrame(values, index=border.index, columns=border.index)
+
+    def __getstate__(self) -> dict:
+        """Returns the minimal state for pickling: the input returns as plain arrays.
+        Defaulted risk-free and benchmark returns are left out, and every derived
+        result is recomputed on first use after unpickling. With pickle protocol 5 the
+        arrays can be transferred out-of-band, see `dafin.serialize.dumps`.
+
+        Returns:
+            dict: The state of the object.
+        """
+
+        return {
+            "returns_assets": frame_to_state(self.returns_assets),
+            "returns_rf": None if self._default_rf else frame_to_state(self.returns_rf),
+            "returns_benchmark": (
+                None
+                if self._default_benchmark
+                else frame_to_state(self.returns_benchmark)
+            ),
+            "periods_per_year": self.periods_per_year,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        """Restores the input returns from the pickled state, and defers the derived
+        results until one of them is first accessed.
+
+        Parameters:
+            state (dict): The state returned by `__getstate__`.
+        """
+
+        self._set_inputs(
+            *(
+                None if state[k] is None else frame_from_state(state[k])
+                for k in ["returns_assets", "returns_rf", "returns_benchmark"]
+            ),
+            periods_per_year=state.get("periods_per_year"),
+        )
+        self._pending = True
+
+    def __getattr__(self, name: str):
+        """Calculates the derived results the first time one of them is accessed
+        after unpickling.
+
+        Parameters:
+            name (str): The name of the missing attribute.
+
+        Raises:
+            AttributeError: If the attribute does not exist.
+        """
+
+        if name.startswith("__") or not self.__dict__.get("_pending"):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+
+        self._pending = False
+        self._calculate_metrics()
+        return getattr(self, name)
 
     def __str__(self) -> str:
         """Returns a string representation of the object.
@@ -140,6 +488,16 @@ class Performance:
             pd.DataFrame: Summary of the performance.
         """
 
+        with self.instrumentation.stage("summary"):
+            return self._summary()
+
+    def _summary(self) -> pd.DataFrame:
+        """Builds the summary of the performance.
+
+        Returns:
+            pd.DataFrame: Summary of the performance.
+        """
+
         s = pd.DataFrame()
         s.index = self.returns_assets.columns
 
@@ -150,11 +508,125 @@ class Performance:
         s["Beta"] = self.beta
         s["Sharpe Ratio"] = self.sharpe_ratio
         s["Treynor Ratio"] = self.treynor_ratio
+        s[RELATIVE_COLUMNS] = self.relative_metrics
+        s["Value at Risk"] = self.var
+        s["Conditional Value at Risk"] = self.cvar
 
         s = pd.concat([s, self.regression], axis=1)
 
         return s
 
+    def tail_risk(
+        self,
+        confidence: Union[float, Sequence[float]] = DEFAULT_CONFIDENCE,
+        method: str = "historical",
+        window: int = None,
+    ) -> pd.DataFrame:
+        """Calculates the value at risk (VaR) and conditional value at risk (CVaR) of
+        the assets, see `dafin.utils.calculate_tail_risk`. The summary holds the
+        historical ones at DEFAULT_CONFIDENCE.
+
+        Parameters:
+        - confidence: The confidence levels, e.g. [0.95, 0.99] (optional).
+        - method: One of `dafin.utils.VAR_METHODS` (optional). Defaults to "historical".
+        - window: Number of returns of trailing windows (optional). Defaults to None,
+          the whole period.
+
+        Returns:
+        - pd.DataFrame: The VaR and CVaR, keyed by "VaR" and "CVaR" in the columns. Over
+          the whole period, each asset is a row and each confidence level a column;
+          over trailing windows, each window is a row, see `dafin.utils.rolling_tail_risk`.
+        """
+
+        with self.instrumentation.stage("tail_risk"):
+            if window is None:
+                var, cvar = calculate_tail_risk(self.returns_assets, confidence, method)
+            else:
+                var, cvar = rolling_tail_risk(
+                    self.returns_assets, window, confidence, method
+                )
+
+        return pd.concat({"VaR": var, "CVaR": cvar}, axis=1)
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the memory used by the DataFrames and Series of the object, e.g. its
+        input returns and its covariance and correlation matrices. Frames shared by
+        several attributes are counted once.
+
+        Returns:
+            int: The size in bytes.
+        """
+
+        frames = {
+            id(value): value
+            for value in vars(self).values()
+            if isinstance(value, (pd.DataFrame, pd.Series))
+        }
+        return sum(
+            int(np.sum(frame.memory_usage(deep=True))) for frame in frames.values()
+        )
+
+    def compact(self):
+        """Returns a compact result that only keeps the summary of the performance,
+        for sweeps that keep many results alive, see `dafin.compact`.
+
+        Returns:
+            CompactPerformance: The compact result.
+        """
+
+        from .compact import CompactPerformance
+
+        return CompactPerformance.from_performance(self)
+
+    @property
+    def timings(self) -> dict:
+        """Returns the recorded duration of each stage, see `dafin.instrument`.
+
+        Returns:
+            dict: The duration in seconds, keyed by stage.
+        """
+
+        return self.instrumentation.timings
+
+    @property
+    def memory(self) -> dict:
+        """Returns the recorded peak memory of each stage, see `dafin.instrument`.
+
+        Returns:
+            dict: The peak memory in bytes, keyed by stage.
+        """
+
+        return self.instrumentation.memory
+
+    @property
+    def cluster_order(self) -> list:
+        """Returns the hierarchical clustering order of the assets, computed once.
+
+        Returns:
+            list: Positional order of the assets.
+        """
+
+        if self._cluster_order is None:
+            self._cluster_order = cluster_order(self.corr)
+
+        return self._cluster_order
+
+    @property
+    def plot(self):
+        """Returns the plotting object, importing the plotting libraries on first use.
+
+        Returns:
+            Plot: The plotting object.
+        """
+
+        if self._plot is None:
+            from .plot import Plot
+
+            self._plot = Plot()
+
+        return self._plot
+
     def plot_returns(
         self,
         alpha: float = 1,
@@ -205,20 +677,24 @@ class Performance:
             yscale=yscale,
         )
 
-    def plot_corr(self, title: str = "Correlation Matrix"):
+    def plot_corr(self, title: str = "Correlation Matrix", cluster: bool = False):
         return self.plot.plot_heatmap(
             df=self.returns_assets,
             relation_type="corr",
             title=title,
             annotate=True,
+            relations=self.corr,
+            order=self.cluster_order if cluster else None,
         )
 
-    def plot_cov(self, title: str = "Covariance Matrix"):
+    def plot_cov(self, title: str = "Covariance Matrix", cluster: bool = False):
         return self.plot.plot_heatmap(
             df=self.returns_assets,
             relation_type="cov",
             title=title,
             annotate=True,
+            relations=self.cov,
+            order=self.cluster_order if cluster else None,
         )
 
     def plot_mean_sd(
@@ -241,45 +717,345 @@ class Performance:
             ax=ax,
         )
 
-    def save_figs(self, path: Path, prefix: str = "experiment"):
+    @property
+    def fingerprint(self) -> str:
+        """Returns a content hash of the input returns, computed once.
+
+        Returns:
+            str: The hexadecimal content hash.
+        """
+
+        if self._fingerprint is None:
+            self._fingerprint = fingerprint(
+                self.returns_assets,
+                self.returns_rf,
+                self.returns_benchmark,
+                self.periods_per_year,
+            )
+
+        return self._fingerprint
+
+    def save_figs(
+        self,
+        path: Path,
+        prefix: str = "experiment",
+        cache: bool = False,
+        plot_kwargs: dict = None,
+    ):
+        """Saves the performance plots as PNG files.
+
+        Parameters:
+            path (Path): Directory for the files.
+            prefix (str, optional): Prefix of the file names. Defaults to "experiment".
+            cache (bool, optional): If True, plots whose inputs and parameters match
+                the manifest in `path` are not rendered again. Defaults to False.
+            plot_kwargs (dict, optional): Arguments of the plots, keyed by figure name,
+                e.g. `{"corr": {"cluster": True}}`. Defaults to None.
+
+        Returns:
+            dict: The number of cache hits and misses.
+        """
+
+        import matplotlib
+        import matplotlib.pyplot as plt
+
+        from . import plot as plot_module
 
         path.mkdir(parents=True, exist_ok=True)
+        manifest = open_manifest(path, prefix, cache)
         prefix = f"{prefix}_plot"
 
-        fig, _ = self.plot_returns()
-        fig.savefig(path / Path(f"{prefix}_returns.png"))
+        figures = {
+            "returns": self.plot_returns,
+            "cum_returns": self.plot_cum_returns,
+            "total_returns": self.plot_total_returns,
+            "dist_returns": self.plot_dist_returns,
+            "corr": self.plot_corr,
+            "cov": self.plot_cov,
+            "mean_sd": self.plot_mean_sd,
+        }
+
+        # Options of the plotting module that shape every figure
+        options = sorted(
+            (k, v) for k, v in vars(plot_module).items() if k.startswith("DEFAULT_")
+        )
 
-        fig, _ = self.plot_cum_returns()
-        fig.savefig(path / Path(f"{prefix}_cum_returns.png"))
+        for name, plot in figures.items():
+            kwargs = (plot_kwargs or {}).get(name, {})
+            arguments = inspect.signature(plot).bind(**kwargs)
+            arguments.apply_defaults()
+            key = fingerprint(
+                self.fingerprint,
+                "plot",
+                name,
+                sorted(arguments.arguments.items()),
+                options,
+                ARTIFACT_VERSION,
+                matplotlib.__version__,
+            )
+            if manifest and manifest.hit(f"plot_{name}", key):
+                continue
 
-        fig, _ = self.plot_total_returns()
-        fig.savefig(path / Path(f"{prefix}_total_returns.png"))
+            file = path / Path(f"{prefix}_{name}.png")
+            with self.instrumentation.stage(f"save_figs.{name}"):
+                fig, _ = plot(**kwargs)
+                fig.savefig(file)
+                plt.close(fig)
 
-        fig, _ = self.plot_dist_returns()
-        fig.savefig(path / Path(f"{prefix}_dist_returns.png"))
+            if manifest:
+                manifest.record(f"plot_{name}", key, file)
 
-        fig, _ = self.plot_corr()
-        fig.savefig(path / Path(f"{prefix}_corr.png"))
+        return self._close_manifest(manifest)
 
-        fig, _ = self.plot_cov()
-        fig.savefig(path / Path(f"{prefix}_cov.png"))
+    def save_data(
+        self,
+        path: Path,
+        prefix: str = "experiment",
+        data_format: str = "csv",
+        compression: str = None,
+        cache: bool = False,
+    ):
+        """Saves the performance data to files.
 
-        fig, _ = self.plot_mean_sd()
-        fig.savefig(path / Path(f"{prefix}_mean_sd.png"))
+        Parameters:
+            path (Path): Directory for the files.
+            prefix (str, optional): Prefix of the file names. Defaults to "experiment".
+            data_format (str, optional): One of "csv", "parquet", "feather" or "bundle". The
+                bundle is a single zip file holding every artifact as Parquet together
+                with its metadata, and can be restored with `Performance.load_data`.
+                Defaults to "csv".
+            compression (str, optional): Compression codec of the files. Defaults to None.
+            cache (bool, optional): If True, files whose inputs match the manifest in
+                `path` are not written again. Defaults to False.
 
-    def save_data(self, path: Path, prefix: str = "experiment"):
+        Returns:
+            dict: The number of cache hits and misses.
+        """
 
         path.mkdir(parents=True, exist_ok=True)
+        manifest = open_manifest(path, prefix, cache)
         prefix = f"{prefix}_data"
 
-        self.returns_assets.to_csv(path / Path(f"{prefix}_returns.csv"))
-        self.returns_cum.to_csv(path / Path(f"{prefix}_cum_returns.csv"))
-        self.returns_total.to_csv(path / Path(f"{prefix}_total_returns.csv"))
-        self.corr.to_csv(path / Path(f"{prefix}__corr.csv"))
-        self.cov.to_csv(path / Path(f"{prefix}__cov.csv"))
-        self.mean_sd.to_csv(path / Path(f"{prefix}__mean_sd.csv"))
+        if data_format == "bundle":
+            artifacts = {"bundle": None}
+        else:
+            artifacts = self._data_artifacts()
 
-    def save_results(self, path: Path, prefix: str = "experiment"):
+        for name, data in artifacts.items():
+            key = fingerprint(
+                self.fingerprint,
+                "data",
+                name,
+                data_format,
+                compression,
+                ARTIFACT_VERSION,
+            )
+            if manifest and manifest.hit(f"data_{name}", key):
+                continue
 
-        self.save_data(path=path, prefix=prefix)
-        self.save_figs(path=path, prefix=prefix)
+            with self.instrumentation.stage(f"save_data.{name}"):
+                if data_format == "bundle":
+                    file = path / Path(f"{prefix}.zip")
+                    self._save_bundle(file, compression)
+                else:
+                    file = write_frame(
+                        data, path / Path(f"{prefix}_{name}"), data_format, compression
+                    )
+
+            if manifest:
+                manifest.record(f"data_{name}", key, file)
+
+        return self._close_manifest(manifest)
+
+    def _close_manifest(self, manifest: ArtifactManifest) -> dict:
+        """Saves the artifact manifest and reports its cache hits and misses.
+
+        Parameters:
+            manifest (ArtifactManifest): The manifest, or None if caching is disabled.
+
+        Returns:
+            dict: The number of cache hits and misses.
+        """
+
+        if manifest is None:
+            return {"hits": 0, "misses": 0}
+
+        manifest.save()
+        logger.info(str(manifest))
+        return manifest.stats
+
+    def _data_artifacts(self) -> dict:
+        """Returns the artifacts written by `save_data`, keyed by file name suffix.
+
+        Returns:
+            dict: The artifacts, keyed by file name suffix.
+        """
+
+        return {
+            "returns": self.returns_assets,
+            "cum_returns": self.returns_cum,
+            "total_returns": self.returns_total,
+            "_corr": self.corr,
+            "_cov": self.cov,
+            "_mean_sd": self.mean_sd,
+        }
+
+    def _save_bundle(self, path: Path, compression: str = None):
+        """Saves every artifact and its metadata to a single zip file of Parquet members.
+
+        Parameters:
+            path (Path): Path of the bundle.
+            compression (str, optional): Parquet compression codec. Defaults to None.
+        """
+
+        frames = self._data_artifacts()
+        frames["returns_rf"] = self.returns_rf
+        frames["returns_benchmark"] = self.returns_benchmark
+        frames["summary"] = self.summary
+
+        metadata = {
+            "version": BUNDLE_VERSION,
+            "assets": self.assets,
+            "asset_rf": self.asset_rf,
+            "asset_benchmark": self.asset_benchmark,
+            "periods_per_year": self.periods_per_year,
+            "returns_rf_annualized": float(self.returns_rf_annualized.iloc[0]),
+            "returns_benchmark_annualized": float(
+                self.returns_benchmark_annualized.iloc[0]
+            ),
+            "artifacts": list(frames),
+        }
+
+        with tempfile.TemporaryDirectory() as tmp_dir, zipfile.ZipFile(
+            path, "w", compression=zipfile.ZIP_STORED
+        ) as bundle:
+            for name, data in frames.items():
+                file = write_frame(data, Path(tmp_dir) / name, "parquet", compression)
+                bundle.write(file, arcname=file.name)
+            bundle.writestr("metadata.json", json.dumps(metadata))
+
+    @classmethod
+    def load_data(cls, path: Path, prefix: str = "experiment") -> "Performance":
+        """Restores a Performance saved with `save_data(data_format="bundle")`, without
+        recomputing any of its results.
+
+        Parameters:
+            path (Path): Directory of the bundle.
+            prefix (str, optional): Prefix of the bundle file name. Defaults to "experiment".
+
+        Raises:
+            ValueError: If the bundle version is not supported.
+
+        Returns:
+            Performance: The restored Performance.
+        """
+
+        with tempfile.TemporaryDirectory() as tmp_dir, zipfile.ZipFile(
+            path / Path(f"{prefix}_data.zip")
+        ) as bundle:
+            metadata = json.loads(bundle.read("metadata.json"))
+            if metadata["version"] != BUNDLE_VERSION:
+                raise ValueError(f"Unsupported bundle version: {metadata['version']}")
+
+            bundle.extractall(tmp_dir)
+            frames = {
+                name: read_frame(Path(tmp_dir) / f"{name}.parquet", "parquet")
+                for name in metadata["artifacts"]
+            }
+
+        performance = cls.__new__(cls)
+        performance._restore(frames, metadata)
+        return performance
+
+    def _restore(self, frames: dict, metadata: dict):
+        """Sets the attributes of the object from the contents of a bundle.
+
+        Parameters:
+            frames (dict): The artifacts of the bundle, keyed by name.
+            metadata (dict): The metadata of the bundle.
+        """
+
+        summary = frames["summary"]
+
+        self.returns_assets = frames["returns"]
+        self.returns_rf = frames["returns_rf"]
+        self.returns_benchmark = frames["returns_benchmark"]
+        self._default_rf = False
+        self._default_benchmark = False
+        self._pending = False
+        self.instrumentation = StageRecorder("Performance")
+
+        self.assets = metadata["assets"]
+        self.asset_rf = metadata["asset_rf"]
+        self.asset_benchmark = metadata["asset_benchmark"]
+        self.periods_per_year = metadata.get(
+            "periods_per_year", infer_periods_per_year(self.returns_assets.index)
+        )
+        self.date_start_str = date_to_str(self.returns_assets.index[0])
+        self.date_end_str = date_to_str(self.returns_assets.index[-1])
+
+        self._plot = None
+
+        self.returns_cum = frames["cum_returns"]
+        self.returns_total = frames["total_returns"].iloc[:, 0]
+        self.cov = frames["_cov"]
+        self.corr = frames["_corr"]
+        self._cluster_order = None
+        self._fingerprint = None
+
+        self.returns_assets_annualized = summary["Expected Returns"]
+        self.sd_assets_annualized = summary["Standard Deviation"]
+        self.returns_rf_annualized = pd.Series(
+            [metadata["returns_rf_annualized"]], index=[self.asset_rf]
+        )
+        self.returns_benchmark_annualized = pd.Series(
+            [metadata["returns_benchmark_annualized"]], index=[self.asset_benchmark]
+        )
+        self.mean_sd = frames["_mean_sd"]
+
+        self.beta = summary[["Beta"]].rename(columns={"Beta": "beta"})
+        self.alpha = summary[["Alpha"]].rename(columns={"Alpha": "alpha"})
+        self.regression = summary.loc[:, "Slope":]
+        self.sharpe_ratio = summary["Sharpe Ratio"]
+        self.treynor_ratio = summary[["Treynor Ratio"]].rename(
+            columns={"Treynor Ratio": "beta"}
+        )
+
+        # Bundles written before these metrics were part of the summary lack them
+        if set(RELATIVE_COLUMNS).issubset(summary.columns):
+            self.relative_metrics = summary[RELATIVE_COLUMNS]
+        else:
+            self.relative_metrics = calculate_relative_metrics(
+                self.returns_assets, self.returns_benchmark, self.periods_per_year
+            )
+
+        if "Value at Risk" in summary:
+            self.var = summary["Value at Risk"]
+            self.cvar = summary["Conditional Value at Risk"]
+        else:
+            var, cvar = calculate_tail_risk(self.returns_assets)
+            self.var, self.cvar = var.iloc[:, 0], cvar.iloc[:, 0]
+
+    def save_results(self, path: Path, prefix: str = "experiment", cache: bool = False):
+        """Saves the performance data and plots.
+
+        Parameters:
+            path (Path): Directory for the files.
+            prefix (str, optional): Prefix of the file names. Defaults to "experiment".
+            cache (bool, optional): If True, artifacts whose inputs are unchanged are
+                skipped, see `save_figs` and `save_data`. Defaults to False, every
+                artifact is written.
+
+        Returns:
+            dict: The total number of cache hits and misses.
+        """
+
+        stats_data = self.save_data(path=path, prefix=prefix, cache=cache)
+        stats_figs = self.save_figs(path=path, prefix=prefix, cache=cache)
+
+        stats = {k: stats_data[k] + stats_figs[k] for k in stats_data}
+        logger.info(
+            f"Saved results to {path}: "
+            f"{stats['hits']} cache hits, {stats['misses']} cache misses"
+        )
+        return stats
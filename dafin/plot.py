@@ -16,6 +16,16 @@ sns.set_style("whitegrid")
 DEFAULT_SIZE = (15, 8)
 DEFAULT_SIZE_SQUARE = (15, 15)
 
+# Heatmaps of more assets than this are drawn as a rasterized image instead of seaborn
+# cells, with tick labels on about this many assets
+DEFAULT_HEATMAP_MAX_ASSETS = 60
+
+# Heatmaps of more assets than this are never annotated, since the labels would overlap
+DEFAULT_HEATMAP_MAX_ANNOTATE = 25
+
+# Scatter plots with more points than this only label the top points
+DEFAULT_SCATTER_MAX_LABELS = 50
+
 # Configuration for matplotlib aesthetics
 params = {
     "font.family": "serif",
@@ -31,6 +41,43 @@ params = {
 pylab.rcParams.update(params)
 
 
+def label_offsets(x, y, step=0.03):
+    """
+    Computes deterministic label offsets that spread out labels of nearby points.
+
+    Points are binned into a grid of label-sized cells in normalized coordinates,
+    and the labels sharing a cell are stacked alternately above and below the point.
+
+    Parameters:
+    - x (np.ndarray): Normalized x coordinates of the points.
+    - y (np.ndarray): Normalized y coordinates of the points.
+    - step (float, optional): Label height in normalized coordinates. Default is 0.03.
+
+    Returns:
+    - np.ndarray: Vertical offset of each label in normalized coordinates.
+
+    >>> label_offsets(np.array([0.0, 0.0, 1.0]), np.array([0.0, 0.0, 1.0]))
+    array([ 0.03, -0.03,  0.03])
+    """
+
+    # Bin the points into cells of one label width by one label height
+    cells_x = np.floor(x / (2 * step)).astype(np.int64)
+    cells_y = np.floor(y / step).astype(np.int64)
+    _, cells = np.unique(np.stack([cells_x, cells_y]), axis=1, return_inverse=True)
+    cells = cells.ravel()
+
+    # Rank of each point within its cell, in input order
+    order = np.argsort(cells, kind="stable")
+    counts = np.bincount(cells)
+    starts = np.cumsum(counts) - counts
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order)) - starts[cells[order]]
+
+    # Alternate above and below the point, moving further out for each label
+    sign = np.where(rank % 2 == 0, 1.0, -1.0)
+    return sign * (1 + rank // 2) * step
+
+
 class Plot:
     def __init__(self):
 
@@ -90,17 +137,27 @@ class Plot:
         return fig, ax
 
     def plot_heatmap(
-        self, df, relation_type, title="", annotate=True, figsize=DEFAULT_SIZE
+        self,
+        df,
+        relation_type,
+        title="",
+        annotate=True,
+        figsize=DEFAULT_SIZE,
+        relations=None,
+        order=None,
     ):
         """
         Plot a heatmap based on the relation type specified.
 
         Parameters:
-        - df (pd.DataFrame): Input data.
+        - df (pd.DataFrame): Input data. Ignored if `relations` is provided.
         - relation_type (str): Type of relation to visualize. Supports 'corr' for correlation and 'cov' for covariance.
         - title (str, optional): Title of the heatmap. Defaults to an empty string.
         - annotate (bool, optional): Flag to determine if the heatmap should be annotated. Default is True.
+          Matrices of more than DEFAULT_HEATMAP_MAX_ANNOTATE assets are never annotated.
         - figsize (tuple, optional): Dimensions for the heatmap. Default is DEFAULT_SIZE.
+        - relations (pd.DataFrame, optional): Precomputed correlation or covariance matrix. Default is None.
+        - order (list, optional): Positional order of the assets, e.g. from `cluster_order`. Default is None.
 
         Returns:
         - fig (matplotlib.figure.Figure): Figure object.
@@ -119,38 +176,71 @@ class Plot:
 
         # Determine the type of relation and set appropriate parameters
         if relation_type == "corr":
-            relations = df.corr()
+            relations = df.corr() if relations is None else relations
             annot_fmt = "0.2f"
             vmin, vmax = -1, 1
         elif relation_type == "cov":
-            relations = df.cov()
+            relations = df.cov() if relations is None else relations
             annot_fmt = "1.1g"
             vmin, vmax = relations.min().min(), relations.max().max()
         else:
             raise NotImplementedError(f"Unsupported relation type: {relation_type}")
 
+        # Reorder the matrix, e.g. to group clustered assets together
+        if order is not None:
+            relations = relations.iloc[order, order]
+
         # Set mask for heatmap
-        mask = np.zeros_like(relations)
+        mask = np.zeros_like(relations, dtype=bool)
         mask[np.triu_indices_from(mask, k=1)] = True
 
-        # Plot heatmap
-        sns.heatmap(
-            relations,
-            cmap="RdYlGn",
-            mask=mask,
-            annot=annotate,
-            fmt=annot_fmt,
-            annot_kws={"fontsize": 14},
-            vmin=vmin,
-            vmax=vmax,
-            ax=ax,
-            xticklabels=relations.columns,
-            yticklabels=relations.columns,
-        )
+        n_assets = relations.shape[0]
+        annotate = annotate and n_assets <= DEFAULT_HEATMAP_MAX_ANNOTATE
+
+        if n_assets <= DEFAULT_HEATMAP_MAX_ASSETS:
+
+            # Plot heatmap
+            sns.heatmap(
+                relations,
+                cmap="RdYlGn",
+                mask=mask,
+                annot=annotate,
+                fmt=annot_fmt,
+                annot_kws={"fontsize": 14},
+                vmin=vmin,
+                vmax=vmax,
+                ax=ax,
+                xticklabels=relations.columns,
+                yticklabels=relations.columns,
+            )
+
+            # Adjust x and y ticks
+            ax.set_xticklabels(ax.get_xticklabels(), rotation=90)
+            ax.set_yticklabels(ax.get_yticklabels(), rotation=0)
 
-        # Adjust x and y ticks
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=90)
-        ax.set_yticklabels(ax.get_yticklabels(), rotation=0)
+        else:
+
+            # Draw large matrices as a single rasterized image
+            image = ax.imshow(
+                np.ma.masked_array(relations.to_numpy(dtype=float), mask=mask),
+                cmap="RdYlGn",
+                vmin=vmin,
+                vmax=vmax,
+                interpolation="nearest",
+                aspect="auto",
+                rasterized=True,
+            )
+            fig.colorbar(image, ax=ax)
+            ax.grid(False)
+
+            # Only label a readable subset of the assets
+            step = int(np.ceil(n_assets / DEFAULT_HEATMAP_MAX_ASSETS))
+            ticks = np.arange(0, n_assets, step)
+            labels = relations.columns[ticks]
+            ax.set_xticks(ticks)
+            ax.set_xticklabels(labels, rotation=90)
+            ax.set_yticks(ticks)
+            ax.set_yticklabels(labels, rotation=0)
 
         # Set title
         ax.set_title(title)
@@ -293,10 +383,15 @@ class Plot:
         colour="tab:blue",
         fig=None,
         ax=None,
+        max_labels=DEFAULT_SCATTER_MAX_LABELS,
     ):
         """
         Plot a scatter graph of given dataframe values with labels.
 
+        Labels are placed deterministically, and only the `max_labels` points with the
+        highest mean are labelled when there are more points than that. Points with an
+        undefined mean or standard deviation are not labelled.
+
         Parameters:
         - df (pd.DataFrame): DataFrame containing columns 'sd' and 'mean' for plotting.
         - title (str): Title of the graph. Default is an empty string.
@@ -306,6 +401,7 @@ class Plot:
         - colour (str): Color of scatter points. Default is "tab:blue".
         - fig (matplotlib.figure.Figure, optional): Figure object if provided, else will create a new one.
         - ax (matplotlib.axes._subplots.AxesSubplot, optional): Axes object if provided, else will create a new one.
+        - max_labels (int, optional): Maximum number of labelled points. Default is DEFAULT_SCATTER_MAX_LABELS.
 
         Returns:
         - fig (matplotlib.figure.Figure): Figure object.
@@ -326,21 +422,45 @@ class Plot:
         ax.yaxis.set_major_formatter(FormatStrFormatter("%.2f"))
 
         # Scatter plot
-        df.plot.scatter(x="sd", y="mean", c=colour, ax=ax, s=200, alpha=1.0)
+        many_points = len(df) > max_labels
+        df.plot.scatter(
+            x="sd",
+            y="mean",
+            c=colour,
+            ax=ax,
+            s=20 if many_points else 200,
+            alpha=1.0,
+            rasterized=many_points,
+        )
 
         x_diff = df["sd"].max() - df["sd"].min()
         y_diff = df["mean"].max() - df["mean"].min()
 
-        # Label each point with its index
-        for i, point in df.iterrows():
-            r = np.random.choice([-1, 1])
-            ax.text(
-                point["sd"] - x_diff * 0.03,
-                point["mean"] + r * y_diff * 0.03,
-                i,
-                fontsize=12,
+        # Select the points to label, skipping undefined ones and keeping the highest
+        # means for large sets
+        x = df["sd"].to_numpy(dtype=float)
+        y = df["mean"].to_numpy(dtype=float)
+        labelled = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+        if max_labels <= 0:
+            labelled = labelled[:0]
+        elif len(labelled) > max_labels:
+            top = np.argpartition(-y[labelled], max_labels - 1)[:max_labels]
+            labelled = np.sort(labelled[top])
+
+        if len(labelled):
+            # Compute all label positions at once
+            x_scale = x_diff or 1.0
+            y_scale = y_diff or 1.0
+            x_labels = x[labelled] - x_scale * 0.03
+            y_labels = y[labelled] + y_scale * label_offsets(
+                (x[labelled] - np.nanmin(x)) / x_scale,
+                (y[labelled] - np.nanmin(y)) / y_scale,
             )
 
+            # Label the selected points with their index
+            for x_label, y_label, name in zip(x_labels, y_labels, df.index[labelled]):
+                ax.text(x_label, y_label, name, fontsize=12)
+
         # Grid, labels, and title
         plt.grid(True, axis="y")
         ax.set_xlabel(xlabel)
@@ -0,0 +1,414 @@
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from .serialize import frame_from_bytes, frame_to_bytes
+
+# Magic bytes at the start of the Parquet files of the cached histories
+PARQUET_MAGIC = b"PAR1"
+
+# Time after which the recent bars of a cached price history are fetched again
+DEFAULT_TTL_RECENT = datetime.timedelta(hours=12)
+
+# Bars older than this (relative to the last cached bar) are immutable and never fetched again
+DEFAULT_RECENT_DAYS = 7
+
+# Maximum total size of the cached price histories
+DEFAULT_MAX_BYTES = 1024**3
+
+# Number of reads whose access times are buffered before being written in one batch
+DEFAULT_TOUCH_BATCH = 64
+
+# Seconds a connection waits for the write lock of another connection
+DEFAULT_BUSY_TIMEOUT = 30.0
+
+# Default cache shared by all ReturnsData instances, created on first use
+_PRICE_CACHE = None
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns the directory of the cache files, resolved when it is used so that the
+    DAFIN_CACHE_DIR variable can be set after importing dafin.
+
+    Returns:
+        Path: The value of DAFIN_CACHE_DIR, or ~/.cache/dafin.
+    """
+    return Path(os.environ.get("DAFIN_CACHE_DIR", Path.home() / ".cache" / "dafin"))
+
+
+def __getattr__(name):
+    # Backwards compatibility for the former module-level directory
+    if name == "DEFAULT_CACHE_DIR":
+        return default_cache_dir()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class PriceCache:
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_recent: datetime.timedelta = DEFAULT_TTL_RECENT,
+        recent_days: int = DEFAULT_RECENT_DAYS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        wal: bool = True,
+        touch_batch: int = DEFAULT_TOUCH_BATCH,
+    ) -> None:
+        """
+        Initializes a bounded cache of price histories, stored per ticker in SQLite.
+
+        The recent bars of a history expire after `ttl_recent`, and are then fetched
+        again from `recent_days` before the last cached bar, while the older bars are
+        kept as they are. When the cache exceeds `max_bytes`, the least recently used
+        histories are evicted.
+
+        The cache can be shared by the threads of a server: each thread uses its own
+        connection, and in WAL mode readers never wait for a writer. Reads do not
+        write; their access times are buffered and written in batches, and the
+        histories of a download are stored in a single transaction.
+
+        Parameters:
+            path (Path, optional): The path of the cache database. Defaults to
+                "prices.sqlite" in `default_cache_dir()`.
+            ttl_recent (datetime.timedelta, optional): Time to live of the recent bars.
+                Defaults to DEFAULT_TTL_RECENT.
+            recent_days (int, optional): Number of days of bars that may still be revised.
+                Defaults to DEFAULT_RECENT_DAYS.
+            max_bytes (int, optional): Maximum total size of the cached histories.
+                Defaults to DEFAULT_MAX_BYTES.
+            wal (bool, optional): If True, the database uses write-ahead logging, which
+                is not supported on network file systems. Defaults to True.
+            touch_batch (int, optional): Number of reads whose access times are
+                buffered. Defaults to DEFAULT_TOUCH_BATCH.
+        """
+
+        self.logger = logging.getLogger(__name__)
+
+        self.path = (
+            Path(path) if path is not None else default_cache_dir() / "prices.sqlite"
+        )
+        self.ttl_recent = ttl_recent
+        self.recent_days = recent_days
+        self.max_bytes = max_bytes
+        self.wal = wal
+        self.touch_batch = touch_batch
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.evictions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+        # Connections of the threads, and the buffered access times of their reads
+        self._local = threading.local()
+        self._connections = []
+        self._touches: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS prices ("
+                "ticker TEXT PRIMARY KEY, data BLOB, size INTEGER, "
+                "fetched_at REAL, accessed_at REAL)"
+            )
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the current thread, opening it on first use.
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Only used by this thread, but closed by whichever thread calls `close`
+            connection = sqlite3.connect(
+                self.path, timeout=DEFAULT_BUSY_TIMEOUT, check_same_thread=False
+            )
+            if self.wal:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+
+        return connection
+
+    def get(self, ticker: str) -> Tuple[Optional[pd.DataFrame], bool]:
+        """
+        Retrieves the cached price history of a ticker.
+
+        Parameters:
+            ticker (str): The ticker.
+
+        Returns:
+            Tuple[Optional[pd.DataFrame], bool]: The history, or None if it is not
+                cached, and whether its recent bars are still fresh.
+        """
+
+        row = self._connection.execute(
+            "SELECT data, fetched_at FROM prices WHERE ticker = ?", (ticker,)
+        ).fetchone()
+
+        # Histories in any other format, e.g. pickled by earlier versions, are never
+        # loaded, and are replaced by the next download
+        if row is not None and not row[0].startswith(PARQUET_MAGIC):
+            row = None
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None, False
+
+        data, fetched_at = row
+        now = time.time()
+        fresh = now - fetched_at < self.ttl_recent.total_seconds()
+
+        with self._lock:
+            self._touches[ticker] = now
+            self.bytes_read += len(data)
+            if fresh:
+                self.hits += 1
+            else:
+                self.refreshes += 1
+            flush = len(self._touches) >= self.touch_batch
+
+        if flush:
+            self.flush()
+
+        return frame_from_bytes(data), fresh
+
+    def put(self, ticker: str, prices: pd.DataFrame) -> None:
+        """
+        Stores the price history of a ticker, and evicts the least recently used
+        histories if the cache exceeds its maximum size.
+
+        Parameters:
+            ticker (str): The ticker.
+            prices (pd.DataFrame): The price history, one column per price field.
+        """
+
+        self.put_many({ticker: prices})
+
+    def put_many(self, histories: Dict[str, pd.DataFrame]) -> None:
+        """
+        Stores the price histories of several tickers in a single transaction, and
+        evicts the least recently used histories if the cache exceeds its maximum size.
+
+        Parameters:
+            histories (Dict[str, pd.DataFrame]): The price history of each ticker.
+        """
+
+        if not histories:
+            return
+
+        now = time.time()
+        rows = []
+        for ticker, prices in histories.items():
+            data = frame_to_bytes(prices)
+            rows.append((ticker, data, len(data), now, now))
+
+        with self._connection as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+        with self._lock:
+            self.bytes_written += sum(row[2] for row in rows)
+
+        self.evict()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered access times of the reads in a single transaction.
+        """
+
+        with self._lock:
+            touches, self._touches = self._touches, {}
+
+        if touches:
+            with self._connection as connection:
+                connection.executemany(
+                    "UPDATE prices SET accessed_at = ? WHERE ticker = ?",
+                    [(accessed_at, ticker) for ticker, accessed_at in touches.items()],
+                )
+
+    def cutoff(self, prices: pd.DataFrame) -> pd.Timestamp:
+        """
+        Returns the date from which the bars of a cached history are fetched again.
+
+        Parameters:
+            prices (pd.DataFrame): The cached price history.
+
+        Returns:
+            pd.Timestamp: The first date of the recent bars.
+        """
+        return prices.index[-1] - pd.Timedelta(days=self.recent_days)
+
+    def merge(self, prices: pd.DataFrame, recent: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replaces the recent bars of a cached history with newly fetched bars.
+
+        Parameters:
+            prices (pd.DataFrame): The cached price history.
+            recent (pd.DataFrame): The bars fetched from `cutoff(prices)` onwards.
+
+        Returns:
+            pd.DataFrame: The updated price history.
+        """
+
+        old = prices[prices.index < self.cutoff(prices)]
+        merged = pd.concat([old, recent])
+        return merged[~merged.index.duplicated(keep="last")]
+
+    def evict(self) -> None:
+        """
+        Evicts the least recently used histories until the cache fits its maximum size.
+        """
+
+        size = self.size_bytes
+        if size <= self.max_bytes:
+            return
+
+        # The order of eviction depends on the buffered access times
+        self.flush()
+
+        rows = self._connection.execute(
+            "SELECT ticker, size FROM prices ORDER BY accessed_at"
+        ).fetchall()
+
+        evicted = []
+        for ticker, ticker_size in rows:
+            if size <= self.max_bytes:
+                break
+            evicted.append((ticker,))
+            size -= ticker_size
+
+        with self._connection as connection:
+            connection.executemany("DELETE FROM prices WHERE ticker = ?", evicted)
+
+        with self._lock:
+            self.evictions += len(evicted)
+        self.logger.info(f"Evicted {len(evicted)} price histories from {self.path}")
+
+    def compact(self) -> None:
+        """
+        Reclaims the disk space of evicted histories.
+        """
+        self._connection.execute("VACUUM")
+
+    def clear(self) -> None:
+        """
+        Removes every cached history.
+        """
+        with self._lock:
+            self._touches.clear()
+
+        with self._connection as connection:
+            connection.execute("DELETE FROM prices")
+        self.compact()
+
+    def close(self) -> None:
+        """
+        Writes the buffered access times, and closes the connections of all threads.
+        """
+
+        self.flush()
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        Returns the total size of the cached histories.
+
+        Returns:
+            int: The size in bytes.
+        """
+        (size,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM prices"
+        ).fetchone()
+        return size
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: The hits, misses, refreshes, evictions, bytes read and written, and
+                the current number of entries and size.
+        """
+
+        (entries,) = self._connection.execute("SELECT COUNT(*) FROM prices").fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "entries": entries,
+            "size_bytes": self.size_bytes,
+        }
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the cache.
+
+        Returns:
+            str: The path and counters of the cache.
+        """
+        stats = ", ".join(f"{k}={v}" for k, v in self.stats.items())
+        return f"Price cache {self.path}: {stats}"
+
+
+def get_price_cache() -> PriceCache:
+    """
+    Returns the default price cache, creating it on first use.
+
+    Returns:
+        PriceCache: The default price cache.
+    """
+
+    global _PRICE_CACHE
+
+    if _PRICE_CACHE is None:
+        _PRICE_CACHE = PriceCache()
+
+    return _PRICE_CACHE
+
+
+def configure_cache(**kwargs) -> PriceCache:
+    """
+    Replaces the default price cache with one created with the given arguments.
+
+    Parameters:
+        **kwargs: Arguments of PriceCache, e.g. path, ttl_recent, recent_days and max_bytes.
+
+    Returns:
+        PriceCache: The new default price cache.
+    """
+
+    global _PRICE_CACHE
+
+    _PRICE_CACHE = PriceCache(**kwargs)
+    return _PRICE_CACHE
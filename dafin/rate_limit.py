@@ -0,0 +1,116 @@
+import sqlite3
+
+from pyrate_limiter import SQLiteBucket
+
+
+class SharedSQLiteBucket(SQLiteBucket):
+    """
+    Rate limiter bucket shared by every process that uses the same SQLite file.
+
+    Each limiter transaction runs inside a single `BEGIN IMMEDIATE` transaction, so
+    SQLite's own write lock serializes the processes, and the bucket size is read
+    from the database instead of being kept in memory. Unlike pyrate_limiter's
+    FileLockSQLiteBucket, no extra dependency or lock file is needed.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        """
+        Initializes the bucket.
+
+        Parameters:
+            **kwargs: Arguments of SQLiteBucket, i.e. maxsize, identity and path, and of
+                sqlite3.connect. `timeout` bounds the wait for other processes, and
+                defaults to 60 seconds.
+        """
+
+        kwargs.setdefault("timeout", 60)
+        kwargs["isolation_level"] = None
+        super().__init__(**kwargs)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Returns the database connection, creating it and the bucket table on first use.
+
+        Returns:
+            sqlite3.Connection: The connection, in autocommit mode.
+        """
+
+        if not self._connection:
+            self._connection = sqlite3.connect(
+                str(self._path), **self.connection_kwargs
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(idx INTEGER PRIMARY KEY AUTOINCREMENT, value REAL)"
+            )
+        return self._connection
+
+    def lock_acquire(self) -> None:
+        """
+        Locks the bucket for this thread and the database for this process.
+        """
+
+        self._lock.acquire()
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def lock_release(self) -> None:
+        """
+        Commits the limiter transaction and releases the locks.
+        """
+
+        try:
+            self.connection.execute("COMMIT")
+        finally:
+            self._lock.release()
+
+    def size(self) -> int:
+        """
+        Returns the number of items in the bucket, including those of other processes.
+
+        Returns:
+            int: The number of items.
+        """
+        return self._query_size()
+
+    def _update_size(self, amount: int) -> None:
+        pass
+
+    def put(self, item: float) -> int:
+        """
+        Puts an item in the bucket, within the current transaction.
+
+        Parameters:
+            item (float): The timestamp of the request.
+
+        Returns:
+            int: 1 if the item was added, else 0.
+        """
+
+        if self.size() >= self.maxsize():
+            return 0
+
+        self.connection.execute(f"INSERT INTO {self.table} (value) VALUES (?)", (item,))
+        return 1
+
+    def get(self, number: int = 1) -> int:
+        """
+        Removes the oldest items from the bucket, within the current transaction.
+
+        Parameters:
+            number (int, optional): The number of items to remove. Defaults to 1.
+
+        Returns:
+            int: The number of removed items.
+        """
+
+        keys = self._get_keys(number)
+        self.connection.executemany(
+            f"DELETE FROM {self.table} WHERE idx = ?", [(key,) for key in keys]
+        )
+        return len(keys)
@@ -0,0 +1,462 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from .performance import Performance
+from .returns_data import ReturnsData
+from .utils import date_to_str, fingerprint, normalize_date
+
+# Default maximum total size of the cached results in memory
+DEFAULT_MAX_BYTES = 256 * 1024**2
+
+# Default maximum total size of the persisted results on disk
+DEFAULT_MAX_DISK_BYTES = 1024**3
+
+# Default result cache, created on first use
+_RESULT_CACHE = None
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        path: Optional[Path] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ) -> None:
+        """
+        Initializes a memoizing cache of Performance results, keyed by the content
+        fingerprints of the input returns and the date window. Results are evicted in
+        least recently used order once their total size exceeds `max_bytes`.
+
+        With a `path`, every result is also saved there as a data bundle, see
+        `Performance.save_data`, and results missing from memory are restored from it
+        without being recomputed, e.g. after a restart. The bundles are evicted in
+        least recently used order once their total size exceeds `max_disk_bytes`.
+
+        Parameters:
+            max_bytes (int, optional): Maximum total size of the results in memory.
+                Defaults to DEFAULT_MAX_BYTES.
+            path (Path, optional): Directory of the persisted results. Defaults to
+                None, no persistence.
+            max_disk_bytes (int, optional): Maximum total size of the persisted
+                results. Defaults to DEFAULT_MAX_DISK_BYTES.
+        """
+
+        self.logger = logging.getLogger(__name__)
+
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.path = None if path is None else Path(path)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_evictions = 0
+
+        self._entries: "OrderedDict[str, Tuple[Performance, pd.DataFrame, int]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._lock = threading.RLock()
+
+        # Sizes of the persisted results, in least recently used order of their
+        # modification times, which are updated on every use
+        self._disk_entries: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_size = 0
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            stats = {file: file.stat() for file in self.path.glob("*_data.zip")}
+            for file in sorted(stats, key=lambda file: stats[file].st_mtime):
+                self._disk_entries[file.name[: -len("_data.zip")]] = stats[file].st_size
+                self._disk_size += stats[file].st_size
+
+    @staticmethod
+    def key(
+        returns_data: ReturnsData,
+        returns_data_rf: Optional[ReturnsData] = None,
+        returns_data_benchmark: Optional[ReturnsData] = None,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        freq: Optional[str] = None,
+    ) -> str:
+        """
+        Returns the cache key of a query: the content fingerprints of its returns
+        data, its date window and its frequency. The window is resolved to the first
+        and last dates of the returns within it, so that equivalent windows, e.g.
+        a missing bound and the first or last date, share a key.
+
+        Parameters:
+            returns_data (ReturnsData): The returns data of the assets.
+            returns_data_rf (ReturnsData, optional): The returns data of the risk-free asset.
+            returns_data_benchmark (ReturnsData, optional): The returns data of the benchmark.
+            date_start (str, optional): The start date. Defaults to None.
+            date_end (str, optional): The end date. Defaults to None.
+            freq (str, optional): The frequency of the returns. Defaults to None, daily.
+
+        Returns:
+            str: The hexadecimal key.
+        """
+
+        window = _resolve_window(returns_data, date_start, date_end)
+        return fingerprint(
+            *(
+                None if data is None else data.fingerprint
+                for data in (returns_data, returns_data_rf, returns_data_benchmark)
+            ),
+            *window,
+            freq,
+        )
+
+    def get(self, key: str) -> Optional[Tuple[Performance, pd.DataFrame]]:
+        """
+        Returns a cached result, from memory or else from disk.
+
+        Parameters:
+            key (str): The cache key.
+
+        Returns:
+            Optional[Tuple[Performance, pd.DataFrame]]: The Performance and its summary,
+                or None if the result is not cached.
+        """
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                if key in self._disk_entries:
+                    self._disk_entries.move_to_end(key)
+                self.hits += 1
+                performance, summary, _ = self._entries[key]
+                return performance, summary
+
+        if self.path is not None and (self.path / f"{key}_data.zip").exists():
+            try:
+                performance = Performance.load_data(self.path, prefix=key)
+                os.utime(self.path / f"{key}_data.zip")
+            except FileNotFoundError:
+                # Evicted meanwhile, e.g. by another process sharing the directory
+                performance = None
+
+            if performance is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    if key in self._disk_entries:
+                        self._disk_entries.move_to_end(key)
+                self._insert(key, performance)
+                return performance, performance.summary
+
+        with self._lock:
+            self.misses += 1
+
+        return None
+
+    def put(self, key: str, performance: Performance) -> pd.DataFrame:
+        """
+        Caches a result, and saves it to disk if the cache is persistent.
+
+        Parameters:
+            key (str): The cache key.
+            performance (Performance): The result.
+
+        Returns:
+            pd.DataFrame: The summary of the result.
+        """
+
+        if self.path is not None:
+            performance.save_data(
+                self.path, prefix=key, data_format="bundle", cache=False
+            )
+            self._record_disk(key, (self.path / f"{key}_data.zip").stat().st_size)
+
+        return self._insert(key, performance)
+
+    def _record_disk(self, key: str, nbytes: int) -> None:
+        """
+        Records a persisted result, deleting the least recently used results if needed.
+
+        Parameters:
+            key (str): The cache key.
+            nbytes (int): The size of the persisted result in bytes.
+        """
+
+        with self._lock:
+            self._disk_size += nbytes - self._disk_entries.pop(key, 0)
+            self._disk_entries[key] = nbytes
+
+            # The result just written is kept, even if it exceeds the whole budget
+            while self._disk_size > self.max_disk_bytes and len(self._disk_entries) > 1:
+                evicted, size = self._disk_entries.popitem(last=False)
+                self._disk_size -= size
+                self.disk_evictions += 1
+                (self.path / f"{evicted}_data.zip").unlink(missing_ok=True)
+
+    def _insert(self, key: str, performance: Performance) -> pd.DataFrame:
+        """
+        Caches a result in memory, evicting the least recently used results if needed.
+
+        Parameters:
+            key (str): The cache key.
+            performance (Performance): The result.
+
+        Returns:
+            pd.DataFrame: The summary of the result.
+        """
+
+        summary = performance.summary
+        nbytes = performance.nbytes + int(summary.memory_usage(deep=True).sum())
+
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[2]
+
+            # Results larger than the whole budget are not kept in memory
+            if nbytes <= self.max_bytes:
+                self._entries[key] = (performance, summary, nbytes)
+                self._size += nbytes
+
+            while self._size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+                self.evictions += 1
+
+        return summary
+
+    def performance(
+        self,
+        returns_data: ReturnsData,
+        returns_data_rf: Optional[ReturnsData] = None,
+        returns_data_benchmark: Optional[ReturnsData] = None,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        freq: Optional[str] = None,
+    ) -> Performance:
+        """
+        Returns the Performance of a query, computing it only if it is not cached.
+
+        Parameters:
+            returns_data (ReturnsData): The returns data of the assets.
+            returns_data_rf (ReturnsData, optional): The returns data of the risk-free asset.
+            returns_data_benchmark (ReturnsData, optional): The returns data of the benchmark.
+            date_start (str, optional): The start date. Defaults to None.
+            date_end (str, optional): The end date. Defaults to None.
+            freq (str, optional): The frequency of the returns. Defaults to None, daily.
+
+        Returns:
+            Performance: The Performance.
+        """
+
+        return self._query(
+            returns_data,
+            returns_data_rf,
+            returns_data_benchmark,
+            date_start,
+            date_end,
+            freq,
+        )[0]
+
+    def summary(
+        self,
+        returns_data: ReturnsData,
+        returns_data_rf: Optional[ReturnsData] = None,
+        returns_data_benchmark: Optional[ReturnsData] = None,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        freq: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Returns the performance summary of a query, computing it only if it is not cached.
+
+        Parameters:
+            returns_data (ReturnsData): The returns data of the assets.
+            returns_data_rf (ReturnsData, optional): The returns data of the risk-free asset.
+            returns_data_benchmark (ReturnsData, optional): The returns data of the benchmark.
+            date_start (str, optional): The start date. Defaults to None.
+            date_end (str, optional): The end date. Defaults to None.
+            freq (str, optional): The frequency of the returns. Defaults to None, daily.
+
+        Returns:
+            pd.DataFrame: The performance summary.
+        """
+
+        return self._query(
+            returns_data,
+            returns_data_rf,
+            returns_data_benchmark,
+            date_start,
+            date_end,
+            freq,
+        )[1]
+
+    def _query(
+        self,
+        returns_data: ReturnsData,
+        returns_data_rf: Optional[ReturnsData],
+        returns_data_benchmark: Optional[ReturnsData],
+        date_start: Optional[str],
+        date_end: Optional[str],
+        freq: Optional[str],
+    ) -> Tuple[Performance, pd.DataFrame]:
+        """Looks up a query, and computes and caches it on a miss."""
+
+        # Every input is restricted to the resolved window of the key
+        date_start, date_end = _resolve_window(returns_data, date_start, date_end)
+        key = self.key(
+            returns_data,
+            returns_data_rf,
+            returns_data_benchmark,
+            date_start,
+            date_end,
+            freq,
+        )
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        returns = [
+            None if data is None else _window(data, date_start, date_end)
+            for data in (returns_data, returns_data_rf, returns_data_benchmark)
+        ]
+        performance = Performance(*returns, freq=freq)
+        return performance, self.put(key, performance)
+
+    def clear(self) -> None:
+        """
+        Removes every result from memory and from disk.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._disk_entries.clear()
+            self._disk_size = 0
+
+        if self.path is not None:
+            for file in self.path.glob("*_data.zip"):
+                file.unlink(missing_ok=True)
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        Returns the total size of the results in memory.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return self._size
+
+    @property
+    def disk_size_bytes(self) -> int:
+        """
+        Returns the total size of the persisted results.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return self._disk_size
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: The hits in memory and on disk, misses, evictions from memory and
+                from disk, and the current number of entries and size in memory and on
+                disk.
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "disk_entries": len(self._disk_entries),
+                "disk_size_bytes": self._disk_size,
+            }
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the cache.
+
+        Returns:
+            str: The counters of the cache.
+        """
+        stats = ", ".join(f"{k}={v}" for k, v in self.stats.items())
+        return f"Result cache: {stats}"
+
+
+def _resolve_window(
+    returns_data: ReturnsData, date_start: Optional[str], date_end: Optional[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolves a date window to the first and last dates of the returns within it.
+
+    Parameters:
+        returns_data (ReturnsData): The returns data of the assets.
+        date_start (str, optional): The start date, or None for the first date.
+        date_end (str, optional): The end date, or None for the last date.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: The first and last dates, or the given
+            bounds if the window holds no returns.
+    """
+
+    index = _window(returns_data, date_start, date_end).index
+    if index.empty:
+        return tuple(
+            None if d is None else normalize_date(d)[1] for d in (date_start, date_end)
+        )
+
+    return date_to_str(index[0]), date_to_str(index[-1])
+
+
+def _window(
+    returns_data: ReturnsData, date_start: Optional[str], date_end: Optional[str]
+) -> pd.DataFrame:
+    """Returns the daily returns of a ReturnsData within a date window."""
+
+    index = returns_data.returns.index
+    return returns_data.get_returns(date_start or index[0], date_end or index[-1])
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Returns the default result cache, creating it on first use.
+
+    Returns:
+        ResultCache: The default result cache.
+    """
+
+    global _RESULT_CACHE
+
+    if _RESULT_CACHE is None:
+        _RESULT_CACHE = ResultCache()
+
+    return _RESULT_CACHE
+
+
+def configure_result_cache(**kwargs) -> ResultCache:
+    """
+    Replaces the default result cache with one created with the given arguments.
+
+    Parameters:
+        **kwargs: Arguments of ResultCache, e.g. max_bytes and path.
+
+    Returns:
+        ResultCache: The new default result cache.
+    """
+
+    global _RESULT_CACHE
+
+    _RESULT_CACHE = ResultCache(**kwargs)
+    return _RESULT_CACHE
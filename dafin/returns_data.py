@@ -1,28 +1,540 @@
+import asyncio
+import contextlib
 import datetime
 import hashlib
-from typing import List, Optional, Union
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 
 import pandas as pd
-import pytz
-import yfinance as yf
-from pyrate_limiter import Duration, Limiter, RequestRate
-from requests import Session
-from requests_cache import CacheMixin, SQLiteCache
-from requests_ratelimiter import LimiterMixin, MemoryQueueBucket
 
+from .instrument import StageRecorder
+from .price_cache import (
+    DEFAULT_BUSY_TIMEOUT,
+    PriceCache,
+    default_cache_dir,
+    get_price_cache,
+)
+from .serialize import frame_from_state, frame_to_state
+from .utils import (
+    convert_prices,
+    date_to_str,
+    fingerprint,
+    normalize_date,
+    price_to_return,
+    resample_returns,
+)
 
-class CachedLimiterSession(CacheMixin, LimiterMixin, Session):
-    pass
+# Default rate limit of the session: requests per time window in seconds
+DEFAULT_RATE_LIMIT = (200, 5)
 
+# Shared cached and rate-limited session, created on first use
+_SESSION = None
 
-rate_limit = RequestRate(200, Duration.SECOND * 5)
-SESSION = CachedLimiterSession(
-    limiter=Limiter(rate_limit),
-    bucket_class=MemoryQueueBucket,
-    backend=SQLiteCache("yfinance.cache"),
-)
+# Price fields kept from the downloaded histories
+PRICE_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Default maximum number of concurrent downloads of `ReturnsData.load`, shared by all
+# the loads of an event loop
+DEFAULT_CONCURRENCY = 8
+
+# Downloads in progress, shared by concurrent `ReturnsData.load` calls
+_IN_FLIGHT: Dict[Tuple[str, Optional[str]], asyncio.Future] = {}
+
+# Download slots of each event loop, shared by concurrent `ReturnsData.load` calls
+_DOWNLOAD_SLOTS: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+) = weakref.WeakKeyDictionary()
+
+
+def configure_session(
+    rate_limit: Tuple[int, float] = DEFAULT_RATE_LIMIT,
+    shared: bool = False,
+    path_limiter: Optional[Path] = None,
+    cache: bool = True,
+    session=None,
+):
+    """
+    Replaces the session used by all downloads. The HTTP libraries are imported here,
+    so that importing dafin does not load them or create any cache file.
+
+    Parameters:
+        rate_limit (Tuple[int, float], optional): Maximum number of requests per time
+            window in seconds. Defaults to DEFAULT_RATE_LIMIT.
+        shared (bool, optional): If True, the limit is enforced across all processes
+            using the same `path_limiter`, e.g. the workers of a batch run. Otherwise
+            each process enforces it on its own. Defaults to False.
+        path_limiter (Path, optional): The database of the shared limiter. Defaults to
+            "ratelimit.sqlite" in `dafin.price_cache.default_cache_dir()`.
+        cache (bool, optional): If True, HTTP responses are cached next to the price
+            cache, and expire with its recent bars. Defaults to True.
+        session (requests.Session, optional): A custom session to use as is. Defaults to None.
+
+    Returns:
+        requests.Session: The new session.
+    """
+
+    global _SESSION
+
+    if session is not None:
+        _SESSION = session
+        return _SESSION
+
+    import time
+
+    from pyrate_limiter import Duration, Limiter, RequestRate
+    from requests import Session
+    from requests_cache import CacheMixin, SQLiteCache
+    from requests_ratelimiter import LimiterMixin, MemoryQueueBucket
+
+    class LimiterSession(LimiterMixin, Session):
+        pass
+
+    class CachedLimiterSession(CacheMixin, LimiterMixin, Session):
+        pass
+
+    # Shared buckets need wall-clock time, which is consistent across processes
+    requests, seconds = rate_limit
+    rate = RequestRate(requests, Duration.SECOND * seconds)
+    if shared:
+        from .rate_limit import SharedSQLiteBucket
+
+        path_limiter = path_limiter or default_cache_dir() / "ratelimit.sqlite"
+        path_limiter.parent.mkdir(parents=True, exist_ok=True)
+        limiter = Limiter(
+            rate,
+            bucket_class=SharedSQLiteBucket,
+            bucket_kwargs={"path": path_limiter},
+            time_function=time.time,
+        )
+    else:
+        limiter = Limiter(rate, bucket_class=MemoryQueueBucket)
+
+    if not cache:
+        _SESSION = LimiterSession(limiter=limiter)
+        return _SESSION
+
+    # Keep the HTTP cache next to the price cache, and expire it with the recent bars
+    price_cache = get_price_cache()
+    _SESSION = CachedLimiterSession(
+        limiter=limiter,
+        backend=SQLiteCache(
+            str(price_cache.path.with_name("http.sqlite")),
+            wal=price_cache.wal,
+            busy_timeout=int(DEFAULT_BUSY_TIMEOUT * 1000),
+        ),
+        expire_after=price_cache.ttl_recent,
+    )
+    return _SESSION
+
+
+def get_session():
+    """
+    Returns the session shared by all downloads, creating it with the default
+    configuration of `configure_session` on first use.
+
+    Returns:
+        requests.Session: The cached and rate-limited session.
+    """
+
+    if _SESSION is None:
+        configure_session()
+
+    return _SESSION
+
+
+def download_prices(
+    assets: List[str], start: Optional[str] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Downloads the price histories of the assets in a single request batch.
+
+    Parameters:
+        assets (List[str]): The asset symbols.
+        start (str, optional): The first date to download. Defaults to None, the full history.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The price history of each asset, one column per price field.
+    """
+
+    import yfinance as yf
+
+    raw = yf.download(
+        assets,
+        start=start,
+        period=None if start else "max",
+        auto_adjust=True,
+        session=get_session(),
+        progress=False,
+    )
+
+    if not isinstance(raw.columns, pd.MultiIndex):
+        return {assets[0]: _price_fields(raw)}
+
+    return {
+        asset: _price_fields(raw.xs(asset, axis=1, level=1))
+        for asset in raw.columns.get_level_values(1).unique()
+    }
+
+
+def download_history(ticker: str, start: Optional[str] = None) -> pd.DataFrame:
+    """
+    Downloads the price history of a single asset. Unlike `download_prices`, it can
+    run in several threads at once, since it does not use yfinance's shared state.
+
+    Parameters:
+        ticker (str): The asset symbol.
+        start (str, optional): The first date to download. Defaults to None, the full history.
+
+    Returns:
+        pd.DataFrame: The price history, with the same adjusted prices, columns and
+            tz-naive dates as `download_prices`.
+    """
+
+    import yfinance as yf
+
+    history = yf.Ticker(ticker, session=get_session()).history(
+        period=None if start else "max", start=start, auto_adjust=True
+    )
+    return _price_fields(history)
+
+
+def _price_fields(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalizes a downloaded price history: keeps the PRICE_FIELDS, on the tz-naive
+    exchange dates, and drops the dates without any price.
+
+    Parameters:
+        history (pd.DataFrame): The price history of an asset, as returned by yfinance.
+
+    Returns:
+        pd.DataFrame: The normalized price history.
+    """
+
+    history = history[[c for c in PRICE_FIELDS if c in history.columns]]
+    if history.index.tz is not None:
+        history = history.tz_localize(None)
+    return history.rename_axis(index="Date", columns=None).dropna(how="all")
+
+
+def _lookup_cache(
+    assets: List[str], cache: Optional[PriceCache]
+) -> Tuple[Dict[str, pd.DataFrame], List[str], Dict[str, pd.DataFrame]]:
+    """
+    Splits the assets into cached, missing and expired price histories.
+
+    Parameters:
+        assets (List[str]): The asset symbols.
+        cache (PriceCache, optional): The price cache.
+
+    Returns:
+        Tuple[Dict[str, pd.DataFrame], List[str], Dict[str, pd.DataFrame]]: The fresh
+            histories, the assets to download, and the histories to refresh.
+    """
+
+    if cache is None:
+        return {}, list(assets), {}
+
+    histories, missing, expired = {}, [], {}
+    for asset in assets:
+        prices, fresh = cache.get(asset)
+        if prices is None or prices.empty:
+            missing.append(asset)
+        elif fresh:
+            histories[asset] = prices
+        else:
+            expired[asset] = prices
+
+    return histories, missing, expired
+
+
+def _update_cache(
+    cache: Optional[PriceCache],
+    downloaded: Dict[str, pd.DataFrame],
+    expired: Dict[str, pd.DataFrame],
+    recent: Dict[str, pd.DataFrame],
+) -> Dict[str, pd.DataFrame]:
+    """
+    Stores the downloaded histories and the refreshed recent bars in the cache.
+    Empty downloads, e.g. of tickers that failed to download, are neither cached nor
+    merged, and expired histories without recent bars are kept as they are.
+
+    Parameters:
+        cache (PriceCache, optional): The price cache.
+        downloaded (Dict[str, pd.DataFrame]): The downloaded full histories.
+        expired (Dict[str, pd.DataFrame]): The cached histories that have expired.
+        recent (Dict[str, pd.DataFrame]): The downloaded recent bars of the expired histories.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The downloaded and refreshed histories.
+    """
+
+    downloaded = {k: v for k, v in downloaded.items() if not v.empty}
+    recent = {k: v for k, v in recent.items() if not v.empty}
+
+    histories = dict(downloaded)
+    for asset, prices in expired.items():
+        histories[asset] = (
+            cache.merge(prices, recent[asset]) if asset in recent else prices
+        )
+
+    if cache is not None:
+        cache.put_many(
+            {
+                asset: prices
+                for asset, prices in histories.items()
+                if asset in downloaded or asset in recent
+            }
+        )
+
+    return histories
+
+
+def _assemble_prices(
+    assets: List[str], histories: Dict[str, pd.DataFrame], col_price: str
+) -> pd.DataFrame:
+    """
+    Combines the price column of the histories into a single panel.
+
+    Parameters:
+        assets (List[str]): The asset symbols.
+        histories (Dict[str, pd.DataFrame]): The price history of each asset.
+        col_price (str): The name of the column for price data.
+
+    Raises:
+        ValueError: If the history of an asset is missing or has no prices.
+
+    Returns:
+        pd.DataFrame: The prices of the assets on the dates where all are available.
+    """
+
+    not_found = [
+        asset
+        for asset in assets
+        if asset not in histories
+        or col_price not in histories[asset].columns
+        or histories[asset][col_price].isna().all()
+    ]
+    if not_found:
+        raise ValueError(f"No price data found for: {not_found}")
+
+    return pd.concat(
+        {asset: histories[asset][col_price] for asset in assets}, axis=1
+    ).dropna()
+
+
+def fetch_prices(
+    assets: List[str], col_price: str, cache: Optional[PriceCache] = None
+) -> pd.DataFrame:
+    """
+    Retrieves the prices of the assets, downloading only the histories that are not
+    cached and the recent bars of the cached histories that have expired.
+
+    Parameters:
+        assets (List[str]): The asset symbols.
+        col_price (str): The name of the column for price data.
+        cache (PriceCache, optional): The price cache. Defaults to None, no caching.
+
+    Returns:
+        pd.DataFrame: The prices of the assets on the dates where all are available.
+    """
+
+    histories, missing, expired = _lookup_cache(assets, cache)
+
+    downloaded = download_prices(missing) if missing else {}
+
+    recent = {}
+    if expired:
+        cutoff = min(cache.cutoff(prices) for prices in expired.values())
+        recent = download_prices(list(expired), start=date_to_str(cutoff))
+
+    histories.update(_update_cache(cache, downloaded, expired, recent))
+    return _assemble_prices(assets, histories, col_price)
+
+
+def _download_slots() -> asyncio.Semaphore:
+    """
+    Returns the download slots of the running event loop, which bound the downloads of
+    all its loads to DEFAULT_CONCURRENCY at once.
+
+    Returns:
+        asyncio.Semaphore: The download slots.
+    """
+
+    loop = asyncio.get_running_loop()
+    slots = _DOWNLOAD_SLOTS.get(loop)
+    if slots is None:
+        slots = _DOWNLOAD_SLOTS[loop] = asyncio.Semaphore(DEFAULT_CONCURRENCY)
+    return slots
+
+
+async def _download_shared(
+    ticker: str, start: Optional[str], semaphore: Optional[asyncio.Semaphore]
+) -> pd.DataFrame:
+    """
+    Downloads the price history of an asset in a worker thread. Concurrent calls for
+    the same history share a single download, and cancelling one caller does not
+    cancel the download of the others.
+
+    Parameters:
+        ticker (str): The asset symbol.
+        start (str, optional): The first date to download.
+        semaphore (asyncio.Semaphore, optional): Bounds the number of concurrent
+            downloads of the caller, within the slots shared by all the loads.
+
+    Returns:
+        pd.DataFrame: The price history.
+    """
+
+    async def download() -> pd.DataFrame:
+        async with semaphore or contextlib.nullcontext():
+            async with _download_slots():
+                return await asyncio.to_thread(download_history, ticker, start)
+
+    key = (ticker, start)
+    task = _IN_FLIGHT.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(download())
+        _IN_FLIGHT[key] = task
+        task.add_done_callback(
+            lambda done: _IN_FLIGHT.pop(key) if _IN_FLIGHT.get(key) is done else None
+        )
+
+    return await asyncio.shield(task)
+
+
+async def fetch_prices_async(
+    assets: List[str],
+    col_price: str,
+    cache: Optional[PriceCache] = None,
+    concurrency: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Retrieves the prices of the assets like `fetch_prices`, without blocking the event
+    loop. The histories are downloaded per asset in worker threads, through the
+    rate-limited session.
+
+    Parameters:
+        assets (List[str]): The asset symbols.
+        col_price (str): The name of the column for price data.
+        cache (PriceCache, optional): The price cache. Defaults to None, no caching.
+        concurrency (int, optional): Maximum number of concurrent downloads of this
+            call. Defaults to None, only the DEFAULT_CONCURRENCY downloads shared by
+            all the loads of the event loop.
+
+    Returns:
+        pd.DataFrame: The prices of the assets on the dates where all are available.
+    """
+
+    histories, missing, expired = _lookup_cache(assets, cache)
+
+    starts = {asset: None for asset in missing}
+    starts.update(
+        {asset: date_to_str(cache.cutoff(prices)) for asset, prices in expired.items()}
+    )
+
+    semaphore = None if concurrency is None else asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(
+        *(_download_shared(asset, start, semaphore) for asset, start in starts.items())
+    )
+    results = dict(zip(starts, results))
+
+    downloaded = {asset: results[asset] for asset in missing}
+    recent = {asset: results[asset] for asset in expired}
+
+    histories.update(_update_cache(cache, downloaded, expired, recent))
+    return _assemble_prices(assets, histories, col_price)
+
+
+def fx_ticker(currency: str, target: str) -> str:
+    """
+    Returns the symbol of an exchange rate, e.g. "EURUSD=X" for the value of one euro
+    in US dollars.
+
+    Parameters:
+        currency (str): The currency to convert from.
+        target (str): The currency to convert to.
+
+    Returns:
+        str: The symbol of the exchange rate.
+    """
+    return f"{currency}{target}=X"
+
+
+def fetch_fx(
+    currencies: List[str], target: str, cache: Optional[PriceCache] = None
+) -> pd.DataFrame:
+    """
+    Retrieves the exchange rates of the currencies to the target currency as a single
+    panel, through the price cache like the prices of the assets. Each rate is
+    retrieved once, however many assets are priced in its currency.
+
+    Parameters:
+        currencies (List[str]): The currencies to convert from.
+        target (str): The currency to convert to.
+        cache (PriceCache, optional): The price cache. Defaults to None, no caching.
+
+    Returns:
+        pd.DataFrame: The closing rates, one column per currency.
+    """
+
+    rates = fetch_prices([fx_ticker(c, target) for c in currencies], "Close", cache)
+    rates.columns = currencies
+    return rates
+
+
+async def fetch_fx_async(
+    currencies: List[str],
+    target: str,
+    cache: Optional[PriceCache] = None,
+    concurrency: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Retrieves the exchange rates like `fetch_fx`, without blocking the event loop.
+
+    Parameters:
+        currencies (List[str]): The currencies to convert from.
+        target (str): The currency to convert to.
+        cache (PriceCache, optional): The price cache. Defaults to None, no caching.
+        concurrency (int, optional): Maximum number of concurrent downloads of this
+            call. Defaults to None, only the DEFAULT_CONCURRENCY downloads shared by
+            all the loads of the event loop.
+
+    Returns:
+        pd.DataFrame: The closing rates, one column per currency.
+    """
+
+    rates = await fetch_prices_async(
+        [fx_ticker(c, target) for c in currencies], "Close", cache, concurrency
+    )
+    rates.columns = currencies
+    return rates
+
+
+def _resolve_cache(cache: Union[PriceCache, bool, None]) -> Optional[PriceCache]:
+    """
+    Resolves the cache argument of ReturnsData.
+
+    Parameters:
+        cache (Union[PriceCache, bool], optional): The price cache, None or True for the
+            default cache, or False for no caching.
+
+    Returns:
+        Optional[PriceCache]: The price cache, or None if caching is disabled.
+    """
+
+    if cache is None or cache is True:
+        return get_price_cache()
+
+    return cache or None
 
-from .utils import normalize_date, price_to_return
+
+def __getattr__(name):
+    # Backwards compatibility for the former module-level session
+    if name == "SESSION":
+        return get_session()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class ReturnsData:
@@ -31,14 +543,166 @@ class ReturnsData:
         self,
         assets: Union[List[str], str],
         col_price: str = "Close",
+        cache: Union[PriceCache, bool, None] = None,
+        currencies: Optional[Dict[str, str]] = None,
+        currency: Optional[str] = None,
     ) -> None:
         """
         Initializes the Data class with assets returns.
         It retrieves the prices and calculates the returns upon initialization.
 
+        With a target currency, the prices are converted to it before the returns are
+        calculated, see `dafin.utils.convert_prices`. The exchange rates are retrieved
+        once per currency, through the price cache.
+
+        Parameters:
+            assets (Union[List[str], str]): A list of asset symbols or a single asset symbol as a string.
+            col_price (str, optional): The name of the column for price data. Defaults to "Close".
+            cache (Union[PriceCache, bool], optional): The price cache. Defaults to None,
+                the default cache of `dafin.price_cache.get_price_cache`. False disables caching.
+            currencies (Dict[str, str], optional): The currency of each asset, e.g.
+                {"SAP": "EUR"}. Assets that are not listed are in the target currency.
+                Defaults to None.
+            currency (str, optional): The target currency, e.g. "USD". Defaults to None,
+                no conversion.
+        """
+
+        self._set_assets(assets, col_price, currencies, currency)
+        cache = _resolve_cache(cache)
+
+        # Retrieve the prices data, through the price cache unless disabled
+        with self.instrumentation.stage("download"):
+            prices = fetch_prices(self.assets, self.col_price, cache)
+
+        fx = None
+        if self.fx_currencies:
+            with self.instrumentation.stage("download_fx"):
+                fx = fetch_fx(self.fx_currencies, self.currency, cache)
+
+        self._set_prices(prices, fx)
+
+    @classmethod
+    async def load(
+        cls,
+        assets: Union[List[str], str],
+        col_price: str = "Close",
+        cache: Union[PriceCache, bool, None] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        currencies: Optional[Dict[str, str]] = None,
+        currency: Optional[str] = None,
+    ) -> "ReturnsData":
+        """
+        Creates a ReturnsData without blocking the event loop, e.g.
+        `returns_data = await ReturnsData.load(["AAPL", "SPY"], timeout=30)`.
+
+        The prices are downloaded per asset in worker threads, through the
+        rate-limited session. All the loads of an event loop run at most
+        DEFAULT_CONCURRENCY downloads at once, and each load at most `concurrency`.
+        Concurrent loads of overlapping universes share the downloads of their common
+        assets.
+        Cancelling the load, or reaching the timeout, abandons the pending downloads.
+
         Parameters:
             assets (Union[List[str], str]): A list of asset symbols or a single asset symbol as a string.
             col_price (str, optional): The name of the column for price data. Defaults to "Close".
+            cache (Union[PriceCache, bool], optional): The price cache. Defaults to None,
+                the default cache of `dafin.price_cache.get_price_cache`. False disables caching.
+            concurrency (int, optional): Maximum number of concurrent downloads of this
+                load. Defaults to None, only the DEFAULT_CONCURRENCY downloads shared by
+                all the loads of the event loop.
+            timeout (float, optional): Maximum time in seconds. Defaults to None, no timeout.
+            currencies (Dict[str, str], optional): The currency of each asset. Defaults
+                to None.
+            currency (str, optional): The target currency. Defaults to None, no conversion.
+
+        Raises:
+            asyncio.TimeoutError: If the prices are not retrieved within the timeout.
+
+        Returns:
+            ReturnsData: The returns data.
+        """
+
+        returns_data = cls.__new__(cls)
+        returns_data._set_assets(assets, col_price, currencies, currency)
+        cache = _resolve_cache(cache)
+
+        async def fetch():
+            fx_currencies = returns_data.fx_currencies
+            return await asyncio.gather(
+                fetch_prices_async(returns_data.assets, col_price, cache, concurrency),
+                *(
+                    [fetch_fx_async(fx_currencies, currency, cache, concurrency)]
+                    if fx_currencies
+                    else []
+                ),
+            )
+
+        # The exchange rates are downloaded along with the prices
+        with returns_data.instrumentation.stage("download"):
+            prices, *fx = await asyncio.wait_for(fetch(), timeout)
+
+        returns_data._set_prices(prices, fx[0] if fx else None)
+        return returns_data
+
+    @classmethod
+    def from_prices(
+        cls,
+        prices: pd.DataFrame,
+        col_price: str = "Close",
+        currencies: Optional[Dict[str, str]] = None,
+        currency: Optional[str] = None,
+        fx: Optional[pd.DataFrame] = None,
+    ) -> "ReturnsData":
+        """
+        Creates a ReturnsData from prices that are already available.
+
+        Parameters:
+            prices (pd.DataFrame): The prices, one column per asset.
+            col_price (str, optional): The name of the price column the prices were
+                taken from. Defaults to "Close".
+            currencies (Dict[str, str], optional): The currency of each asset. Defaults
+                to None.
+            currency (str, optional): The target currency. Defaults to None, no conversion.
+            fx (pd.DataFrame, optional): The exchange rates to the target currency, one
+                column per currency. Defaults to None, retrieved through the default
+                price cache.
+
+        Returns:
+            ReturnsData: The returns data.
+        """
+
+        returns_data = cls.__new__(cls)
+        returns_data._set_assets(
+            prices.columns.tolist(), col_price, currencies, currency
+        )
+
+        if fx is None and returns_data.fx_currencies:
+            with returns_data.instrumentation.stage("download_fx"):
+                fx = fetch_fx(returns_data.fx_currencies, currency, get_price_cache())
+
+        returns_data._set_prices(prices, fx)
+        return returns_data
+
+    def _set_assets(
+        self,
+        assets: Union[List[str], str],
+        col_price: str,
+        currencies: Optional[Dict[str, str]] = None,
+        currency: Optional[str] = None,
+    ) -> None:
+        """
+        Sets the assets, the price column and the currencies, and the attributes
+        derived from them.
+
+        Parameters:
+            assets (Union[List[str], str]): A list of asset symbols or a single asset symbol as a string.
+            col_price (str): The name of the column for price data.
+            currencies (Dict[str, str], optional): The currency of each asset. Defaults to None.
+            currency (str, optional): The target currency. Defaults to None, no conversion.
+
+        Raises:
+            ValueError: If currencies are given without a target currency.
         """
 
         # Convert to list if a single asset is passed
@@ -46,50 +710,155 @@ class ReturnsData:
 
         self.col_price = col_price
 
+        if currencies and currency is None:
+            raise ValueError("A target currency is required to convert the prices")
+
+        self.currencies = {
+            asset: currencies[asset]
+            for asset in self.assets
+            if asset in (currencies or {})
+        }
+        self.currency = currency
+
         # Creating a hash using the assets and column price to ensure data integrity
         footprint = ".".join(self.assets + [self.col_price])
+        if self.currency is not None:
+            footprint += "." + ".".join(
+                [self.currency] + [f"{a}:{c}" for a, c in self.currencies.items()]
+            )
         hash_object = hashlib.md5(footprint.encode("utf-8"))
         self._hash = int.from_bytes(hash_object.digest(), "big")
 
-        # Retrieve the prices data
-        price_df = yf.download(self.assets, session=SESSION)[self.col_price].dropna()
-        self.prices = (
-            price_df.to_frame() if isinstance(price_df, pd.Series) else price_df
-        )
+        # Timings and memory of the stages, recorded while instrumentation is enabled
+        self.instrumentation = StageRecorder("ReturnsData")
+
+    @property
+    def fx_currencies(self) -> List[str]:
+        """
+        Returns the currencies of the assets that differ from the target currency.
+
+        Returns:
+            List[str]: The currencies, sorted.
+        """
+
+        if self.currency is None:
+            return []
+
+        return sorted(set(self.currencies.values()) - {self.currency})
+
+    def _set_prices(
+        self, prices: pd.DataFrame, fx: Optional[pd.DataFrame] = None
+    ) -> None:
+        """
+        Sets the prices, converted to the target currency if any, and calculates the
+        returns from them.
+
+        Parameters:
+            prices (pd.DataFrame): The prices, one column per asset.
+            fx (pd.DataFrame, optional): The exchange rates to the target currency, one
+                column per currency. Defaults to None.
+        """
+
+        # Exchange rates used to convert the prices
+        self.fx = fx
+
+        if self.fx_currencies:
+            with self.instrumentation.stage("convert_fx"):
+                prices = convert_prices(prices, self.currencies, fx, self.currency)
+
+        self.prices = prices
+
+        # Content hash of the prices, computed on first use
+        self._fingerprint = None
 
         # Calculate the returns from the prices data
-        self.returns = price_to_return(self.prices)
+        with self.instrumentation.stage("price_to_return"):
+            self._returns = price_to_return(self.prices)
+
+        # Returns resampled to lower frequencies, computed on first use
+        self._resampled = {}
+
+    @property
+    def returns(self) -> pd.DataFrame:
+        """
+        Returns the daily returns, deriving them from the prices if needed, e.g. after
+        unpickling.
+
+        Returns:
+            pd.DataFrame: The daily returns data.
+        """
+
+        if self._returns is None:
+            with self.instrumentation.stage("price_to_return"):
+                self._returns = price_to_return(self.prices)
+
+        return self._returns
+
+    def returns_at(self, freq: str = "D") -> pd.DataFrame:
+        """
+        Returns the returns compounded to a frequency, e.g. "M" for monthly returns.
+        The resampled returns are cached per frequency.
+
+        Parameters:
+            freq (str, optional): One of `dafin.utils.PERIODS_PER_YEAR`. Defaults to "D", daily.
+
+        Raises:
+            ValueError: If the frequency is not supported.
+
+        Returns:
+            pd.DataFrame: The returns of each period.
+        """
+
+        if freq == "D":
+            return self.returns
+
+        if freq not in self._resampled:
+            with self.instrumentation.stage(f"resample.{freq}"):
+                self._resampled[freq] = resample_returns(self.returns, freq)
+
+        return self._resampled[freq]
 
     def get_returns(
         self,
         date_start: Optional[Union[str, datetime.datetime]] = None,
         date_end: Optional[Union[str, datetime.datetime]] = None,
+        freq: str = "D",
     ) -> pd.DataFrame:
         """
-        Retrieves the daily returns data for the specified date range. If no date range
+        Retrieves the returns data for the specified date range. If no date range
         is provided, it returns all available data.
 
         Parameters:
             date_start (Union[str, datetime.datetime], optional): The start date. Defaults to None.
             date_end (Union[str, datetime.datetime], optional): The end date. Defaults to None.
+            freq (str, optional): The frequency of the returns, one of
+                `dafin.utils.PERIODS_PER_YEAR`. Defaults to "D", daily. Within a date
+                range, the first and last periods only compound the returns in the range.
 
         Returns:
-            pd.DataFrame: The daily returns data within the specified date range or all available data if no dates are provided.
+            pd.DataFrame: The returns data within the specified date range or all available data if no dates are provided.
         """
 
         # If no date is passed, return all available data
         if not (date_start or date_end):
-            return self.returns
+            return self.returns_at(freq)
 
         # If dates are provided, normalize them to ensure consistent formatting
         date_start, _ = normalize_date(date_start)
         date_end, _ = normalize_date(date_end)
 
         # Return the daily returns data for the specified date range
-        timezone = self.returns.index.tz
-        date_start = date_start.replace(tzinfo=timezone)
-        date_end = date_end.replace(tzinfo=timezone)
-        return self.returns.loc[date_start:date_end]
+        with self.instrumentation.stage("get_returns"):
+            timezone = self.returns.index.tz
+            date_start = date_start.replace(tzinfo=timezone)
+            date_end = date_end.replace(tzinfo=timezone)
+            returns = self.returns.loc[date_start:date_end]
+
+        if freq == "D":
+            return returns
+
+        with self.instrumentation.stage(f"resample.{freq}"):
+            return resample_returns(returns, freq)
 
     def __str__(self) -> str:
         """
@@ -106,6 +875,7 @@ class ReturnsData:
             "Returns Data:\n",
             f"- List of Assets: {self.assets}\n",
             f"- Price Column: {self.col_price}\n",
+            f"- Currency: {self.currency}\n",
             f"- Data Signature: {self._hash}\n",
             f"- Prices:\n{self.prices}\n\n\n",
             f"- Returns:\n{self.returns}\n\n\n",
@@ -114,6 +884,82 @@ class ReturnsData:
         # Joining all string segments into the final output string
         return "".join(str_segments)
 
+    @property
+    def timings(self) -> dict:
+        """
+        Returns the recorded duration of each stage, see `dafin.instrument`.
+
+        Returns:
+            dict: The duration in seconds, keyed by stage.
+        """
+        return self.instrumentation.timings
+
+    @property
+    def memory(self) -> dict:
+        """
+        Returns the recorded peak memory of each stage, see `dafin.instrument`.
+
+        Returns:
+            dict: The peak memory in bytes, keyed by stage.
+        """
+        return self.instrumentation.memory
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the minimal state for pickling. The returns are left out, since they
+        are derived from the prices on first use after unpickling, and the prices are
+        kept as a plain array that pickle protocol 5 can transfer out-of-band.
+
+        Returns:
+            dict: The state of the class instance.
+        """
+
+        return {
+            "assets": self.assets,
+            "col_price": self.col_price,
+            "_hash": self._hash,
+            "prices": frame_to_state(self.prices),
+            "currencies": self.currencies,
+            "currency": self.currency,
+            "fx": None if self.fx is None else frame_to_state(self.fx),
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores the class instance from the pickled state.
+
+        Parameters:
+            state (dict): The state returned by `__getstate__`.
+        """
+
+        self.assets = state["assets"]
+        self.col_price = state["col_price"]
+        self._hash = state["_hash"]
+        self.prices = frame_from_state(state["prices"])
+        self.currencies = state.get("currencies", {})
+        self.currency = state.get("currency")
+        self.fx = None if state.get("fx") is None else frame_from_state(state["fx"])
+        self._returns = None
+        self._resampled = {}
+        self._fingerprint = None
+        self.instrumentation = StageRecorder("ReturnsData")
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Returns a content hash of the prices, computed once. Unlike `__hash__`, which
+        only depends on the asset symbols and the price column, it changes whenever
+        the data does, e.g. after new bars are downloaded.
+
+        Returns:
+            str: The hexadecimal content hash.
+        """
+
+        if self._fingerprint is None:
+            self._fingerprint = fingerprint(self.prices, self.col_price)
+
+        return self._fingerprint
+
     def __hash__(self) -> int:
         """
         Returns the hash of the class instance based on the `_hash` attribute.
@@ -0,0 +1,382 @@
+"""
+Cross-sectional screening, e.g. the top 50 assets by Sharpe ratio in each of the
+last 40 quarters. Only the requested metric is calculated, as a windows x assets
+array from prefix sums of the returns, so each window costs O(N) after a single
+O(N * T) pass, and the top assets are selected with `np.argpartition` instead of
+sorting every window.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .returns_data import ReturnsData
+from .utils import RESAMPLE_RULES, get_periods_per_year, infer_periods_per_year
+
+# Metrics available for screening, named as the columns of `Performance.summary`
+SCREEN_METRICS = [
+    "Total Returns",
+    "Expected Returns",
+    "Standard Deviation",
+    "Sharpe Ratio",
+    "Beta",
+    "Alpha",
+    "Treynor Ratio",
+    "Correlation",
+]
+
+Window = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+def calendar_windows(index: pd.DatetimeIndex, freq: str) -> List[Window]:
+    """
+    Splits dates into calendar periods, e.g. quarters.
+
+    Parameters:
+        index (pd.DatetimeIndex): The dates.
+        freq (str): One of `dafin.utils.PERIODS_PER_YEAR` except "D", e.g. "Q".
+
+    Raises:
+        ValueError: If the frequency is not supported.
+
+    Returns:
+        List[Tuple[pd.Timestamp, pd.Timestamp]]: The first and last date of each period.
+    """
+
+    get_periods_per_year(freq)
+    if freq not in RESAMPLE_RULES:
+        raise ValueError(f"Calendar windows need a lower frequency than daily: {freq}")
+
+    dates = pd.Series(index, index=index)
+    bounds = dates.resample(RESAMPLE_RULES[freq]).agg(["first", "last"]).dropna()
+    return list(zip(bounds["first"], bounds["last"]))
+
+
+def rolling_windows(
+    index: pd.DatetimeIndex, length: int, step: int = 1
+) -> List[Window]:
+    """
+    Splits dates into trailing windows of a fixed number of dates, the last one
+    ending on the last date.
+
+    Parameters:
+        index (pd.DatetimeIndex): The dates.
+        length (int): Number of dates per window.
+        step (int, optional): Number of dates between the ends of consecutive
+            windows. Defaults to 1.
+
+    Returns:
+        List[Tuple[pd.Timestamp, pd.Timestamp]]: The first and last date of each window.
+    """
+
+    ends = np.arange(len(index) - 1, length - 2, -step)[::-1]
+    return [(index[end - length + 1], index[end]) for end in ends]
+
+
+class _PrefixSums:
+    def __init__(self, x: np.ndarray) -> None:
+        """
+        Computes prefix sums of the returns on first use, so that the sum over any
+        window of dates is a difference of two rows.
+
+        Parameters:
+            x (np.ndarray): The returns, dates x columns.
+        """
+
+        self.x = x
+        self._sums: Dict[str, np.ndarray] = {}
+
+    def window(
+        self, name: str, starts: np.ndarray, ends: np.ndarray, y: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Returns a windowed sum: "x", "x2" (squares), "log" (log growth) or "xy" (cross
+        products with y).
+
+        Parameters:
+            name (str): The sum.
+            starts (np.ndarray): First position of each window.
+            ends (np.ndarray): Position after the last date of each window.
+            y (np.ndarray, optional): The second factor of "xy", one value per date.
+
+        Returns:
+            np.ndarray: The sums, windows x columns.
+        """
+
+        if name not in self._sums:
+            terms = {
+                "x": lambda: self.x,
+                "x2": lambda: self.x * self.x,
+                "log": lambda: np.log1p(self.x),
+                "xy": lambda: self.x * y[:, None],
+            }[name]()
+            sums = np.zeros((terms.shape[0] + 1, terms.shape[1]))
+            np.cumsum(terms, axis=0, out=sums[1:])
+            self._sums[name] = sums
+
+        sums = self._sums[name]
+        return sums[ends] - sums[starts]
+
+
+def screen_metric(
+    returns: Union[ReturnsData, pd.DataFrame],
+    metric: str,
+    windows: Union[str, Sequence[Window]],
+    returns_rf: Optional[pd.DataFrame] = None,
+    returns_benchmark: Optional[pd.DataFrame] = None,
+    periods_per_year: Optional[float] = None,
+) -> Tuple[np.ndarray, List[Window], List[str]]:
+    """
+    Calculates a metric of every asset in every window.
+
+    Parameters:
+        returns (Union[ReturnsData, pd.DataFrame]): Daily returns of the assets,
+            without missing values.
+        metric (str): One of SCREEN_METRICS.
+        windows (Union[str, Sequence[Tuple]]): A calendar frequency for
+            `calendar_windows`, e.g. "Q", or the first and last date of each window.
+        returns_rf (pd.DataFrame, optional): Daily returns of the risk-free asset.
+            Defaults to None, zero returns.
+        returns_benchmark (pd.DataFrame, optional): Daily returns of the benchmark.
+            Defaults to None, the risk-free returns.
+        periods_per_year (float, optional): Number of return periods per year. Defaults
+            to None, inferred from the dates of the returns.
+
+    Raises:
+        ValueError: If the metric is not supported or the returns have missing values.
+
+    Returns:
+        Tuple[np.ndarray, List[Tuple], List[str]]: The metric as a windows x assets
+            array, the windows and the assets.
+    """
+
+    if metric not in SCREEN_METRICS:
+        raise ValueError(f"Unsupported metric: {metric}. Use one of {SCREEN_METRICS}.")
+
+    returns, rf, benchmark = _align_inputs(returns, returns_rf, returns_benchmark)
+    index = returns.index
+
+    if isinstance(windows, str):
+        windows = calendar_windows(index, windows)
+    window_starts = _as_dates([start for start, _ in windows], index)
+    window_ends = _as_dates([end for _, end in windows], index)
+    windows = list(zip(window_starts, window_ends))
+    starts = index.searchsorted(window_starts, side="left")
+    ends = index.searchsorted(window_ends, side="right")
+
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(index)
+
+    values = _window_metric(
+        returns.to_numpy(dtype=float),
+        rf,
+        benchmark,
+        metric,
+        starts,
+        ends,
+        periods_per_year,
+    )
+    return values, windows, returns.columns.tolist()
+
+
+def _align_inputs(
+    returns: Union[ReturnsData, pd.DataFrame],
+    returns_rf: Optional[pd.DataFrame],
+    returns_benchmark: Optional[pd.DataFrame],
+) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    Restricts the returns of the assets, the risk-free asset and the benchmark to
+    their common dates.
+
+    Raises:
+        ValueError: If the returns of the assets have missing values.
+
+    Returns:
+        Tuple[pd.DataFrame, np.ndarray, np.ndarray]: The returns of the assets, and
+            the risk-free and benchmark returns on the same dates.
+    """
+
+    if isinstance(returns, ReturnsData):
+        returns = returns.returns
+
+    # Dates shared by the assets, the risk-free asset and the benchmark
+    index = returns.index
+    for other in (returns_rf, returns_benchmark):
+        if other is not None:
+            index = index.intersection(other.index)
+    returns = returns.loc[index]
+    if returns.isna().to_numpy().any():
+        raise ValueError("Screening requires returns without missing values")
+
+    rf = np.zeros(len(index)) if returns_rf is None else returns_rf.loc[index]
+    rf = np.asarray(rf, dtype=float).reshape(len(index), -1)[:, 0]
+    benchmark = (
+        rf
+        if returns_benchmark is None
+        else returns_benchmark.loc[index].to_numpy(dtype=float)[:, 0]
+    )
+
+    return returns, rf, benchmark
+
+
+def _as_dates(dates: list, index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Converts dates, e.g. strings, to the time zone of the index."""
+
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    if index.tz is not None and dates.tz is None:
+        return dates.tz_localize(index.tz)
+
+    return dates
+
+
+def _window_metric(
+    x: np.ndarray,
+    rf: np.ndarray,
+    benchmark: np.ndarray,
+    metric: str,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    periods_per_year: float,
+) -> np.ndarray:
+    """
+    Calculates a metric in every window from prefix sums, with the definitions of
+    `dafin.utils`.
+
+    Parameters:
+        x (np.ndarray): Daily returns of the assets, dates x assets.
+        rf (np.ndarray): Daily returns of the risk-free asset.
+        benchmark (np.ndarray): Daily returns of the benchmark.
+        metric (str): One of SCREEN_METRICS.
+        starts (np.ndarray): First position of each window.
+        ends (np.ndarray): Position after the last date of each window.
+        periods_per_year (float): Number of return periods per year.
+
+    Returns:
+        np.ndarray: The metric, windows x assets.
+    """
+
+    assets = _PrefixSums(x)
+    others = _PrefixSums(np.column_stack([rf, benchmark]))
+    n = (ends - starts)[:, None].astype(float)
+
+    def annualized(sums: _PrefixSums) -> np.ndarray:
+        return np.expm1(sums.window("log", starts, ends) * periods_per_year / n)
+
+    def variance(sums: _PrefixSums) -> np.ndarray:
+        s1 = sums.window("x", starts, ends)
+        return (sums.window("x2", starts, ends) - s1 * s1 / n) / (n - 1)
+
+    def beta() -> np.ndarray:
+        s_xy = assets.window("xy", starts, ends, benchmark)
+        s_x = assets.window("x", starts, ends)
+        s_b = others.window("x", starts, ends)[:, 1:]
+        cov = (s_xy - s_x * s_b / n) / (n - 1)
+        return cov / variance(others)[:, 1:]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if metric == "Total Returns":
+            return np.expm1(assets.window("log", starts, ends))
+        if metric == "Expected Returns":
+            return annualized(assets)
+        if metric == "Standard Deviation":
+            return np.sqrt(variance(assets) * periods_per_year)
+        if metric == "Correlation":
+            return beta() * np.sqrt(variance(others)[:, 1:] / variance(assets))
+
+        rf_annualized, benchmark_annualized = np.hsplit(annualized(others), 2)
+        excess = annualized(assets) - rf_annualized
+
+        if metric == "Sharpe Ratio":
+            return excess / np.sqrt(variance(assets) * periods_per_year)
+        if metric == "Beta":
+            return beta()
+        if metric == "Alpha":
+            return excess - beta() * (benchmark_annualized - rf_annualized)
+        return excess / beta()
+
+
+def top_k(values: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+    """
+    Selects the positions of the k best values of each row, in rank order, with a
+    partial partition in O(N) per row followed by a sort of the k selected values.
+    Missing values rank last.
+
+    Parameters:
+        values (np.ndarray): The values, rows x columns.
+        k (int): Number of values to select per row.
+        largest (bool, optional): If True, selects the largest values, otherwise the
+            smallest. Defaults to True.
+
+    Returns:
+        np.ndarray: The column positions, rows x min(k, columns).
+    """
+
+    keys = -values if largest else values.copy()
+    keys[np.isnan(keys)] = np.inf
+
+    k = min(k, keys.shape[1])
+    if k < keys.shape[1]:
+        selected = np.argpartition(keys, k - 1, axis=1)[:, :k]
+    else:
+        selected = np.broadcast_to(np.arange(k), keys.shape).copy()
+
+    order = np.argsort(
+        np.take_along_axis(keys, selected, axis=1), axis=1, kind="stable"
+    )
+    return np.take_along_axis(selected, order, axis=1)
+
+
+def screen(
+    returns: Union[ReturnsData, pd.DataFrame],
+    metric: str,
+    windows: Union[str, Sequence[Window]],
+    k: int = 50,
+    returns_rf: Optional[pd.DataFrame] = None,
+    returns_benchmark: Optional[pd.DataFrame] = None,
+    largest: bool = True,
+    periods_per_year: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Ranks the top assets by a metric in each window, e.g.
+    `screen(returns_data, "Sharpe Ratio", "Q", k=50)` for the top 50 assets by Sharpe
+    ratio in each quarter.
+
+    Parameters:
+        returns (Union[ReturnsData, pd.DataFrame]): Daily returns of the assets,
+            without missing values.
+        metric (str): One of SCREEN_METRICS.
+        windows (Union[str, Sequence[Tuple]]): A calendar frequency for
+            `calendar_windows`, e.g. "Q", or the first and last date of each window,
+            e.g. from `rolling_windows`.
+        k (int, optional): Number of assets per window. Defaults to 50.
+        returns_rf (pd.DataFrame, optional): Daily returns of the risk-free asset.
+            Defaults to None, zero returns.
+        returns_benchmark (pd.DataFrame, optional): Daily returns of the benchmark.
+            Defaults to None, the risk-free returns.
+        largest (bool, optional): If True, ranks the largest values first, otherwise
+            the smallest. Defaults to True.
+        periods_per_year (float, optional): Number of return periods per year. Defaults
+            to None, inferred from the dates of the returns.
+
+    Returns:
+        pd.DataFrame: One row per window and rank, with the columns "window_start",
+            "window_end", "rank", "asset" and the metric.
+    """
+
+    values, windows, assets = screen_metric(
+        returns, metric, windows, returns_rf, returns_benchmark, periods_per_year
+    )
+    selected = top_k(values, k, largest)
+
+    n_windows, n_selected = selected.shape
+    window_starts, window_ends = zip(*windows) if windows else ((), ())
+    return pd.DataFrame(
+        {
+            "window_start": pd.DatetimeIndex(window_starts).repeat(n_selected),
+            "window_end": pd.DatetimeIndex(window_ends).repeat(n_selected),
+            "rank": np.tile(np.arange(1, n_selected + 1), n_windows),
+            "asset": np.asarray(assets)[selected].ravel(),
+            metric: np.take_along_axis(values, selected, axis=1).ravel(),
+        }
+    )
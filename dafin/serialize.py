@@ -0,0 +1,94 @@
+import io
+import pickle
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def frame_to_state(df: pd.DataFrame) -> Tuple[np.ndarray, pd.Index, pd.Index]:
+    """
+    Splits a DataFrame into its values and labels, so that it pickles as a single
+    array that pickle protocol 5 can transfer out-of-band.
+
+    Parameters:
+        df (pd.DataFrame): A DataFrame with a single dtype.
+
+    Returns:
+        Tuple[np.ndarray, pd.Index, pd.Index]: The values, index and columns.
+    """
+    return df.to_numpy(), df.index, df.columns
+
+
+def frame_from_state(state: Tuple[np.ndarray, pd.Index, pd.Index]) -> pd.DataFrame:
+    """
+    Rebuilds a DataFrame split by `frame_to_state`, without copying its values.
+
+    Parameters:
+        state (Tuple[np.ndarray, pd.Index, pd.Index]): The values, index and columns.
+
+    Returns:
+        pd.DataFrame: The DataFrame.
+    """
+    values, index, columns = state
+    return pd.DataFrame(data=values, index=index, columns=columns, copy=False)
+
+
+def frame_to_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Serializes a DataFrame, with its index, to Parquet bytes. Unlike a pickle, the
+    bytes can be read back without executing any code, e.g. from a shared cache.
+
+    Parameters:
+        df (pd.DataFrame): A DataFrame with string column names.
+
+    Returns:
+        bytes: The Parquet file.
+    """
+    buffer = io.BytesIO()
+    df.to_parquet(buffer)
+    return buffer.getvalue()
+
+
+def frame_from_bytes(data: bytes) -> pd.DataFrame:
+    """
+    Deserializes a DataFrame serialized by `frame_to_bytes`.
+
+    Parameters:
+        data (bytes): The Parquet file.
+
+    Returns:
+        pd.DataFrame: The DataFrame.
+    """
+    return pd.read_parquet(io.BytesIO(data))
+
+
+def dumps(obj) -> Tuple[bytes, List[pickle.PickleBuffer]]:
+    """
+    Pickles an object with protocol 5, keeping large arrays out-of-band. The buffers
+    reference the object's memory, so they can be sent without copying, e.g. through
+    shared memory.
+
+    Parameters:
+        obj: The object to pickle, e.g. a ReturnsData or Performance.
+
+    Returns:
+        Tuple[bytes, List[pickle.PickleBuffer]]: The pickle stream and its buffers.
+    """
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    return data, buffers
+
+
+def loads(data: bytes, buffers: List[pickle.PickleBuffer]):
+    """
+    Unpickles an object pickled by `dumps`.
+
+    Parameters:
+        data (bytes): The pickle stream.
+        buffers (List[pickle.PickleBuffer]): The out-of-band buffers.
+
+    Returns:
+        The unpickled object.
+    """
+    return pickle.loads(data, buffers=buffers)
@@ -0,0 +1,497 @@
+"""
+Point-in-time store of trailing-window metrics, e.g. the 1-year Sharpe ratio and
+beta of every asset as of any date, without building a `Performance` per question.
+
+The store is a directory of columnar files: one raw float64 file per metric, with
+one row of assets per date, a file of the dates as int64 nanoseconds, and a JSON
+file of metadata. The files are only ever appended to, and are memory-mapped for
+reading, so an as-of lookup is a binary search of the dates and a read of a single
+row. `SnapshotStore.update` appends the dates that are newer than the last stored
+one, e.g. nightly, computing only their windows:
+
+    store = SnapshotStore.create("snapshots", returns_data, window=252)
+    store.as_of("2021-06-30", "Sharpe Ratio")
+    store.update(ReturnsData(assets))  # the next day
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .returns_data import ReturnsData
+from .screening import SCREEN_METRICS, _align_inputs, _window_metric
+from .utils import fingerprint, infer_periods_per_year
+
+# Version of the snapshot store layout
+SNAPSHOT_VERSION = 1
+
+# Default number of returns of the trailing window, one year of trading days
+DEFAULT_SNAPSHOT_WINDOW = 252
+
+# File names of the metadata and the dates of a store
+_METADATA_FILE = "metadata.json"
+_DATES_FILE = "dates.bin"
+
+
+class SnapshotStore:
+    def __init__(self, path: Path) -> None:
+        """
+        Opens an existing snapshot store, see `SnapshotStore.create`.
+
+        Parameters:
+            path (Path): Directory of the store.
+
+        Raises:
+            FileNotFoundError: If the directory is not a snapshot store.
+            ValueError: If the store version is not supported.
+        """
+
+        self.path = Path(path)
+        self._read_metadata()
+
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        returns: Union[ReturnsData, pd.DataFrame],
+        window: int = DEFAULT_SNAPSHOT_WINDOW,
+        metrics: Optional[Sequence[str]] = None,
+        returns_rf: Optional[pd.DataFrame] = None,
+        returns_benchmark: Optional[pd.DataFrame] = None,
+        periods_per_year: Optional[float] = None,
+    ) -> "SnapshotStore":
+        """
+        Creates a snapshot store, with the metrics of every date that closes a full
+        trailing window of returns.
+
+        Parameters:
+            path (Path): Directory of the store, created if needed.
+            returns (Union[ReturnsData, pd.DataFrame]): Daily returns of the assets,
+                without missing values.
+            window (int, optional): Number of returns of the trailing window. Defaults
+                to DEFAULT_SNAPSHOT_WINDOW.
+            metrics (Sequence[str], optional): The metrics, from
+                `dafin.screening.SCREEN_METRICS`. Defaults to None, all of them.
+            returns_rf (pd.DataFrame, optional): Daily returns of the risk-free asset.
+                Defaults to None, zero returns. Its name is stored, and every update
+                must use the same risk-free asset.
+            returns_benchmark (pd.DataFrame, optional): Daily returns of the benchmark.
+                Defaults to None, the risk-free returns. Its name is stored, and every
+                update must use the same benchmark.
+            periods_per_year (float, optional): Number of return periods per year.
+                Defaults to None, inferred from the dates of the returns.
+
+        Raises:
+            FileExistsError: If the directory already holds a store.
+            ValueError: If a metric is not supported or the window is too short.
+
+        Returns:
+            SnapshotStore: The store.
+        """
+
+        metrics = list(SCREEN_METRICS if metrics is None else metrics)
+        unsupported = [metric for metric in metrics if metric not in SCREEN_METRICS]
+        if unsupported:
+            raise ValueError(
+                f"Unsupported metrics: {unsupported}. Use any of {SCREEN_METRICS}."
+            )
+        if window < 2:
+            raise ValueError(f"Window must have at least 2 returns: {window}")
+
+        path = Path(path)
+        if (path / _METADATA_FILE).exists():
+            raise FileExistsError(f"Snapshot store already exists: {path}")
+        path.mkdir(parents=True, exist_ok=True)
+
+        returns, _, _ = _align_inputs(returns, returns_rf, returns_benchmark)
+        if periods_per_year is None:
+            periods_per_year = infer_periods_per_year(returns.index)
+
+        # Empty files, committed by the metadata
+        files = {metric: f"metric_{i}.bin" for i, metric in enumerate(metrics)}
+        for name in [_DATES_FILE, *files.values()]:
+            (path / name).write_bytes(b"")
+
+        _write_metadata(
+            path,
+            {
+                "version": SNAPSHOT_VERSION,
+                "assets": returns.columns.astype(str).tolist(),
+                "metrics": files,
+                "window": window,
+                "periods_per_year": periods_per_year,
+                "tz": None if returns.index.tz is None else str(returns.index.tz),
+                "rf": _name(returns_rf),
+                "benchmark": _name(returns_benchmark),
+                "inputs": None,
+                "n_dates": 0,
+            },
+        )
+
+        store = cls(path)
+        store.update(returns, returns_rf, returns_benchmark)
+        return store
+
+    def _read_metadata(self) -> None:
+        """Reads the metadata, and drops the memory maps of the previous state."""
+
+        metadata = json.loads((self.path / _METADATA_FILE).read_text())
+        if metadata["version"] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {metadata['version']}")
+
+        self.assets: List[str] = metadata["assets"]
+        self.metrics: List[str] = list(metadata["metrics"])
+        self.window: int = metadata["window"]
+        self.periods_per_year: float = metadata["periods_per_year"]
+        self.tz: Optional[str] = metadata["tz"]
+        self.asset_rf: Optional[str] = metadata["rf"]
+        self.asset_benchmark: Optional[str] = metadata["benchmark"]
+        self.n_dates: int = metadata["n_dates"]
+
+        self._inputs: Optional[str] = metadata["inputs"]
+
+        self._files: Dict[str, str] = metadata["metrics"]
+        self._positions = {asset: i for i, asset in enumerate(self.assets)}
+        self._index = pd.Index(self.assets)
+        self._dates: Optional[np.ndarray] = None
+        self._values: Dict[str, np.ndarray] = {}
+
+    def _map(self, name: str, shape: tuple) -> np.ndarray:
+        """Memory-maps the committed rows of a file for reading."""
+
+        if self.n_dates == 0:
+            return np.empty(shape)
+
+        # Plain arrays over the maps, which are faster to index
+        return np.asarray(
+            np.memmap(self.path / name, dtype="<f8", mode="r", shape=shape)
+        )
+
+    @property
+    def _date_values(self) -> np.ndarray:
+        """Returns the dates as int64 nanoseconds, memory-mapped on first use."""
+
+        if self._dates is None:
+            if self.n_dates == 0:
+                self._dates = np.empty(0, dtype="<i8")
+            else:
+                self._dates = np.asarray(
+                    np.memmap(
+                        self.path / _DATES_FILE,
+                        dtype="<i8",
+                        mode="r",
+                        shape=(self.n_dates,),
+                    )
+                )
+
+        return self._dates
+
+    def values(self, metric: str) -> np.ndarray:
+        """
+        Returns a metric of every date and asset, memory-mapped on first use.
+
+        Parameters:
+            metric (str): One of the metrics of the store.
+
+        Raises:
+            KeyError: If the store does not hold the metric.
+
+        Returns:
+            np.ndarray: The metric, dates x assets.
+        """
+
+        if metric not in self._values:
+            self._values[metric] = self._map(
+                self._files[metric], (self.n_dates, len(self.assets))
+            )
+
+        return self._values[metric]
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        """
+        Returns the dates of the snapshots.
+
+        Returns:
+            pd.DatetimeIndex: The last date of the trailing window of each snapshot.
+        """
+
+        # Dates with a time zone are stored in UTC
+        dates = pd.DatetimeIndex(np.asarray(self._date_values).astype("datetime64[ns]"))
+        if self.tz is not None:
+            dates = dates.tz_localize("UTC").tz_convert(self.tz)
+
+        return dates
+
+    def _timestamp(self, date: Union[str, pd.Timestamp]) -> int:
+        """Converts a date to int64 nanoseconds, in the time zone of the store."""
+
+        date = pd.Timestamp(date)
+        if self.tz is not None and date.tz is None:
+            date = date.tz_localize(self.tz)
+
+        return date.as_unit("ns").value
+
+    def locate(self, date: Union[str, pd.Timestamp]) -> int:
+        """
+        Returns the position of the snapshot as of a date: the last one on or
+        before it.
+
+        Parameters:
+            date (Union[str, pd.Timestamp]): The date.
+
+        Raises:
+            KeyError: If the date precedes the first snapshot.
+
+        Returns:
+            int: The position of the snapshot.
+        """
+
+        position = int(
+            np.searchsorted(self._date_values, self._timestamp(date), side="right") - 1
+        )
+        if position < 0:
+            raise KeyError(f"No snapshot as of {date}")
+
+        return position
+
+    def as_of(
+        self,
+        date: Union[str, pd.Timestamp],
+        metric: Optional[str] = None,
+        assets: Optional[List[str]] = None,
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Returns the metrics of the snapshot as of a date, the last one on or before it.
+
+        Parameters:
+            date (Union[str, pd.Timestamp]): The date.
+            metric (str, optional): A metric of the store. Defaults to None, all of them.
+            assets (List[str], optional): The assets. Defaults to None, all of them.
+
+        Raises:
+            KeyError: If the date precedes the first snapshot, or a metric or an asset
+                is not in the store.
+
+        Returns:
+            Union[pd.Series, pd.DataFrame]: The metric of each asset, or every metric
+                of each asset with one column per metric.
+        """
+
+        position = self.locate(date)
+        columns = (
+            slice(None)
+            if assets is None
+            else [self._positions[asset] for asset in assets]
+        )
+        index = self._index if assets is None else pd.Index(assets)
+
+        if metric is not None:
+            return pd.Series(
+                self.values(metric)[position, columns], index=index, name=metric
+            )
+
+        return pd.DataFrame(
+            np.column_stack([self.values(m)[position, columns] for m in self.metrics]),
+            index=index,
+            columns=self.metrics,
+        )
+
+    def history(self, metric: str, asset: str) -> pd.Series:
+        """
+        Returns a metric of an asset on every date of the store.
+
+        Parameters:
+            metric (str): A metric of the store.
+            asset (str): An asset of the store.
+
+        Returns:
+            pd.Series: The metric, one value per date.
+        """
+
+        return pd.Series(
+            self.values(metric)[:, self._positions[asset]],
+            index=self.dates,
+            name=asset,
+        )
+
+    def update(
+        self,
+        returns: Union[ReturnsData, pd.DataFrame],
+        returns_rf: Optional[pd.DataFrame] = None,
+        returns_benchmark: Optional[pd.DataFrame] = None,
+    ) -> int:
+        """
+        Appends the snapshots of the dates after the last stored one. Only the
+        trailing windows of the new dates are computed, from the last returns.
+
+        The risk-free and benchmark returns must be the ones the store was created
+        with: they are checked by name, and by their values over the returns that the
+        last snapshot shares with the next window.
+
+        Parameters:
+            returns (Union[ReturnsData, pd.DataFrame]): Daily returns of the assets,
+                including at least the trailing window of the first new date.
+            returns_rf (pd.DataFrame, optional): Daily returns of the risk-free asset.
+                Defaults to None, zero returns.
+            returns_benchmark (pd.DataFrame, optional): Daily returns of the benchmark.
+                Defaults to None, the risk-free returns.
+
+        Raises:
+            ValueError: If an asset of the store is missing from the returns, the
+                returns do not cover the trailing window of the first new date, or the
+                risk-free or benchmark returns differ from those of the store.
+
+        Returns:
+            int: The number of dates appended.
+        """
+
+        for label, stored, given in [
+            ("risk-free asset", self.asset_rf, _name(returns_rf)),
+            ("benchmark", self.asset_benchmark, _name(returns_benchmark)),
+        ]:
+            if given != stored:
+                raise ValueError(
+                    f"The {label} {given!r} differs from the one of the store {stored!r}"
+                )
+
+        returns, rf, benchmark = _align_inputs(returns, returns_rf, returns_benchmark)
+
+        missing = [asset for asset in self.assets if asset not in returns.columns]
+        if missing:
+            raise ValueError(f"Assets of the store are missing: {missing}")
+        returns = returns[self.assets]
+
+        # First date after the last snapshot that closes a full window
+        index = returns.index
+        first = self.window - 1
+        if self.n_dates > 0:
+            last = pd.Timestamp(self._date_values[-1], tz="UTC")
+            last = last.tz_convert(index.tz) if index.tz else last.tz_localize(None)
+            first = int(index.searchsorted(last, side="right"))
+            if first > 0 and index[first - 1] != last:
+                raise ValueError(f"The returns do not include the last snapshot {last}")
+            if first < self.window - 1:
+                raise ValueError(
+                    f"The returns must include {self.window} returns up to {last}"
+                )
+            if _inputs(rf, benchmark, first, self.window) != self._inputs:
+                raise ValueError(
+                    "The risk-free or benchmark returns differ from those of the "
+                    f"store in the window up to {last}"
+                )
+
+        if first >= len(index):
+            return 0
+
+        # Only the returns of the new windows are used
+        offset = first - self.window + 1
+        ends = np.arange(first, len(index)) + 1 - offset
+        starts = ends - self.window
+        x = returns.to_numpy(dtype=np.float64)[offset:]
+
+        n_rows = self.n_dates
+        for metric in self.metrics:
+            values = _window_metric(
+                x,
+                rf[offset:],
+                benchmark[offset:],
+                metric,
+                starts,
+                ends,
+                self.periods_per_year,
+            )
+            _append(
+                self.path / self._files[metric],
+                values.astype("<f8"),
+                n_rows * len(self.assets) * 8,
+            )
+
+        dates = index[first:]
+        timestamps = (
+            dates.tz_convert("UTC").tz_localize(None) if dates.tz else dates
+        ).as_unit("ns")
+        _append(self.path / _DATES_FILE, timestamps.asi8.astype("<i8"), n_rows * 8)
+
+        # The new rows are committed by the metadata
+        metadata = json.loads((self.path / _METADATA_FILE).read_text())
+        metadata["n_dates"] = n_rows + len(dates)
+        metadata["inputs"] = _inputs(rf, benchmark, len(index), self.window)
+        _write_metadata(self.path, metadata)
+        self._read_metadata()
+
+        return len(dates)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of snapshots.
+
+        Returns:
+            int: The number of dates.
+        """
+        return self.n_dates
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the store.
+
+        Returns:
+            str: The path, assets, metrics, window and dates of the store.
+        """
+
+        dates = self.dates
+        span = f"{dates[0]} to {dates[-1]}" if len(dates) else "empty"
+        return (
+            "Snapshot Store:\n"
+            + f"- Path: {self.path}\n"
+            + f"- Number of Assets: {len(self.assets)}\n"
+            + f"- Metrics: {self.metrics}\n"
+            + f"- Window: {self.window}\n"
+            + f"- Risk-Free Asset: {self.asset_rf}\n"
+            + f"- Benchmark Asset: {self.asset_benchmark}\n"
+            + f"- Dates: {len(dates)}, {span}\n"
+        )
+
+
+def _name(returns: Optional[pd.DataFrame]) -> Optional[str]:
+    """Returns the name of the risk-free or benchmark asset, None for the default."""
+    return None if returns is None else str(returns.columns[0])
+
+
+def _inputs(rf: np.ndarray, benchmark: np.ndarray, end: int, window: int) -> str:
+    """Returns the fingerprint of the risk-free and benchmark returns before a
+    position that the next window shares, which the next update must reproduce."""
+
+    shared = slice(max(end - window + 1, 0), end)
+    return fingerprint(pd.Series(rf[shared]), pd.Series(benchmark[shared]))
+
+
+def _append(path: Path, values: np.ndarray, committed: int) -> None:
+    """
+    Appends raw values to a file after its committed bytes, discarding any bytes of
+    an interrupted update.
+
+    Parameters:
+        path (Path): The file.
+        values (np.ndarray): The values.
+        committed (int): The number of committed bytes.
+    """
+
+    with open(path, "r+b") as file:
+        file.truncate(committed)
+        file.seek(committed)
+        file.write(np.ascontiguousarray(values).tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def _write_metadata(path: Path, metadata: dict) -> None:
+    """Writes the metadata of a store atomically."""
+
+    tmp = path / f"{_METADATA_FILE}.tmp"
+    tmp.write_text(json.dumps(metadata))
+    os.replace(tmp, path / _METADATA_FILE)
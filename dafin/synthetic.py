@@ -0,0 +1,370 @@
+"""
+Seeded synthetic market for scale and stress testing without network access.
+
+`SyntheticMarket` generates correlated price panels of any size. Each asset follows
+a geometric Brownian motion driven by common factors and fat-tailed (Student's t)
+shocks, may be listed after the first date, and may miss bars. It produces the
+Open, High, Low, Close and Volume fields of the downloaded histories, e.g.
+
+    market = SyntheticMarket(n_assets=5000, n_days=2520, seed=7, inception=0.5)
+    returns_data = market.returns_data(market.assets[:100])
+    market.write_memmap("universe", returns=True)  # for `dafin.summary_chunked`
+
+The assets are generated in fixed blocks, each from its own seeded generator, so a
+panel is the same whether it is generated at once or streamed in chunks.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .returns_data import PRICE_FIELDS, ReturnsData
+
+# Default number of assets per chunk streamed to disk
+DEFAULT_CHUNK_SIZE = 1000
+
+# Number of assets generated from each seeded generator
+_BLOCK_SIZE = 256
+
+# Share of the daily log return realized overnight, between the close and the open
+_OVERNIGHT_SHARE = 0.3
+
+
+class SyntheticMarket:
+    def __init__(
+        self,
+        n_assets: int = 100,
+        n_days: int = 2520,
+        seed: int = 0,
+        n_factors: int = 1,
+        drift: float = 0.07,
+        volatility: float = 0.25,
+        factor_share: float = 0.4,
+        tail_df: Optional[float] = 5.0,
+        inception: float = 0.0,
+        gap_prob: float = 0.0,
+        start: str = "2000-01-03",
+        prefix: str = "S",
+    ) -> None:
+        """
+        Initializes the synthetic market. Nothing is generated until prices are
+        requested.
+
+        Parameters:
+            n_assets (int, optional): Number of assets. Defaults to 100.
+            n_days (int, optional): Number of trading days. Defaults to 2520.
+            seed (int, optional): Seed of the random generators. Defaults to 0.
+            n_factors (int, optional): Number of common factors. Defaults to 1, a
+                market factor; 0 makes the assets independent.
+            drift (float, optional): Mean annual drift of the assets. Defaults to 0.07.
+            volatility (float, optional): Mean annual volatility of the assets.
+                Defaults to 0.25.
+            factor_share (float, optional): Share of the variance of the assets
+                explained by the factors. Defaults to 0.4.
+            tail_df (float, optional): Degrees of freedom of the Student's t shocks,
+                scaled to unit variance. Defaults to 5.0; None draws normal shocks.
+            inception (float, optional): Maximum share of the history before an asset
+                is listed, drawn uniformly per asset. Defaults to 0.0, all listed on
+                the first date.
+            gap_prob (float, optional): Probability that a bar is missing. Defaults to 0.0.
+            start (str, optional): The first date. Defaults to "2000-01-03".
+            prefix (str, optional): Prefix of the asset symbols. Defaults to "S".
+
+        Raises:
+            ValueError: If a parameter is out of range.
+        """
+
+        if n_assets < 1 or n_days < 2:
+            raise ValueError("At least one asset and two days are required")
+        if not 0 <= factor_share <= 1 or not 0 <= inception < 1:
+            raise ValueError("factor_share must be in [0, 1] and inception in [0, 1)")
+        if not 0 <= gap_prob < 1:
+            raise ValueError("gap_prob must be in [0, 1)")
+        if tail_df is not None and tail_df <= 2:
+            raise ValueError("tail_df must be greater than 2 for a finite variance")
+
+        self.n_assets = n_assets
+        self.n_days = n_days
+        self.seed = seed
+        self.n_factors = n_factors
+        self.drift = drift
+        self.volatility = volatility
+        self.factor_share = factor_share if n_factors > 0 else 0.0
+        self.tail_df = tail_df
+        self.inception = inception
+        self.gap_prob = gap_prob
+
+        self.index = pd.bdate_range(start, periods=n_days, tz="UTC")
+        self.assets = [f"{prefix}{i}" for i in range(n_assets)]
+        self._positions = {asset: i for i, asset in enumerate(self.assets)}
+
+        # Last generated block, reused by chunks that share it
+        self._cached_block = (None, None)
+
+        # Unit-variance shocks of the factors, shared by every block of assets
+        self._factors = self._shocks(
+            np.random.default_rng([seed, 0]), (n_days, n_factors)
+        )
+
+    def _shocks(self, rng: np.random.Generator, shape: tuple) -> np.ndarray:
+        """Draws unit-variance shocks, fat-tailed unless `tail_df` is None."""
+
+        if self.tail_df is None:
+            return rng.standard_normal(shape)
+
+        scale = np.sqrt((self.tail_df - 2) / self.tail_df)
+        return rng.standard_t(self.tail_df, shape) * scale
+
+    def _block(self, block: int) -> Dict[str, np.ndarray]:
+        """
+        Generates the fields of a block of assets from its own seeded generator.
+
+        Parameters:
+            block (int): The index of the block, of _BLOCK_SIZE assets.
+
+        Returns:
+            Dict[str, np.ndarray]: Each field of PRICE_FIELDS, one column per asset.
+        """
+
+        if self._cached_block[0] == block:
+            return self._cached_block[1]
+
+        n = min(_BLOCK_SIZE, self.n_assets - block * _BLOCK_SIZE)
+        rng = np.random.default_rng([self.seed, 1, block])
+
+        # Annual drift and volatility of each asset, and its exposure to the factors
+        mu = rng.normal(self.drift, 0.05, n)
+        sigma = self.volatility * rng.lognormal(-0.08, 0.4, n)
+        loadings = rng.normal(1.0, 0.5, (self.n_factors, n))
+        loadings /= np.maximum(np.linalg.norm(loadings, axis=0), 1e-12)
+
+        # Daily log returns of a geometric Brownian motion
+        shocks = np.sqrt(1 - self.factor_share) * self._shocks(rng, (self.n_days, n))
+        if self.n_factors > 0:
+            shocks += np.sqrt(self.factor_share) * (self._factors @ loadings)
+        daily_sigma = sigma / np.sqrt(252)
+        log_returns = (mu - sigma**2 / 2) / 252 + daily_sigma * shocks
+        log_returns[0] = 0.0
+
+        log_close = np.log(rng.lognormal(np.log(50), 0.8, n)) + np.cumsum(
+            log_returns, axis=0
+        )
+        close = np.exp(log_close)
+        open_ = np.exp(log_close - (1 - _OVERNIGHT_SHARE) * log_returns)
+
+        # Intraday range beyond the open and the close
+        spread = daily_sigma * np.abs(rng.standard_normal((2, self.n_days, n))) / 2
+        high = np.maximum(open_, close) * np.exp(spread[0])
+        low = np.minimum(open_, close) * np.exp(-spread[1])
+        volume = np.round(
+            rng.lognormal(13, 0.5, (self.n_days, n)) * (1 + 20 * np.abs(log_returns))
+        )
+
+        # Bars before the listing of each asset, and missing bars
+        missing = np.arange(self.n_days)[:, None] < rng.integers(
+            0, int(self.inception * self.n_days) + 1, n
+        )
+        if self.gap_prob > 0:
+            missing |= rng.random((self.n_days, n)) < self.gap_prob
+
+        fields = dict(zip(PRICE_FIELDS, [open_, high, low, close, volume]))
+        for values in fields.values():
+            values[missing] = np.nan
+
+        self._cached_block = (block, fields)
+        return fields
+
+    def _generate(self, start: int, stop: int, field: str) -> np.ndarray:
+        """
+        Generates a field of a range of assets.
+
+        Parameters:
+            start (int): The position of the first asset.
+            stop (int): The position after the last asset.
+            field (str): One of PRICE_FIELDS.
+
+        Returns:
+            np.ndarray: The field, one column per asset.
+        """
+
+        first, last = start // _BLOCK_SIZE, (stop - 1) // _BLOCK_SIZE
+        values = np.hstack(
+            [self._block(block)[field] for block in range(first, last + 1)]
+        )
+        offset = first * _BLOCK_SIZE
+        return values[:, start - offset : stop - offset]
+
+    def prices(
+        self, field: str = "Close", assets: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Generates a field of the assets. Missing bars, including those before the
+        listing of an asset, are NaN.
+
+        Parameters:
+            field (str, optional): One of PRICE_FIELDS. Defaults to "Close".
+            assets (List[str], optional): The assets. Defaults to None, all assets.
+
+        Raises:
+            ValueError: If the field or an asset is unknown.
+
+        Returns:
+            pd.DataFrame: The field, one column per asset.
+        """
+
+        if field not in PRICE_FIELDS:
+            raise ValueError(f"Unsupported field: {field}. Use one of {PRICE_FIELDS}.")
+
+        if assets is None:
+            values = self._generate(0, self.n_assets, field)
+            return pd.DataFrame(values, index=self.index, columns=self.assets)
+
+        unknown = [asset for asset in assets if asset not in self._positions]
+        if unknown:
+            raise ValueError(f"No price data found for: {unknown}")
+
+        # Only the blocks of the requested assets are generated
+        positions = np.array([self._positions[asset] for asset in assets])
+        blocks = {
+            block: self._block(block)[field]
+            for block in np.unique(positions // _BLOCK_SIZE)
+        }
+        values = np.column_stack(
+            [blocks[p // _BLOCK_SIZE][:, p % _BLOCK_SIZE] for p in positions]
+        )
+        return pd.DataFrame(values, index=self.index, columns=list(assets))
+
+    def history(self, asset: str) -> pd.DataFrame:
+        """
+        Generates the history of an asset, like a downloaded one, see
+        `dafin.returns_data.download_history`.
+
+        Parameters:
+            asset (str): The asset.
+
+        Returns:
+            pd.DataFrame: The fields of PRICE_FIELDS on the dates of its bars.
+        """
+
+        position = self._positions[asset]
+        fields = self._block(position // _BLOCK_SIZE)
+        return pd.DataFrame(
+            {field: fields[field][:, position % _BLOCK_SIZE] for field in PRICE_FIELDS},
+            index=self.index,
+        ).dropna()
+
+    def factor_returns(self) -> pd.DataFrame:
+        """
+        Returns the daily returns of an index of each factor, e.g. a benchmark for the
+        market factor, with the mean drift and volatility of the assets.
+
+        Returns:
+            pd.DataFrame: The returns of the factors, on the dates after the first one.
+        """
+
+        daily_sigma = self.volatility / np.sqrt(252)
+        log_returns = (self.drift - self.volatility**2 / 2) / 252 + (
+            daily_sigma * self._factors[1:]
+        )
+        return pd.DataFrame(
+            np.expm1(log_returns),
+            index=self.index[1:],
+            columns=[f"F{i}" for i in range(self.n_factors)],
+        )
+
+    def returns_data(
+        self, assets: Optional[List[str]] = None, col_price: str = "Close"
+    ) -> ReturnsData:
+        """
+        Creates a ReturnsData of the assets, on the dates where all have bars, as if
+        their prices were downloaded.
+
+        Parameters:
+            assets (List[str], optional): The assets. Defaults to None, all assets.
+            col_price (str, optional): One of PRICE_FIELDS. Defaults to "Close".
+
+        Returns:
+            ReturnsData: The returns data.
+        """
+
+        prices = self.prices(col_price, assets).dropna()
+        return ReturnsData.from_prices(prices, col_price)
+
+    def iter_chunks(
+        self, field: str = "Close", chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Generates a field of all the assets in chunks of columns, so that only one
+        chunk is in memory at a time.
+
+        Parameters:
+            field (str, optional): One of PRICE_FIELDS. Defaults to "Close".
+            chunk_size (int, optional): Number of assets per chunk. Defaults to
+                DEFAULT_CHUNK_SIZE.
+
+        Yields:
+            pd.DataFrame: The field of a chunk of assets.
+        """
+
+        if field not in PRICE_FIELDS:
+            raise ValueError(f"Unsupported field: {field}. Use one of {PRICE_FIELDS}.")
+
+        for start in range(0, self.n_assets, chunk_size):
+            stop = min(start + chunk_size, self.n_assets)
+            yield pd.DataFrame(
+                self._generate(start, stop, field),
+                index=self.index,
+                columns=self.assets[start:stop],
+            )
+
+    def write_memmap(
+        self,
+        path: Path,
+        field: str = "Close",
+        returns: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Path:
+        """
+        Streams a field of all the assets to a memory-mappable array, chunk by chunk,
+        in the format of `dafin.chunked.write_memmap`. With `returns`, the daily
+        returns are written instead, e.g. for `dafin.summary_chunked`.
+
+        Parameters:
+            path (Path): The file path without extension.
+            field (str, optional): One of PRICE_FIELDS. Defaults to "Close".
+            returns (bool, optional): If True, writes the returns of the field.
+                Defaults to False.
+            chunk_size (int, optional): Number of assets per chunk. Defaults to
+                DEFAULT_CHUNK_SIZE.
+
+        Returns:
+            Path: The path of the array file.
+        """
+
+        path = Path(path)
+        index = self.index[1:] if returns else self.index
+        array = np.lib.format.open_memmap(
+            path.with_suffix(".npy"),
+            mode="w+",
+            dtype=np.float64,
+            shape=(len(index), self.n_assets),
+            fortran_order=True,
+        )
+
+        start = 0
+        for chunk in self.iter_chunks(field, chunk_size):
+            values = chunk.to_numpy()
+            if returns:
+                values = values[1:] / values[:-1] - 1
+            array[:, start : start + chunk.shape[1]] = values
+            start += chunk.shape[1]
+        array.flush()
+        del array
+
+        metadata = {"index": index.astype(str).tolist(), "columns": self.assets}
+        path.with_suffix(".json").write_text(json.dumps(metadata))
+
+        return path.with_suffix(".npy")
@@ -1,5 +1,7 @@
 import datetime
-from typing import Tuple, Union
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -9,6 +11,71 @@ import scipy as sp
 DEFAULT_DATE_FMT = "%Y-%m-%d"  # ISO 8601
 DEFAULT_DAYS_PER_YEAR = 252  # 252 trading days per year
 
+# Supported return frequencies, and their number of periods per year
+PERIODS_PER_YEAR = {"D": DEFAULT_DAYS_PER_YEAR, "W": 52, "M": 12, "Q": 4, "Y": 1}
+
+# Pandas resampling rules of the frequencies, with weeks ending on Friday
+RESAMPLE_RULES = {"W": "W-FRI", "M": "ME", "Q": "QE", "Y": "YE"}
+
+# Average calendar days between the periods of each frequency
+_PERIOD_DAYS = {"D": 1, "W": 7, "M": 365.25 / 12, "Q": 365.25 / 4, "Y": 365.25}
+
+# Benchmark-relative metrics of `calculate_relative_metrics`
+RELATIVE_COLUMNS = ["Tracking Error", "Information Ratio", "Up Capture", "Down Capture"]
+
+# Default confidence level of the value at risk
+DEFAULT_CONFIDENCE = 0.95
+
+# Methods of the value at risk: empirical quantiles, normal distribution, and normal
+# distribution adjusted for skewness and kurtosis
+VAR_METHODS = ["historical", "gaussian", "cornish_fisher"]
+
+# Default maximum number of values partitioned at once by `rolling_tail_risk`
+DEFAULT_TAIL_BLOCK = 2**24
+
+# Supported file formats for saving data, and their file extensions
+DATA_FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+# File extensions of compressed CSV files
+CSV_COMPRESSION_SUFFIXES = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz", "zstd": ".zst"}
+
+
+def align_benchmark(
+    returns: pd.DataFrame, returns_benchmark: pd.DataFrame
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Aligns the returns of a benchmark to the dates of the returns of the assets, for
+    the vectorized benchmark-relative metrics.
+
+    Parameters:
+        returns (pd.DataFrame): Daily returns of the assets.
+        returns_benchmark (pd.DataFrame): Daily returns of the benchmark.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The returns of the assets, one
+            column per asset, the returns of the benchmark on the same dates, and the
+            mask of the dates where both the asset and the benchmark have returns.
+    """
+
+    x = returns.to_numpy(dtype=np.float64)
+    y = returns_benchmark.iloc[:, 0].reindex(returns.index).to_numpy(dtype=np.float64)
+    mask = ~np.isnan(x) & ~np.isnan(y)[:, None]
+    return x, y, mask
+
+
+def _beta(
+    aligned: Tuple[np.ndarray, np.ndarray, np.ndarray], benchmark_var: float
+) -> np.ndarray:
+    """Calculates the beta of the assets from the arrays of `align_benchmark`."""
+
+    x, y, mask = aligned
+    n = mask.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = np.where(mask, x, 0).sum(axis=0) / n
+        y_mean = np.where(mask, y[:, None], 0).sum(axis=0) / n
+        sxy = np.where(mask, (x - x_mean) * (y[:, None] - y_mean), 0).sum(axis=0)
+        return sxy / (n - 1) / benchmark_var
+
 
 def calculate_beta(
     returns: pd.DataFrame, returns_benchmark: pd.DataFrame
@@ -17,6 +84,9 @@ def calculate_beta(
     Calculates the beta of the assets given a benchmark.
     Beta = covariance(asset returns, benchmark returns) / variance(benchmark returns)
 
+    The covariance uses the dates where both the asset and the benchmark have returns,
+    and the variance all the returns of the benchmark.
+
     Parameters:
         returns (pd.DataFrame): Daily returns of the assets.
         returns_benchmark (pd.DataFrame): Daily returns of the benchmark.
@@ -25,18 +95,99 @@ def calculate_beta(
         pd.DataFrame: A DataFrame containing the beta of each asset relative to the benchmark.
     """
 
-    beta_df = pd.DataFrame(index=returns.columns, columns=["beta"])
+    beta = _beta(
+        align_benchmark(returns, returns_benchmark),
+        returns_benchmark.iloc[:, 0].var(),
+    )
+    return pd.DataFrame(index=returns.columns, columns=["beta"], data=beta)
 
-    for asset in returns.columns:
-        cov_matrix = pd.concat([returns[asset], returns_benchmark], axis=1).cov()
-        beta = cov_matrix.iloc[0, 1] / cov_matrix.iloc[1, 1]
-        beta_df.loc[asset, "beta"] = beta
 
-    return beta_df
+def _relative_metrics(
+    aligned: Tuple[np.ndarray, np.ndarray, np.ndarray], periods_per_year: float
+) -> np.ndarray:
+    """
+    Calculates the benchmark-relative metrics of the assets from the arrays of
+    `align_benchmark`, in one pass over the active returns and the masks of the
+    periods where the benchmark rises and falls.
+
+    Returns:
+        np.ndarray: The metrics of RELATIVE_COLUMNS, one row per asset.
+    """
+
+    x, y, mask = aligned
+    y = y[:, None]
+    n = mask.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Tracking error and information ratio, from the active returns
+        active = np.where(mask, x - y, 0)
+        active_mean = active.sum(axis=0) / n
+        active_var = (np.where(mask, active - active_mean, 0) ** 2).sum(axis=0) / (
+            n - 1
+        )
+        tracking_error = np.sqrt(active_var * periods_per_year)
+        information_ratio = active_mean * periods_per_year / tracking_error
+
+        # Annualized geometric mean returns over the periods the benchmark rises or
+        # falls, of the asset relative to the benchmark
+        log_x = np.log1p(np.where(mask, x, 0))
+        log_y = np.log1p(np.where(mask, y, 0))
+        captures = []
+        for periods in (mask & (y > 0), mask & (y < 0)):
+            count = periods.sum(axis=0)
+            asset = np.expm1(
+                np.where(periods, log_x, 0).sum(axis=0) / count * periods_per_year
+            )
+            benchmark = np.expm1(
+                np.where(periods, log_y, 0).sum(axis=0) / count * periods_per_year
+            )
+            captures.append(asset / benchmark)
+
+    return np.column_stack([tracking_error, information_ratio, *captures])
+
+
+def calculate_relative_metrics(
+    returns: pd.DataFrame,
+    returns_benchmark: pd.DataFrame,
+    periods_per_year: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Calculates the benchmark-relative metrics of the assets, for all assets at once:
+
+    - Tracking Error: annualized standard deviation of the active returns, the
+      returns of the asset minus those of the benchmark.
+    - Information Ratio: annualized mean active return over the tracking error.
+    - Up Capture: annualized geometric mean return of the asset over the periods the
+      benchmark rises, relative to that of the benchmark.
+    - Down Capture: the same over the periods the benchmark falls.
+
+    Parameters:
+        returns (pd.DataFrame): Daily returns of the assets.
+        returns_benchmark (pd.DataFrame): Daily returns of the benchmark.
+        periods_per_year (float, optional): Number of return periods per year. Defaults
+            to None, inferred from the dates of the returns.
+
+    Returns:
+        pd.DataFrame: The metrics of RELATIVE_COLUMNS, one row per asset.
+    """
+
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(returns.index)
+
+    return pd.DataFrame(
+        _relative_metrics(
+            align_benchmark(returns, returns_benchmark), periods_per_year
+        ),
+        index=returns.columns,
+        columns=RELATIVE_COLUMNS,
+    )
 
 
 def calculate_alpha(
-    returns: pd.DataFrame, returns_rf: pd.DataFrame, returns_benchmark: pd.DataFrame
+    returns: pd.DataFrame,
+    returns_rf: pd.DataFrame,
+    returns_benchmark: pd.DataFrame,
+    periods_per_year: Optional[float] = None,
 ) -> pd.DataFrame:
     """
     Calculates the alpha of the assets given a benchmark.
@@ -46,6 +197,8 @@ def calculate_alpha(
         returns (pd.DataFrame): Daily returns of the assets.
         returns_rf (pd.DataFrame): Daily returns of the risk-free asset.
         returns_benchmark (pd.DataFrame): Daily returns of the benchmark.
+        periods_per_year (float, optional): Number of return periods per year. Defaults
+            to None, inferred from the dates of the returns.
 
     Returns:
         pd.DataFrame: Alpha of the assets.
@@ -53,9 +206,9 @@ def calculate_alpha(
 
     beta = calculate_beta(returns, returns_benchmark)
 
-    ri = calc_annualized_returns(returns)
-    rb = calc_annualized_returns(returns_benchmark).iloc[0]
-    rf = calc_annualized_returns(returns_rf).iloc[0]
+    ri = calc_annualized_returns(returns, periods_per_year)
+    rb = calc_annualized_returns(returns_benchmark, periods_per_year).iloc[0]
+    rf = calc_annualized_returns(returns_rf, periods_per_year).iloc[0]
 
     alpha_data = ri - rf - beta.T * (rb - rf)
 
@@ -102,7 +255,9 @@ def regression(returns: pd.DataFrame, returns_benchmark: pd.DataFrame) -> pd.Dat
 
 
 def calculate_sharpe_ratio(
-    returns: pd.DataFrame, returns_rf: pd.DataFrame
+    returns: pd.DataFrame,
+    returns_rf: pd.DataFrame,
+    periods_per_year: Optional[float] = None,
 ) -> pd.Series:
     """
     Calculates the Sharpe ratio of the assets given a risk-free asset.
@@ -110,19 +265,24 @@ def calculate_sharpe_ratio(
     Parameters:
         returns (pd.DataFrame): Daily returns of the assets.
         returns_rf (pd.DataFrame): Daily returns of the risk-free asset.
+        periods_per_year (float, optional): Number of return periods per year. Defaults
+            to None, inferred from the dates of the returns.
 
     Returns:
         pd.Series: Sharpe ratio of the assets.
     """
 
-    ri = calc_annualized_returns(returns)
-    rf = calc_annualized_returns(returns_rf).iloc[0]
-    sd = calc_annualized_sd(returns)
+    ri = calc_annualized_returns(returns, periods_per_year)
+    rf = calc_annualized_returns(returns_rf, periods_per_year).iloc[0]
+    sd = calc_annualized_sd(returns, periods_per_year)
     return (ri - rf) / sd
 
 
 def calculate_treynor_ratio(
-    returns: pd.DataFrame, returns_rf: pd.DataFrame, returns_benchmark: pd.DataFrame
+    returns: pd.DataFrame,
+    returns_rf: pd.DataFrame,
+    returns_benchmark: pd.DataFrame,
+    periods_per_year: Optional[float] = None,
 ) -> pd.Series:
     """
     Calculates the Treynor ratio of the assets given a risk-free asset and a benchmark.
@@ -131,15 +291,413 @@ def calculate_treynor_ratio(
         returns (pd.DataFrame): Daily returns of the assets.
         returns_rf (pd.DataFrame): Daily returns of the risk-free asset.
         returns_benchmark (pd.DataFrame): Daily returns of the benchmark.
+        periods_per_year (float, optional): Number of return periods per year. Defaults
+            to None, inferred from the dates of the returns.
 
     Returns:
         pd.Series: Treynor ratio of the assets.
     """
 
-    ri = calc_annualized_returns(returns)
-    rf = calc_annualized_returns(returns_rf).iloc[0]
+    ri = calc_annualized_returns(returns, periods_per_year)
+    rf = calc_annualized_returns(returns_rf, periods_per_year).iloc[0]
     beta = calculate_beta(returns, returns_benchmark)
-    return (ri - rf).iloc[0] / beta
+    return beta.astype(float).rdiv(ri - rf, axis=0)
+
+
+def _tail_levels(confidence: Union[float, Sequence[float]]) -> np.ndarray:
+    """Returns the tail probabilities of confidence levels, e.g. 0.05 for 0.95."""
+
+    levels = np.atleast_1d(np.asarray(confidence, dtype=np.float64))
+    if ((levels <= 0) | (levels >= 1)).any():
+        raise ValueError(f"Confidence levels must be in (0, 1): {confidence}")
+
+    return 1 - levels
+
+
+def _historical_tail(x: np.ndarray, alphas: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Calculates the historical value at risk and conditional value at risk along the
+    first axis, for every tail probability at once. Only the tail of the returns is
+    sorted, after being selected with `np.partition`, and missing returns are
+    skipped.
+
+    Parameters:
+        x (np.ndarray): The returns, with the observations along the first axis.
+        alphas (np.ndarray): The tail probabilities.
+
+    Returns:
+        Tuple[np.ndarray, ...]: The value at risk and conditional value at risk, with
+            one row per tail probability followed by the remaining axes of x.
+    """
+
+    missing = np.isnan(x)
+    n = (~missing).sum(axis=0)
+    shape = (-1,) + (1,) * n.ndim
+    alphas = alphas.reshape(shape)
+
+    # Linearly interpolated quantile, as np.quantile, and number of tail returns
+    last = len(x) - 1
+    position = alphas * (n - 1)
+    lower = np.clip(np.floor(position), 0, last).astype(np.intp)
+    upper = np.clip(np.ceil(position), 0, last).astype(np.intp)
+    count = np.clip(np.ceil(alphas * n), 1, last + 1).astype(np.intp)
+
+    # Only the smallest returns are needed: they are selected with a single partition
+    # and sorted, with missing returns moved past them
+    rank = int(max(upper.max(), count.max() - 1))
+    y = np.where(missing, np.inf, x)
+    if rank < last:
+        y = np.partition(y, rank, axis=0)[: rank + 1]
+    y = np.sort(y, axis=0)
+
+    with np.errstate(invalid="ignore"):
+        q_lower = np.take_along_axis(y, lower, axis=0)
+        q_upper = np.take_along_axis(y, upper, axis=0)
+        quantile = q_lower + (position - lower) * (q_upper - q_lower)
+
+        # Mean of the smallest returns, up to the quantile
+        tail = np.take_along_axis(np.cumsum(y, axis=0), count - 1, axis=0)
+        var = np.where(n > 0, -quantile, np.nan)
+        cvar = np.where(n > 0, -tail / count, np.nan)
+
+    return var, cvar
+
+
+def _parametric_tail(
+    mean: np.ndarray,
+    sd: np.ndarray,
+    skew: np.ndarray,
+    kurt: np.ndarray,
+    alphas: np.ndarray,
+    method: str,
+) -> Tuple[np.ndarray, ...]:
+    """
+    Calculates the parametric value at risk and conditional value at risk from the
+    moments of the returns, for every tail probability at once.
+
+    The Cornish-Fisher quantile expands the normal quantile z with the skewness S and
+    the excess kurtosis K:
+
+        z + (z^2 - 1) S / 6 + (z^3 - 3z) K / 24 - (2z^3 - 5z) S^2 / 36
+
+    and its conditional value at risk is the mean of the expansion over the normal
+    tail below z. Without skewness and excess kurtosis, both reduce to the Gaussian
+    ones.
+
+    Parameters:
+        mean (np.ndarray): The mean of the returns.
+        sd (np.ndarray): The standard deviation of the returns.
+        skew (np.ndarray): The skewness of the returns.
+        kurt (np.ndarray): The excess kurtosis of the returns.
+        alphas (np.ndarray): The tail probabilities.
+        method (str): "gaussian" or "cornish_fisher".
+
+    Returns:
+        Tuple[np.ndarray, ...]: The value at risk and conditional value at risk, with
+            one row per tail probability followed by the axes of the moments.
+    """
+
+    alphas = alphas.reshape((-1,) + (1,) * np.ndim(mean))
+    z = sp.stats.norm.ppf(alphas)
+    pdf = sp.stats.norm.pdf(z)
+
+    if method == "gaussian":
+        return -(mean + z * sd), -(mean - sd * pdf / alphas)
+
+    s, k = skew, kurt
+    z_cf = (
+        z
+        + (z**2 - 1) * s / 6
+        + (z**3 - 3 * z) * k / 24
+        - (2 * z**3 - 5 * z) * s**2 / 36
+    )
+
+    # Partial moments of the standard normal below z, I_j = E[Z^j; Z < z]
+    i0 = alphas
+    i1 = -pdf
+    i2 = -z * pdf + i0
+    i3 = -(z**2) * pdf + 2 * i1
+    tail = (
+        i1 + (i2 - i0) * s / 6 + (i3 - 3 * i1) * k / 24 - (2 * i3 - 5 * i1) * s**2 / 36
+    )
+
+    return -(mean + z_cf * sd), -(mean + sd * tail / alphas)
+
+
+def _tail_frames(
+    values: Tuple[np.ndarray, ...],
+    confidence: Union[float, Sequence[float]],
+    index: pd.Index,
+    columns: pd.Index,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Labels the arrays of `_historical_tail` and `_parametric_tail`."""
+
+    levels = np.atleast_1d(confidence).tolist()
+    frames = []
+    for value in values:
+        if np.ndim(confidence) == 0:
+            frames.append(pd.DataFrame(value[0], index=index, columns=columns))
+        else:
+            frames.append(
+                pd.concat(
+                    {
+                        level: pd.DataFrame(v, index=index, columns=columns)
+                        for level, v in zip(levels, value)
+                    },
+                    axis=1,
+                )
+            )
+
+    return frames[0], frames[1]
+
+
+def calculate_tail_risk(
+    returns: pd.DataFrame,
+    confidence: Union[float, Sequence[float]] = DEFAULT_CONFIDENCE,
+    method: str = "historical",
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Calculates the value at risk (VaR) and the conditional value at risk (CVaR) of
+    the assets, for every asset and confidence level at once. Both are losses of a
+    single period, as positive fractions: the VaR is the loss that is not exceeded
+    with the confidence level, and the CVaR is the mean loss beyond it.
+
+    Parameters:
+        returns (pd.DataFrame): Periodic returns of the assets, e.g. daily.
+        confidence (Union[float, Sequence[float]], optional): The confidence levels.
+            Defaults to DEFAULT_CONFIDENCE.
+        method (str, optional): One of VAR_METHODS. Defaults to "historical".
+
+    Raises:
+        ValueError: If the method or a confidence level is not supported.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The VaR and the CVaR, one row per asset and
+            one column per confidence level.
+    """
+
+    alphas = _tail_levels(confidence)
+    if method == "historical":
+        values = _historical_tail(returns.to_numpy(dtype=np.float64), alphas)
+    elif method in VAR_METHODS:
+        values = _parametric_tail(
+            *(
+                m.to_numpy(dtype=np.float64)
+                for m in (returns.mean(), returns.std(), returns.skew(), returns.kurt())
+            ),
+            alphas,
+            method,
+        )
+    else:
+        raise ValueError(f"Unsupported method: {method}. Use one of {VAR_METHODS}.")
+
+    levels = np.atleast_1d(confidence).tolist()
+    var, cvar = (
+        pd.DataFrame(value.T, index=returns.columns, columns=levels) for value in values
+    )
+    return var, cvar
+
+
+def calculate_var(
+    returns: pd.DataFrame,
+    confidence: Union[float, Sequence[float]] = DEFAULT_CONFIDENCE,
+    method: str = "historical",
+) -> pd.DataFrame:
+    """
+    Calculates the value at risk of the assets, see `calculate_tail_risk`.
+
+    Parameters:
+        returns (pd.DataFrame): Periodic returns of the assets, e.g. daily.
+        confidence (Union[float, Sequence[float]], optional): The confidence levels.
+            Defaults to DEFAULT_CONFIDENCE.
+        method (str, optional): One of VAR_METHODS. Defaults to "historical".
+
+    Returns:
+        pd.DataFrame: The VaR, one row per asset and one column per confidence level.
+    """
+    return calculate_tail_risk(returns, confidence, method)[0]
+
+
+def calculate_cvar(
+    returns: pd.DataFrame,
+    confidence: Union[float, Sequence[float]] = DEFAULT_CONFIDENCE,
+    method: str = "historical",
+) -> pd.DataFrame:
+    """
+    Calculates the conditional value at risk, or expected shortfall, of the assets,
+    see `calculate_tail_risk`.
+
+    Parameters:
+        returns (pd.DataFrame): Periodic returns of the assets, e.g. daily.
+        confidence (Union[float, Sequence[float]], optional): The confidence levels.
+            Defaults to DEFAULT_CONFIDENCE.
+        method (str, optional): One of VAR_METHODS. Defaults to "historical".
+
+    Returns:
+        pd.DataFrame: The CVaR, one row per asset and one column per confidence level.
+    """
+    return calculate_tail_risk(returns, confidence, method)[1]
+
+
+def rolling_tail_risk(
+    returns: pd.DataFrame,
+    window: int,
+    confidence: Union[float, Sequence[float]] = DEFAULT_CONFIDENCE,
+    method: str = "historical",
+    block_size: int = DEFAULT_TAIL_BLOCK,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Calculates the value at risk and conditional value at risk of the assets over
+    trailing windows, see `calculate_tail_risk`. The historical measures partition
+    blocks of windows at once, with at most `block_size` values per block; the
+    parametric ones use rolling moments.
+
+    Parameters:
+        returns (pd.DataFrame): Periodic returns of the assets, e.g. daily.
+        window (int): Number of returns per window.
+        confidence (Union[float, Sequence[float]], optional): The confidence levels.
+            Defaults to DEFAULT_CONFIDENCE.
+        method (str, optional): One of VAR_METHODS. Defaults to "historical".
+        block_size (int, optional): Maximum number of values partitioned at once.
+            Defaults to DEFAULT_TAIL_BLOCK.
+
+    Raises:
+        ValueError: If the method, a confidence level or the window is not supported.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The VaR and the CVaR, one row per window
+            labeled by its last date, and one column per asset. With several
+            confidence levels, the columns are keyed by level and asset.
+    """
+
+    if not 1 < window <= len(returns):
+        raise ValueError(f"Window must be in (1, {len(returns)}]: {window}")
+
+    alphas = _tail_levels(confidence)
+    index = returns.index[window - 1 :]
+
+    if method == "historical":
+        x = returns.to_numpy(dtype=np.float64)
+        windows = np.lib.stride_tricks.sliding_window_view(x, window, axis=0)
+        step = max(1, block_size // (window * x.shape[1]))
+
+        # Observations along the first axis: (window, windows, assets)
+        blocks = [
+            _historical_tail(np.moveaxis(windows[i : i + step], -1, 0), alphas)
+            for i in range(0, len(windows), step)
+        ]
+        values = tuple(
+            np.concatenate([block[j] for block in blocks], axis=1) for j in range(2)
+        )
+    elif method in VAR_METHODS:
+        # Missing returns are skipped, as by the historical measures
+        rolling = returns.rolling(window, min_periods=1)
+        values = _parametric_tail(
+            *(
+                m.to_numpy(dtype=np.float64)[window - 1 :]
+                for m in (rolling.mean(), rolling.std(), rolling.skew(), rolling.kurt())
+            ),
+            alphas,
+            method,
+        )
+    else:
+        raise ValueError(f"Unsupported method: {method}. Use one of {VAR_METHODS}.")
+
+    return _tail_frames(values, confidence, index, returns.columns)
+
+
+def calc_cross_cov(
+    returns: pd.DataFrame, other: pd.DataFrame, normalize: bool = False
+) -> pd.DataFrame:
+    """
+    Calculates the covariance, or correlation, between the columns of two return
+    DataFrames with the same dates, i.e. a block of the covariance matrix of their
+    concatenation, in O(N * M * T) rather than O((N + M)^2 * T).
+
+    Parameters:
+        returns (pd.DataFrame): Daily returns of N assets.
+        other (pd.DataFrame): Daily returns of M other assets.
+        normalize (bool, optional): If True, calculates the correlation instead of the
+            covariance. Defaults to False.
+
+    Returns:
+        pd.DataFrame: The N x M covariance, or correlation, matrix.
+    """
+
+    x = returns.to_numpy(dtype=np.float64)
+    y = other.to_numpy(dtype=np.float64)
+
+    if np.isnan(x).any() or np.isnan(y).any():
+        matrix = _pairwise_cross_cov(x, y, normalize)
+        return pd.DataFrame(matrix, index=returns.columns, columns=other.columns)
+
+    x = x - x.mean(axis=0)
+    y = y - y.mean(axis=0)
+
+    matrix = x.T @ y / (len(x) - 1)
+    if normalize:
+        sd_x = np.sqrt((x * x).sum(axis=0) / (len(x) - 1))
+        sd_y = np.sqrt((y * y).sum(axis=0) / (len(y) - 1))
+        matrix = np.clip(matrix / np.outer(sd_x, sd_y), -1, 1)
+
+    return pd.DataFrame(matrix, index=returns.columns, columns=other.columns)
+
+
+def _pairwise_cross_cov(x: np.ndarray, y: np.ndarray, normalize: bool) -> np.ndarray:
+    """
+    Calculates the cross covariance, or correlation, of `calc_cross_cov` over the
+    dates where both assets of each pair have returns, as `pd.DataFrame.cov`, from
+    masked sums that only span the N x M block.
+    """
+
+    # Centering on the column means does not change the result, but avoids the
+    # cancellation of the raw sums
+    x = x - np.nanmean(x, axis=0)
+    y = y - np.nanmean(y, axis=0)
+
+    mask_x = (~np.isnan(x)).astype(np.float64)
+    mask_y = (~np.isnan(y)).astype(np.float64)
+    x = np.where(mask_x > 0, x, 0)
+    y = np.where(mask_y > 0, y, 0)
+
+    n = mask_x.T @ mask_y
+    sum_x = x.T @ mask_y
+    sum_y = mask_x.T @ y
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        matrix = (x.T @ y - sum_x * sum_y / n) / (n - 1)
+        if normalize:
+            var_x = ((x * x).T @ mask_y - sum_x**2 / n) / (n - 1)
+            var_y = (mask_x.T @ (y * y) - sum_y**2 / n) / (n - 1)
+            matrix = np.clip(matrix / np.sqrt(var_x * var_y), -1, 1)
+
+    matrix[n < 2] = np.nan
+    return matrix
+
+
+def cluster_order(corr: pd.DataFrame) -> List[int]:
+    """
+    Orders the assets by hierarchical clustering of their correlation matrix, so that
+    highly correlated assets end up next to each other.
+
+    Parameters:
+        corr (pd.DataFrame): Correlation matrix of the assets.
+
+    Returns:
+        List[int]: Positional order of the assets.
+    """
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+
+    if corr.shape[0] < 3:
+        return list(range(corr.shape[0]))
+
+    # Correlation distance, with undefined correlations treated as uncorrelated
+    dist = np.sqrt(np.clip(0.5 * (1 - corr.fillna(0).to_numpy(dtype=float)), 0, 1))
+    np.fill_diagonal(dist, 0)
+
+    links = linkage(squareform(dist, checks=False), method="average")
+    return leaves_list(links).tolist()
 
 
 def calc_returns_cum(returns: pd.DataFrame) -> pd.DataFrame:
@@ -168,33 +726,178 @@ def calc_returns_total(returns: pd.DataFrame) -> pd.Series:
     return calc_returns_cum(returns).iloc[-1, :]
 
 
-def calc_annualized_returns(returns: pd.DataFrame) -> pd.DataFrame:
+def calc_annualized_returns(
+    returns: pd.DataFrame, periods_per_year: Optional[float] = None
+) -> pd.DataFrame:
     """
-    Calculates the annualized returns from daily returns.
+    Calculates the annualized returns from periodic returns.
 
     Parameters:
-        returns (pd.DataFrame): A DataFrame containing daily returns.
+        returns (pd.DataFrame): A DataFrame containing periodic returns, e.g. daily.
+        periods_per_year (float, optional): Number of return periods per year. Defaults
+            to None, inferred from the dates of the returns.
 
     Returns:
-        pd.DataFrame: A DataFrame containing the annualized returns calculated from the daily returns.
+        pd.DataFrame: A DataFrame containing the annualized returns calculated from the periodic returns.
     """
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(returns.index)
+
     returns_total = calc_returns_total(returns)
-    days_factor = DEFAULT_DAYS_PER_YEAR / returns.shape[0]
-    return (1 + returns_total) ** days_factor - 1
+    periods_factor = periods_per_year / returns.shape[0]
+    return (1 + returns_total) ** periods_factor - 1
 
 
-def calc_annualized_sd(returns: pd.DataFrame) -> pd.DataFrame:
+def calc_annualized_sd(
+    returns: pd.DataFrame, periods_per_year: Optional[float] = None
+) -> pd.DataFrame:
     """
-    Calculates the annualized standard deviation from daily returns.
+    Calculates the annualized standard deviation from periodic returns.
 
     Parameters:
-        returns (pd.DataFrame): A DataFrame containing daily returns.
+        returns (pd.DataFrame): A DataFrame containing periodic returns, e.g. daily.
+        periods_per_year (float, optional): Number of return periods per year. Defaults
+            to None, inferred from the dates of the returns.
 
     Returns:
         pd.DataFrame: A DataFrame containing the annualized standard deviation for each column in the input DataFrame.
     """
-    daily_std = returns.std()
-    return daily_std * np.sqrt(DEFAULT_DAYS_PER_YEAR)
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(returns.index)
+
+    periodic_std = returns.std()
+    return periodic_std * np.sqrt(periods_per_year)
+
+
+def get_periods_per_year(freq: str) -> int:
+    """
+    Returns the number of return periods per year of a frequency.
+
+    Parameters:
+        freq (str): One of PERIODS_PER_YEAR, e.g. "M" for monthly returns.
+
+    Raises:
+        ValueError: If the frequency is not supported.
+
+    Returns:
+        int: The number of periods per year.
+    """
+
+    if freq not in PERIODS_PER_YEAR:
+        raise ValueError(
+            f"Unsupported frequency: {freq}. Use one of {list(PERIODS_PER_YEAR)}."
+        )
+
+    return PERIODS_PER_YEAR[freq]
+
+
+def infer_freq(index: pd.Index) -> str:
+    """
+    Infers the frequency of returns from the median spacing of their dates, which is
+    robust to holidays and missing dates.
+
+    Parameters:
+        index (pd.Index): The dates of the returns.
+
+    Returns:
+        str: The closest of PERIODS_PER_YEAR, or "D" if the index has less than two
+            dates or is not a DatetimeIndex.
+    """
+
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return "D"
+
+    spacing = (index[1:] - index[:-1]).median() / pd.Timedelta(days=1)
+    if spacing <= 0:
+        return "D"
+
+    return min(_PERIOD_DAYS, key=lambda f: abs(np.log(spacing / _PERIOD_DAYS[f])))
+
+
+def infer_periods_per_year(index: pd.Index) -> int:
+    """
+    Infers the number of return periods per year from the dates of the returns.
+
+    Parameters:
+        index (pd.Index): The dates of the returns.
+
+    Returns:
+        int: The number of periods per year of the inferred frequency, see `infer_freq`.
+    """
+
+    return PERIODS_PER_YEAR[infer_freq(index)]
+
+
+def resample_returns(returns: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """
+    Compounds daily returns into returns of a lower frequency. Each period is labeled
+    by its last date, and periods without any return are dropped.
+
+    Parameters:
+        returns (pd.DataFrame): A DataFrame containing daily returns.
+        freq (str): One of PERIODS_PER_YEAR, e.g. "M" for monthly returns.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the compounded returns of each period.
+    """
+
+    get_periods_per_year(freq)
+    if freq == "D":
+        return returns
+
+    compounded = (1 + returns).resample(RESAMPLE_RULES[freq]).prod(min_count=1) - 1
+    return compounded.dropna(how="all")
+
+
+def convert_prices(
+    prices: pd.DataFrame, currencies: Dict[str, str], fx: pd.DataFrame, currency: str
+) -> pd.DataFrame:
+    """
+    Converts the prices of the assets to a single currency with one broadcast
+    multiplication. The exchange rates are aligned to the dates of the prices, using
+    the last rate known on each date, so that assets and exchange rates may follow
+    different trading calendars.
+
+    Parameters:
+        prices (pd.DataFrame): The prices, one column per asset.
+        currencies (Dict[str, str]): The currency of each asset, e.g. {"SAP": "EUR"}.
+            Assets that are not listed are in the target currency.
+        fx (pd.DataFrame): The exchange rates, one column per currency, with the value
+            of one unit of that currency in the target currency.
+        currency (str): The target currency.
+
+    Raises:
+        ValueError: If the exchange rate of a currency is missing.
+
+    Returns:
+        pd.DataFrame: The converted prices, on the dates where all are available.
+    """
+
+    codes = [currencies.get(asset, currency) for asset in prices.columns]
+
+    # Last known rate on each date of the prices, and a rate of one for the target
+    fx = (
+        fx.drop(columns=currency, errors="ignore")
+        .reindex(fx.index.union(prices.index))
+        .ffill()
+        .reindex(prices.index)
+        .assign(**{currency: 1.0})
+    )
+
+    positions = fx.columns.get_indexer(codes)
+    missing = sorted({code for code, i in zip(codes, positions) if i < 0})
+    if missing:
+        raise ValueError(f"No exchange rates found for: {missing}")
+
+    # Rate of each asset, gathered from the rate of its currency
+    rates = fx.to_numpy(dtype=np.float64)[:, positions]
+
+    converted = pd.DataFrame(
+        prices.to_numpy(dtype=np.float64) * rates,
+        index=prices.index,
+        columns=prices.columns,
+    )
+    return converted.dropna()
 
 
 def price_to_return(prices_df: pd.DataFrame, log_return: bool = False) -> pd.DataFrame:
@@ -215,6 +918,32 @@ def price_to_return(prices_df: pd.DataFrame, log_return: bool = False) -> pd.Dat
     return returns_df.dropna()
 
 
+def fingerprint(*items) -> str:
+    """
+    Calculates a content hash of DataFrames, Series and other objects, e.g. plot
+    parameters. Pandas objects are hashed by their values, index and names, and other
+    objects by their `repr`.
+
+    Parameters:
+        *items: The objects to hash.
+
+    Returns:
+        str: The hexadecimal content hash.
+    """
+
+    hash_object = hashlib.md5()
+
+    for item in items:
+        if isinstance(item, (pd.DataFrame, pd.Series)):
+            names = item.columns if isinstance(item, pd.DataFrame) else [item.name]
+            hash_object.update(repr(list(names)).encode("utf-8"))
+            hash_object.update(pd.util.hash_pandas_object(item).to_numpy().tobytes())
+        else:
+            hash_object.update(repr(item).encode("utf-8"))
+
+    return hash_object.hexdigest()
+
+
 def date_to_str(date: datetime.datetime) -> str:
     """
     Converts a datetime object to a string in the format "YYYY-MM-DD".
@@ -275,3 +1004,78 @@ def normalize_date(
         )
 
     return date_dt, date_str
+
+
+def write_frame(
+    df: Union[pd.DataFrame, pd.Series],
+    path: Path,
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+) -> Path:
+    """
+    Writes a DataFrame or Series to a file in the given format.
+
+    Parameters:
+        df (Union[pd.DataFrame, pd.Series]): The data to write.
+        path (Path): The file path without extension.
+        fmt (str, optional): One of DATA_FORMATS. Defaults to "csv".
+        compression (str, optional): Compression codec passed to pandas, e.g. "gzip" for CSV
+            or "zstd" for Parquet and Feather. Defaults to None, the format's default.
+
+    Raises:
+        ValueError: If the format is not supported.
+
+    Returns:
+        Path: The path of the written file.
+    """
+
+    if fmt not in DATA_FORMATS:
+        raise ValueError(f"Unsupported data format: {fmt}")
+
+    path = path.with_name(path.name + DATA_FORMATS[fmt])
+
+    if fmt == "csv":
+        path = path.with_name(path.name + CSV_COMPRESSION_SUFFIXES.get(compression, ""))
+        df.to_csv(path, compression=compression)
+        return path
+
+    # Binary columnar formats require a frame with string column names
+    if isinstance(df, pd.Series):
+        df = df.to_frame(name=path.stem)
+    df = df.rename(columns=str)
+
+    if fmt == "parquet":
+        df.to_parquet(path, compression=compression or "snappy")
+    else:
+        df.reset_index().to_feather(path, compression=compression)
+
+    return path
+
+
+def read_frame(path: Path, fmt: str = "csv") -> pd.DataFrame:
+    """
+    Reads a DataFrame written by `write_frame`.
+
+    Parameters:
+        path (Path): The file path, including extension.
+        fmt (str, optional): One of DATA_FORMATS. Defaults to "csv".
+
+    Raises:
+        ValueError: If the format is not supported.
+
+    Returns:
+        pd.DataFrame: The data read from the file.
+    """
+
+    if fmt == "csv":
+        return pd.read_csv(path, index_col=0, parse_dates=True)
+    elif fmt == "parquet":
+        return pd.read_parquet(path)
+    elif fmt == "feather":
+        df = pd.read_feather(path)
+        df = df.set_index(df.columns[0])
+        if df.index.name == "index":
+            df.index.name = None
+        return df
+    else:
+        raise ValueError(f"Unsupported data format: {fmt}")
@@ -39,8 +39,6 @@ def main():
     )
 
     # Save performance metrics and associated figures to the specified path
-    performance.save_figs(path)
-    performance.save_data(path)
     performance.save_results(path)
 
     # Print the performance summary
@@ -19,14 +19,18 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     install_requires=[
+        "pandas>=2.2",
         "seaborn",
         "yfinance>=0.2.49",
         "yfinance[nospam]>=0.2.49",
         "requests_cache",
-        "requests_ratelimiter",
+        "requests_ratelimiter<0.5",
+        "pyrate-limiter<3",
         "scipy",
+        "pyarrow",
     ],
     python_requires=">=3.10",
+    entry_points={"console_scripts": ["dafin=dafin.cli:main"]},
     extras_require={
         "dev": [
             "pre-commit",
@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from dafin import returns_data
+
+from .utils import synthetic_returns
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """Replaces the price downloads with synthetic prices, and records the calls."""
+
+    # Downloaded histories have no frequency, like those of yfinance
+    history = {
+        field: (1 + synthetic_returns(n_assets=3, n_days=100)).cumprod()
+        for field in ["Open", "Close"]
+    }
+    for df in history.values():
+        df.index = pd.DatetimeIndex(df.index, freq=None)
+    calls = []
+
+    def download_prices(assets, start=None):
+        calls.append((sorted(assets), start))
+        prices = {
+            asset: pd.DataFrame({field: df[asset] for field, df in history.items()})
+            for asset in assets
+        }
+        if start is not None:
+            prices = {k: v.loc[start:] for k, v in prices.items()}
+        return prices
+
+    def download_history(ticker, start=None):
+        return download_prices([ticker], start)[ticker]
+
+    monkeypatch.setattr(returns_data, "download_prices", download_prices)
+    monkeypatch.setattr(returns_data, "download_history", download_history)
+    return calls
@@ -0,0 +1,64 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dafin import Performance, summary_chunked
+from dafin.chunked import write_memmap
+
+from .utils import synthetic_returns
+
+
+@pytest.fixture
+def returns():
+
+    returns = synthetic_returns(n_assets=7)
+    returns_rf = 0.01 * synthetic_returns(n_assets=1, seed=1, prefix="RF")
+    returns_benchmark = synthetic_returns(n_assets=1, seed=2, prefix="B")
+    return returns, returns_rf, returns_benchmark
+
+
+@pytest.mark.parametrize("source", ["frame", "parquet", "npy"])
+def test_summary_chunked(tmp_path, returns, source):
+
+    returns, returns_rf, returns_benchmark = returns
+
+    if source == "parquet":
+        path = tmp_path / "returns.parquet"
+        returns.to_parquet(path)
+    elif source == "npy":
+        path = write_memmap(returns, tmp_path / "returns")
+    else:
+        path = returns
+
+    summary = summary_chunked(path, returns_rf, returns_benchmark, block_size=3)
+    expected = Performance(returns, returns_rf, returns_benchmark).summary
+
+    pd.testing.assert_frame_equal(summary, expected.astype(float), check_exact=False)
+
+
+def test_summary_chunked_defaults(returns):
+
+    returns, _, _ = returns
+
+    summary = summary_chunked(returns, block_size=2)
+    expected = Performance(returns).summary
+
+    assert summary.index.tolist() == returns.columns.tolist()
+    np.testing.assert_allclose(summary["Sharpe Ratio"], expected["Sharpe Ratio"])
+
+
+def test_summary_chunked_memory(tmp_path):
+
+    returns = synthetic_returns(n_assets=2000, n_days=250)
+    path = write_memmap(returns, tmp_path / "returns")
+    size = returns.memory_usage().sum()
+    del returns
+
+    tracemalloc.start()
+    summary_chunked(path, block_size=100)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < size / 2
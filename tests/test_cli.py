@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from dafin import cli, instrument
+
+
+@pytest.fixture
+def path_jobs(tmp_path):
+
+    path = tmp_path / "jobs.json"
+    jobs = {
+        "defaults": {"benchmark": "A2"},
+        "jobs": [
+            {
+                "name": "first",
+                "assets": ["A0", "A1"],
+                "rf": "A2",
+                "windows": [["2015-01-01", "2015-03-01"], ["2015-03-01", None]],
+            },
+            {"name": "second", "assets": ["A1"]},
+        ],
+    }
+    path.write_text(json.dumps(jobs))
+    return path
+
+
+def test_read_jobs(path_jobs):
+
+    jobs = cli.read_jobs(path_jobs)
+
+    assert [job["name"] for job in jobs] == [
+        "first_2015-01-01_2015-03-01",
+        "first_2015-03-01_None",
+        "second",
+    ]
+    assert jobs[2]["benchmark"] == ["A2"]
+    assert jobs[2]["rf"] is None
+
+
+def test_read_jobs_duplicate_names(tmp_path):
+
+    path = tmp_path / "jobs.json"
+    jobs = [{"name": "tech", "assets": ["A0"]}, {"name": "tech", "assets": ["A1"]}]
+    path.write_text(json.dumps({"jobs": jobs}))
+
+    with pytest.raises(ValueError, match="tech"):
+        cli.read_jobs(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run(tmp_path, path_jobs, downloads, workers):
+
+    path = tmp_path / "out"
+
+    result = cli.run(path_jobs, path, workers=workers, price_cache=False)
+
+    # The panels of A0 and A1 and of A2 are loaded once, each asset downloaded once
+    assert sorted(downloads) == [(["A0"], None), (["A1"], None), (["A2"], None)]
+    assert len(result["summaries"]) == 3
+    assert result["stats"]["hits"] == 0
+    assert {"load", "evaluate", "beta", "save_figs.corr"} <= set(result["timings"])
+    assert (path / "summary.csv").exists()
+
+    result = cli.run(path_jobs, path, workers=workers, price_cache=False)
+    assert result["stats"]["misses"] == 0
+    assert "save_figs.corr" not in result["timings"]
+    assert not instrument.is_enabled()
+    assert "evaluate" in cli.format_timings(result["timings"])
@@ -0,0 +1,46 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dafin import CompactPerformance, Performance
+
+from .utils import synthetic_returns
+
+
+def test_compact():
+
+    returns = synthetic_returns(n_assets=20, n_days=500)
+    benchmark = synthetic_returns(n_assets=1, n_days=500, seed=1, prefix="B")
+    performance = Performance(returns, returns_benchmark=benchmark)
+
+    compact = performance.compact()
+
+    pd.testing.assert_frame_equal(compact.summary, performance.summary.astype(float))
+    pd.testing.assert_series_equal(
+        compact["Sharpe Ratio"], performance.summary["Sharpe Ratio"].astype(float)
+    )
+    assert compact.asset_benchmark == "B0"
+    assert compact.periods_per_year == performance.periods_per_year
+    assert not hasattr(compact, "__dict__")
+    assert compact.nbytes < performance.nbytes / 20
+    assert str(compact)
+
+    restored = pickle.loads(pickle.dumps(compact))
+    np.testing.assert_array_equal(restored.values, compact.values)
+    assert restored.assets == compact.assets
+
+    with pytest.raises(KeyError):
+        compact["Sortino Ratio"]
+
+    with pytest.raises(ValueError):
+        CompactPerformance(np.zeros((2, 3)), ["A", "B"], ["X"], "RF", "B0", "", "", 252)
+
+
+def test_default_benchmark_shared():
+
+    performance = Performance(synthetic_returns())
+
+    assert performance.returns_benchmark is performance.returns_rf
+    assert performance.nbytes > 0
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dafin import Performance, ReturnsData
+from dafin.utils import infer_freq, infer_periods_per_year, resample_returns
+
+from .utils import synthetic_returns
+
+
+@pytest.mark.parametrize(
+    "rule,freq", [("B", "D"), ("W-FRI", "W"), ("ME", "M"), ("QE", "Q"), ("YE", "Y")]
+)
+def test_infer_freq(rule, freq):
+
+    index = pd.date_range("2015-01-01", periods=30, freq=rule)
+
+    assert infer_freq(index) == freq
+    assert infer_freq(index.delete([3, 7, 11])) == freq
+
+
+def test_resample_returns():
+
+    returns = synthetic_returns(n_days=500)
+
+    for freq, periods_per_year in [("W", 52), ("M", 12), ("Q", 4)]:
+        resampled = resample_returns(returns, freq)
+        np.testing.assert_allclose((1 + resampled).prod(), (1 + returns).prod())
+        assert infer_periods_per_year(resampled.index) == periods_per_year
+
+
+def test_performance_freq():
+
+    returns = synthetic_returns(n_days=500)
+    returns_benchmark = synthetic_returns(n_assets=1, n_days=500, seed=1, prefix="B")
+
+    monthly = Performance(returns, returns_benchmark=returns_benchmark, freq="M")
+    inferred = Performance(
+        resample_returns(returns, "M"),
+        returns_benchmark=resample_returns(returns_benchmark, "M"),
+    )
+
+    assert monthly.periods_per_year == inferred.periods_per_year == 12
+    pd.testing.assert_frame_equal(monthly.summary, inferred.summary)
+    pd.testing.assert_series_equal(
+        monthly.returns_total, Performance(returns).returns_total
+    )
+
+
+def test_returns_data_freq(downloads):
+
+    returns_data = ReturnsData(["A0", "A1"], cache=False)
+
+    monthly = returns_data.get_returns(freq="M")
+    assert returns_data.get_returns(freq="M") is monthly
+    assert len(monthly) == 5
+
+    window = returns_data.get_returns("2015-02-01", "2015-03-31", freq="M")
+    np.testing.assert_allclose(
+        (1 + window).prod(),
+        (1 + returns_data.get_returns("2015-02-01", "2015-03-31")).prod(),
+    )
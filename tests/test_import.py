@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+from benchmarks.import_time import LAZY_MODULES
+
+
+def test_import_is_lazy(tmp_path):
+
+    code = (
+        "import sys, dafin, dafin.utils; "
+        f"print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=tmp_path,
+    )
+
+    assert result.stdout.strip() == "[]"
+    assert not list(tmp_path.iterdir())
+
+
+def test_star_import_exports_lazy_names():
+
+    namespace = {}
+    exec("from dafin import *", namespace)
+
+    assert {"Performance", "ReturnsData", "Plot", "label_offsets"} <= set(namespace)
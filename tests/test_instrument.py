@@ -0,0 +1,45 @@
+from dafin import Performance, ReturnsData, instrument
+from dafin.price_cache import PriceCache
+
+from .utils import synthetic_returns
+
+
+def test_instrumentation_disabled():
+
+    performance = Performance(synthetic_returns())
+    performance.summary
+
+    assert performance.timings == {}
+    assert performance.memory == {}
+
+
+def test_instrumentation_listener(tmp_path):
+
+    events = []
+    instrument.add_listener(events.append)
+    instrument.enable(memory=True)
+    try:
+        performance = Performance(synthetic_returns())
+        performance.summary
+        performance.save_data(tmp_path)
+    finally:
+        instrument.remove_listener(events.append)
+        instrument.disable()
+
+    stages = [event["stage"] for event in events]
+    assert {"cov", "beta", "regression", "summary", "save_data.returns"} <= set(stages)
+    assert set(performance.timings) == set(stages)
+    assert all(event["owner"] == "Performance" for event in events)
+    assert performance.memory["cov"] > 0
+
+
+def test_instrumentation_returns_data(tmp_path, downloads):
+
+    instrument.enable()
+    try:
+        returns_data = ReturnsData(["A0"], cache=PriceCache(tmp_path / "prices.sqlite"))
+        returns_data.get_returns("2015-02-01", "2015-03-01")
+    finally:
+        instrument.disable()
+
+    assert set(returns_data.timings) == {"download", "price_to_return", "get_returns"}
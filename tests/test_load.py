@@ -0,0 +1,138 @@
+import asyncio
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dafin import ReturnsData, returns_data
+
+
+@pytest.fixture
+def slow_downloads(monkeypatch, downloads):
+    """Delays the per-asset downloads, and tracks how many run at once."""
+
+    download_history = returns_data.download_history
+    state = {"running": 0, "max_running": 0}
+    lock = threading.Lock()
+
+    def slow_download_history(ticker, start=None):
+        with lock:
+            state["running"] += 1
+            state["max_running"] = max(state["max_running"], state["running"])
+        time.sleep(0.1)
+        with lock:
+            state["running"] -= 1
+        return download_history(ticker, start)
+
+    monkeypatch.setattr(returns_data, "download_history", slow_download_history)
+    return downloads, state
+
+
+def test_load_shared_downloads(slow_downloads):
+
+    downloads, state = slow_downloads
+
+    async def main():
+        return await asyncio.gather(
+            ReturnsData.load(["A0", "A1"], cache=False),
+            ReturnsData.load(["A1", "A2"], cache=False),
+        )
+
+    first, second = asyncio.run(main())
+
+    assert sorted(downloads) == [(["A0"], None), (["A1"], None), (["A2"], None)]
+    assert list(second.prices.columns) == ["A1", "A2"]
+    pd.testing.assert_frame_equal(
+        first.get_returns(), ReturnsData(["A0", "A1"], cache=False).get_returns()
+    )
+    assert not returns_data._IN_FLIGHT
+
+
+def test_load_concurrency(slow_downloads):
+
+    _, state = slow_downloads
+
+    asyncio.run(ReturnsData.load(["A0", "A1", "A2"], cache=False, concurrency=2))
+
+    assert state["max_running"] == 2
+
+
+def test_load_shared_concurrency(slow_downloads, monkeypatch):
+
+    _, state = slow_downloads
+    monkeypatch.setattr(returns_data, "DEFAULT_CONCURRENCY", 2)
+
+    async def main():
+        await asyncio.gather(
+            ReturnsData.load(["A0", "A1"], cache=False),
+            ReturnsData.load(["A2"], cache=False),
+        )
+
+    asyncio.run(main())
+
+    assert state["max_running"] == 2
+
+
+def test_download_adjusted_prices(monkeypatch):
+
+    dates = pd.bdate_range("2020-01-01", periods=5, name="Date")
+    close = np.array([10.0, 11.0, 12.0, 11.5, 12.5])
+    adjust = np.array([0.9, 0.9, 1.0, 1.0, 1.0])
+
+    def prices(auto_adjust):
+        fields = {"Open": close - 0.5, "High": close + 1, "Low": close - 1}
+        fields["Close"] = close
+        if auto_adjust:
+            fields = {k: v * adjust for k, v in fields.items()}
+        else:
+            fields["Adj Close"] = close * adjust
+        fields["Volume"] = np.full(len(close), 1000.0)
+        return pd.DataFrame(fields, index=dates)
+
+    def download(tickers, auto_adjust=None, **kwargs):
+        return pd.concat(
+            {ticker: prices(auto_adjust) for ticker in tickers},
+            axis=1,
+            names=["Ticker", "Price"],
+        ).swaplevel(axis=1)
+
+    class Ticker:
+        def __init__(self, ticker, session=None):
+            pass
+
+        def history(self, auto_adjust=True, **kwargs):
+            history = prices(auto_adjust).assign(Dividends=0.0)
+            return history.tz_localize("America/New_York")
+
+    yfinance = types.ModuleType("yfinance")
+    yfinance.download, yfinance.Ticker = download, Ticker
+    monkeypatch.setitem(sys.modules, "yfinance", yfinance)
+    monkeypatch.setattr(returns_data, "_SESSION", object())
+
+    pd.testing.assert_frame_equal(
+        returns_data.download_prices(["A0", "A1"])["A1"],
+        returns_data.download_history("A1"),
+        check_freq=False,
+    )
+
+
+def test_load_timeout(slow_downloads):
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(ReturnsData.load(["A0"], cache=False, timeout=0.01))
+
+
+def test_load_cancel(slow_downloads):
+
+    async def main():
+        task = asyncio.create_task(ReturnsData.load(["A0", "A1"], cache=False))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
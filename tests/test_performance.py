@@ -1,3 +1,4 @@
+import pickle
 from pathlib import Path
 
 import pandas as pd
@@ -5,7 +6,12 @@ import pytest
 
 from dafin import Performance, ReturnsData
 
-from .utils import assert_returns, params_performance, pnames_performance
+from .utils import (
+    assert_returns,
+    params_performance,
+    pnames_performance,
+    synthetic_returns,
+)
 
 
 @pytest.mark.parametrize(pnames_performance, params_performance)
@@ -32,3 +38,106 @@ def test_use_case_performance(assets, asset_single):
     assert (performance.summary["Alpha"], pd.DataFrame)
     performance.plot_returns(yscale="symlog")
     print(performance)
+
+
+@pytest.mark.parametrize(
+    "data_format,compression",
+    [("csv", "gzip"), ("parquet", "zstd"), ("feather", "zstd"), ("bundle", "zstd")],
+)
+def test_save_data_formats(tmp_path, data_format, compression):
+
+    returns = synthetic_returns()
+    performance = Performance(
+        returns_assets=returns,
+        returns_benchmark=returns.iloc[:, :1].rename(columns=lambda c: "Benchmark"),
+    )
+    performance.save_data(tmp_path, data_format=data_format, compression=compression)
+
+    if data_format != "bundle":
+        assert len(list(tmp_path.glob("*_data_*"))) == 6
+        return
+
+    restored = Performance.load_data(tmp_path)
+    pd.testing.assert_frame_equal(
+        restored.summary, performance.summary, check_dtype=False
+    )
+    pd.testing.assert_frame_equal(restored.cov, performance.cov)
+    assert restored.asset_benchmark == "Benchmark"
+
+
+def test_save_results_cache(tmp_path):
+
+    returns = synthetic_returns(n_assets=3, n_days=50)
+
+    stats = Performance(returns).save_results(tmp_path, cache=True)
+    assert stats == {"hits": 0, "misses": 13}
+
+    stats = Performance(returns.copy()).save_results(tmp_path, cache=True)
+    assert stats == {"hits": 13, "misses": 0}
+
+    (tmp_path / "experiment_plot_corr.png").unlink()
+    stats = Performance(returns).save_figs(tmp_path, cache=True)
+    assert stats == {"hits": 6, "misses": 1}
+
+    stats = Performance(returns).save_figs(
+        tmp_path, cache=True, plot_kwargs={"cov": {"cluster": True}}
+    )
+    assert stats == {"hits": 6, "misses": 1}
+
+    stats = Performance(returns * 2).save_figs(tmp_path, cache=True)
+    assert stats == {"hits": 0, "misses": 7}
+
+    assert Performance(returns).save_results(tmp_path) == {"hits": 0, "misses": 0}
+
+
+def test_add_drop_assets():
+
+    returns = synthetic_returns(n_assets=6)
+    returns_benchmark = synthetic_returns(n_assets=1, seed=1, prefix="B")
+    expected = Performance(returns, returns_benchmark=returns_benchmark)
+
+    performance = pickle.loads(
+        pickle.dumps(
+            Performance(returns.iloc[:, :4], returns_benchmark=returns_benchmark)
+        )
+    )
+    performance.add_assets(returns.iloc[:, 4:])
+
+    assert performance.assets == expected.assets
+    for name in ["cov", "corr", "mean_sd", "summary"]:
+        pd.testing.assert_frame_equal(
+            getattr(performance, name).astype(float),
+            getattr(expected, name).astype(float),
+        )
+
+    performance.drop_assets(["A1", "A4"])
+    expected = Performance(
+        returns.drop(columns=["A1", "A4"]), returns_benchmark=returns_benchmark
+    )
+    for name in ["cov", "corr", "summary"]:
+        pd.testing.assert_frame_equal(
+            getattr(performance, name).astype(float),
+            getattr(expected, name).astype(float),
+        )
+
+    with pytest.raises(ValueError):
+        performance.add_assets(returns[["A0"]])
+    with pytest.raises(ValueError):
+        performance.drop_assets(["A1"])
+
+
+def test_add_assets_ragged():
+
+    returns = synthetic_returns(n_assets=5)
+    returns.iloc[:40, 1] = float("nan")
+    added = returns.iloc[60:, 3:]
+    expected = Performance(pd.concat([returns.iloc[:, :3], added], axis=1))
+
+    performance = Performance(returns.iloc[:, :3])
+    performance.add_assets(added)
+
+    for name in ["cov", "corr"]:
+        pd.testing.assert_frame_equal(
+            getattr(performance, name).astype(float),
+            getattr(expected, name).astype(float),
+        )
@@ -0,0 +1,58 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from dafin import Performance
+from dafin.plot import (
+    DEFAULT_HEATMAP_MAX_ANNOTATE,
+    DEFAULT_HEATMAP_MAX_ASSETS,
+    DEFAULT_SCATTER_MAX_LABELS,
+    Plot,
+)
+
+from .utils import synthetic_returns
+
+
+@pytest.mark.parametrize("n_assets", [4, DEFAULT_HEATMAP_MAX_ASSETS + 10])
+def test_plot_heatmap(n_assets):
+
+    performance = Performance(synthetic_returns(n_assets=n_assets))
+
+    for cluster in [False, True]:
+        fig, ax = performance.plot_corr(cluster=cluster)
+        if n_assets > DEFAULT_HEATMAP_MAX_ANNOTATE:
+            assert not ax.texts
+        plt.close(fig)
+
+    assert sorted(performance.cluster_order) == list(range(n_assets))
+    assert performance.cluster_order is performance.cluster_order
+
+
+def test_plot_scatter_labels():
+
+    performance = Performance(
+        synthetic_returns(n_assets=DEFAULT_SCATTER_MAX_LABELS * 4)
+    )
+
+    positions = []
+    for _ in range(2):
+        fig, ax = performance.plot_mean_sd()
+        assert len(ax.texts) == DEFAULT_SCATTER_MAX_LABELS
+        positions.append([text.get_position() for text in ax.texts])
+        plt.close(fig)
+
+    assert positions[0] == positions[1]
+
+
+def test_plot_scatter_undefined_points():
+
+    df = pd.DataFrame(
+        {"sd": [0.1, 0.2, 0.3, 0.4], "mean": [0.05, np.nan, 0.02, 0.08]},
+        index=["A", "B", "C", "D"],
+    )
+
+    for max_labels, expected in [(0, []), (2, ["A", "D"]), (10, ["A", "C", "D"])]:
+        fig, ax = Plot().plot_scatter(df, max_labels=max_labels)
+        assert [text.get_text() for text in ax.texts] == expected
+        plt.close(fig)
@@ -0,0 +1,132 @@
+import datetime
+import pickle
+import threading
+
+import pandas as pd
+import pytest
+
+from dafin import ReturnsData, price_cache, returns_data
+from dafin.price_cache import PriceCache
+
+from .utils import synthetic_returns
+
+
+def test_price_cache_hits(tmp_path, downloads):
+
+    cache = PriceCache(tmp_path / "prices.sqlite")
+
+    first = ReturnsData(["A0", "A1"], cache=cache)
+    second = ReturnsData(["A1", "A2"], col_price="Open", cache=cache)
+
+    assert downloads == [(["A0", "A1"], None), (["A2"], None)]
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 3
+    assert cache.stats["entries"] == 3
+    assert list(second.prices.columns) == ["A1", "A2"]
+    pd.testing.assert_frame_equal(
+        first.get_returns(), ReturnsData(["A0", "A1"], cache=cache).get_returns()
+    )
+
+
+def test_price_cache_refresh(tmp_path, downloads):
+
+    cache = PriceCache(tmp_path / "prices.sqlite", ttl_recent=datetime.timedelta(0))
+
+    first = ReturnsData(["A0"], cache=cache)
+    second = ReturnsData(["A0"], cache=cache)
+
+    assert downloads[1][1] is not None
+    assert cache.stats["refreshes"] == 1
+    pd.testing.assert_frame_equal(first.prices, second.prices)
+
+
+def test_price_cache_failed_downloads(tmp_path, downloads, monkeypatch):
+
+    download_prices = returns_data.download_prices
+    failed = {"A1"}
+
+    def failing_download_prices(assets, start=None):
+        prices = download_prices(assets, start)
+        return {k: v.iloc[:0] if k in failed else v for k, v in prices.items()}
+
+    monkeypatch.setattr(returns_data, "download_prices", failing_download_prices)
+    cache = PriceCache(tmp_path / "prices.sqlite", ttl_recent=datetime.timedelta(0))
+
+    with pytest.raises(ValueError, match="A1"):
+        ReturnsData(["A0", "A1"], cache=cache)
+    assert cache.stats["entries"] == 1
+
+    failed.clear()
+    first = ReturnsData(["A1"], cache=cache)
+
+    # A failed refresh keeps the expired history as it is
+    failed.add("A1")
+    second = ReturnsData(["A1"], cache=cache)
+
+    pd.testing.assert_frame_equal(second.prices, first.prices)
+    assert len(cache.get("A1")[0]) == len(first.prices)
+
+
+def test_price_cache_eviction(tmp_path, downloads):
+
+    cache = PriceCache(tmp_path / "prices.sqlite")
+    ReturnsData(["A0"], cache=cache)
+    cache.max_bytes = cache.size_bytes
+
+    ReturnsData(["A1"], cache=cache)
+    cache.compact()
+
+    assert cache.stats["evictions"] == 1
+    assert cache.stats["entries"] == 1
+    assert cache.get("A0") == (None, False)
+
+
+def test_price_cache_threads(tmp_path):
+
+    cache = PriceCache(tmp_path / "prices.sqlite", touch_batch=8)
+    prices = (1 + synthetic_returns(n_assets=2, n_days=50)).cumprod()
+    errors = []
+
+    def worker(i):
+        try:
+            cache.put_many({f"U{i}": prices, f"T{i % 10}": prices})
+            for j in range(50):
+                ticker = f"T{(i + j) % 10}"
+                if cache.get(ticker)[0] is None:
+                    cache.put(ticker, prices)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.close()
+
+    assert not errors
+    stats = PriceCache(tmp_path / "prices.sqlite").stats
+    assert stats["entries"] == 26
+    assert cache.hits + cache.misses == 16 * 50
+
+
+def test_price_cache_format(tmp_path, monkeypatch):
+
+    cache = PriceCache(tmp_path / "prices.sqlite")
+    prices = (1 + synthetic_returns(n_assets=2, n_days=50)).cumprod()
+    cache.put("A0", prices)
+
+    restored, fresh = cache.get("A0")
+    pd.testing.assert_frame_equal(restored, prices, check_freq=False)
+    assert fresh
+
+    # Histories that are not Parquet, e.g. pickles, are never loaded
+    with cache._connection as connection:
+        connection.execute(
+            "UPDATE prices SET data = ? WHERE ticker = ?", (pickle.dumps(prices), "A0")
+        )
+    assert cache.get("A0") == (None, False)
+
+    monkeypatch.setenv("DAFIN_CACHE_DIR", str(tmp_path / "cache"))
+    assert price_cache.DEFAULT_CACHE_DIR == tmp_path / "cache"
+    assert PriceCache().path == tmp_path / "cache" / "prices.sqlite"
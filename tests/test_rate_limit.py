@@ -0,0 +1,80 @@
+import multiprocessing
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from dafin.returns_data import configure_session
+
+RATE_LIMIT = (5, 1)
+N_WORKERS = 3
+N_REQUESTS = 5
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((time.time(), self.path))
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local stand-in for the price server, recording the time of each request."""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+
+def fetch(url, path_limiter, barrier):
+    session = configure_session(
+        rate_limit=RATE_LIMIT, shared=True, path_limiter=path_limiter, cache=False
+    )
+    barrier.wait()
+    for _ in range(N_REQUESTS):
+        session.get(url).raise_for_status()
+
+
+def test_shared_rate_limit(tmp_path, server):
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(N_WORKERS)
+    workers = [
+        context.Process(
+            target=fetch,
+            args=(
+                f"http://127.0.0.1:{server.server_port}/worker{i}",
+                tmp_path / "ratelimit.sqlite",
+                barrier,
+            ),
+        )
+        for i in range(N_WORKERS)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    times = np.sort([t for t, _ in server.requests])
+    paths = [p for _, p in server.requests]
+    n_limit, seconds = RATE_LIMIT
+
+    # Throughput: every request is served, and never more than the limit per window
+    assert len(times) == N_WORKERS * N_REQUESTS
+    in_window = np.searchsorted(times, times + seconds * 0.95) - np.arange(len(times))
+    assert in_window.max() <= n_limit
+    assert times[-1] - times[0] >= (len(times) // n_limit - 1) * seconds * 0.95
+
+    # Fairness: every worker is served within the first half of the requests
+    assert len(set(paths[: len(paths) // 2 + 1])) == N_WORKERS
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from dafin import Performance, summary_chunked
+from dafin.utils import RELATIVE_COLUMNS, calculate_relative_metrics
+
+from .utils import synthetic_returns
+
+
+def expected_metrics(asset, benchmark, periods_per_year=252):
+
+    data = pd.concat([asset, benchmark], axis=1).dropna()
+    x, y = data.iloc[:, 0], data.iloc[:, 1]
+    active = x - y
+    tracking_error = active.std() * np.sqrt(periods_per_year)
+
+    def annualized(r):
+        return (1 + r).prod() ** (periods_per_year / len(r)) - 1
+
+    return [
+        tracking_error,
+        active.mean() * periods_per_year / tracking_error,
+        annualized(x[y > 0]) / annualized(y[y > 0]),
+        annualized(x[y < 0]) / annualized(y[y < 0]),
+    ]
+
+
+def test_relative_metrics():
+
+    returns = synthetic_returns(n_assets=6, n_days=400)
+    returns.iloc[20:40, 3] = np.nan
+    benchmark = synthetic_returns(n_assets=1, n_days=420, seed=1, prefix="B")
+
+    metrics = calculate_relative_metrics(returns, benchmark)
+
+    assert metrics.columns.tolist() == RELATIVE_COLUMNS
+    for asset in returns:
+        np.testing.assert_allclose(
+            metrics.loc[asset], expected_metrics(returns[asset], benchmark["B0"])
+        )
+
+    # The benchmark itself has no active returns and captures all its moves
+    itself = calculate_relative_metrics(benchmark, benchmark)
+    np.testing.assert_allclose(itself.iloc[0, [0, 2, 3]], [0, 1, 1], atol=1e-12)
+
+
+def test_performance_relative_metrics():
+
+    returns = synthetic_returns(n_assets=6, n_days=400)
+    benchmark = synthetic_returns(n_assets=1, n_days=400, seed=1, prefix="B")
+
+    performance = Performance(returns, returns_benchmark=benchmark)
+    summary = performance.summary
+
+    pd.testing.assert_frame_equal(
+        summary[RELATIVE_COLUMNS].astype(float),
+        calculate_relative_metrics(returns, benchmark),
+    )
+    pd.testing.assert_frame_equal(
+        summary_chunked(returns, returns_benchmark=benchmark, block_size=4)[
+            RELATIVE_COLUMNS
+        ],
+        summary[RELATIVE_COLUMNS].astype(float),
+    )
+
+    # Without a benchmark, the periods of rising and falling benchmark are missing
+    assert Performance(returns).summary["Up Capture"].isna().all()
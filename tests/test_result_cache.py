@@ -0,0 +1,94 @@
+import pandas as pd
+
+from dafin import ReturnsData
+from dafin.result_cache import ResultCache
+
+from .utils import synthetic_returns
+
+
+def returns_data(seed=0, n_assets=3, prefix="A"):
+
+    prices = (
+        1 + synthetic_returns(n_assets=n_assets, seed=seed, prefix=prefix)
+    ).cumprod()
+    return ReturnsData.from_prices(prices)
+
+
+def test_result_cache_hits():
+
+    cache = ResultCache()
+    assets, benchmark = returns_data(), returns_data(seed=1, n_assets=1, prefix="B")
+
+    first = cache.performance(assets, None, benchmark, "2015-02-01", "2015-06-30")
+    second = cache.performance(assets, None, benchmark, "2015-02-01", "2015-06-30")
+    cache.summary(assets, None, benchmark, "2015-02-01", "2015-07-31")
+    cache.summary(returns_data(), None, benchmark, "2015-02-01", "2015-06-30")
+    cache.summary(returns_data(seed=2), None, benchmark, "2015-02-01", "2015-06-30")
+
+    assert second is first
+    assert cache.stats["hits"] == 2
+    assert cache.stats["misses"] == 3
+    assert first.date_end_str == "2015-06-30"
+
+
+def test_result_cache_window_key():
+
+    cache = ResultCache()
+    assets = returns_data()
+    index = assets.returns.index
+
+    cache.summary(assets)
+    cache.summary(assets, None, None, str(index[0].date()), str(index[-1].date()))
+    cache.summary(assets, date_start="2000-01-01")
+
+    assert cache.stats["hits"] == 2
+    assert cache.stats["misses"] == 1
+
+
+def test_result_cache_eviction():
+
+    assets = returns_data()
+    nbytes = ResultCache().performance(assets).nbytes
+    cache = ResultCache(max_bytes=int(2.5 * nbytes))
+
+    for date_end in ["2015-10-30", "2015-11-30", "2015-12-31"]:
+        cache.summary(assets, date_end=date_end)
+    cache.summary(assets, date_end="2015-10-30")
+
+    assert cache.stats["entries"] == 2
+    assert cache.stats["evictions"] == 2
+    assert cache.stats["hits"] == 0
+    assert cache.size_bytes <= cache.max_bytes
+
+
+def test_result_cache_persistence(tmp_path):
+
+    assets = returns_data()
+    summary = ResultCache(path=tmp_path).summary(assets, freq="W")
+
+    cache = ResultCache(path=tmp_path)
+    restored = cache.summary(returns_data(), freq="W")
+
+    assert cache.stats["disk_hits"] == 1
+    assert cache.stats["misses"] == 0
+    pd.testing.assert_frame_equal(restored.astype(float), summary.astype(float))
+
+    cache.clear()
+    assert not list(tmp_path.glob("*.zip"))
+
+
+def test_result_cache_disk_eviction(tmp_path):
+
+    assets = returns_data()
+    cache = ResultCache(path=tmp_path)
+    cache.summary(assets, date_end="2015-10-30")
+    nbytes = cache.disk_size_bytes
+
+    cache = ResultCache(path=tmp_path, max_disk_bytes=int(2.5 * nbytes))
+    for date_end in ["2015-11-30", "2015-12-31"]:
+        cache.summary(assets, date_end=date_end)
+
+    assert cache.stats["disk_evictions"] == 1
+    assert cache.stats["disk_entries"] == 2
+    assert len(list(tmp_path.glob("*_data.zip"))) == 2
+    assert cache.disk_size_bytes <= cache.max_disk_bytes
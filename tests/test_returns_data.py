@@ -1,8 +1,12 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
 import pytest
 
-from dafin import ReturnsData
+from dafin import ReturnsData, returns_data
 
-from .utils import assert_returns, params_returns, pnames_returns
+from .utils import assert_returns, params_returns, pnames_returns, synthetic_returns
 
 
 @pytest.mark.parametrize(pnames_returns, params_returns)
@@ -22,3 +26,79 @@ def test_use_case_returns_data(assets, date_start, date_end, col_price):
 
         assert str(returns_data)
         assert hash(returns_data)
+
+
+def synthetic_fx():
+
+    # Exchange rates trade every day, and miss some of the trading days of the assets
+    index = pd.date_range("2014-12-29", "2016-03-01", freq="D", tz="UTC")
+    index = index[index.day != 15]
+    rng = np.random.default_rng(1)
+    data = np.exp(np.cumsum(rng.normal(0, 0.005, size=(len(index), 2)), axis=0))
+    return pd.DataFrame(data=data, index=index, columns=["EUR", "JPY"])
+
+
+def test_convert_currency():
+
+    prices = (1 + synthetic_returns(n_assets=4, n_days=250)).cumprod()
+    currencies = {"A0": "EUR", "A1": "JPY", "A2": "EUR"}
+    fx = synthetic_fx()
+
+    data = ReturnsData.from_prices(prices, currencies=currencies, currency="USD", fx=fx)
+
+    expected = prices.copy()
+    for asset, currency in currencies.items():
+        expected[asset] = prices[asset] * fx[currency].asof(prices.index).to_numpy()
+
+    pd.testing.assert_frame_equal(data.prices, expected)
+    assert data.fx_currencies == ["EUR", "JPY"]
+
+    with pytest.raises(ValueError):
+        ReturnsData.from_prices(prices, currencies={"A0": "GBP"}, currency="USD", fx=fx)
+
+    with pytest.raises(ValueError):
+        ReturnsData.from_prices(prices, currencies=currencies)
+
+
+def test_convert_currency_download(monkeypatch):
+
+    prices = (1 + synthetic_returns(n_assets=3, n_days=250)).cumprod()
+    fx = synthetic_fx()
+    histories = {
+        **{asset: prices[[asset]].set_axis(["Close"], axis=1) for asset in prices},
+        "EURUSD=X": fx[["EUR"]].set_axis(["Close"], axis=1),
+    }
+    calls = []
+
+    def download_prices(assets, start=None):
+        calls.append(sorted(assets))
+        return {asset: histories[asset] for asset in assets}
+
+    monkeypatch.setattr(returns_data, "download_prices", download_prices)
+    monkeypatch.setattr(
+        returns_data, "download_history", lambda ticker, start=None: histories[ticker]
+    )
+
+    data = ReturnsData(
+        ["A0", "A1", "A2"],
+        cache=False,
+        currencies={"A0": "EUR", "A1": "EUR"},
+        currency="USD",
+    )
+
+    # The exchange rate is downloaded once for both assets
+    assert calls == [["A0", "A1", "A2"], ["EURUSD=X"]]
+    pd.testing.assert_series_equal(
+        data.prices["A1"], prices["A1"] * fx["EUR"].asof(prices.index).to_numpy()
+    )
+    pd.testing.assert_series_equal(data.prices["A2"], prices["A2"])
+
+    loaded = asyncio.run(
+        ReturnsData.load(
+            ["A0", "A1", "A2"],
+            cache=False,
+            currencies={"A0": "EUR", "A1": "EUR"},
+            currency="USD",
+        )
+    )
+    pd.testing.assert_frame_equal(loaded.prices, data.prices)
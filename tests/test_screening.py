@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from dafin import Performance, screen
+from dafin.screening import SCREEN_METRICS, rolling_windows, screen_metric, top_k
+
+from .utils import synthetic_returns
+
+
+@pytest.fixture
+def returns():
+
+    returns = synthetic_returns(n_assets=20, n_days=400)
+    returns_rf = 0.01 * synthetic_returns(n_assets=1, n_days=400, seed=1, prefix="RF")
+    returns_benchmark = synthetic_returns(n_assets=1, n_days=400, seed=2, prefix="B")
+    return returns, returns_rf, returns_benchmark
+
+
+@pytest.mark.parametrize("metric", SCREEN_METRICS)
+def test_screen_metric(returns, metric):
+
+    returns, returns_rf, returns_benchmark = returns
+
+    values, windows, assets = screen_metric(
+        returns, metric, "Q", returns_rf, returns_benchmark
+    )
+
+    assert values.shape == (len(windows), len(assets))
+    for row, (start, end) in zip(values, windows):
+        summary = Performance(
+            returns.loc[start:end],
+            returns_rf.loc[start:end],
+            returns_benchmark.loc[start:end],
+        ).summary
+        np.testing.assert_allclose(row, summary[metric].astype(float), rtol=1e-8)
+
+
+def test_top_k():
+
+    values = np.array([[3.0, np.nan, 5.0, 1.0], [0.0, 2.0, -1.0, 4.0]])
+
+    np.testing.assert_array_equal(top_k(values, 2), [[2, 0], [3, 1]])
+    np.testing.assert_array_equal(top_k(values, 2, largest=False), [[3, 0], [2, 0]])
+    np.testing.assert_array_equal(top_k(values, 10)[0], [2, 0, 3, 1])
+
+
+def test_screen(returns):
+
+    returns, _, _ = returns
+    windows = rolling_windows(returns.index, length=100, step=50)
+
+    ranked = screen(returns, "Sharpe Ratio", windows, k=5)
+
+    assert len(windows) == 7
+    assert len(ranked) == 7 * 5
+    assert ranked["rank"].tolist()[:5] == [1, 2, 3, 4, 5]
+    for (start, end), group in ranked.groupby(["window_start", "window_end"]):
+        expected = Performance(returns.loc[start:end]).summary["Sharpe Ratio"]
+        assert group["asset"].tolist() == expected.nlargest(5).index.tolist()
+
+    ranked = screen(returns, "Beta", [("2015-01-01", "2015-06-30")], k=3)
+    assert ranked["window_end"].iloc[0].month == 6
+
+
+def test_screening_module():
+
+    import dafin.screening
+
+    assert dafin.screen is dafin.screening.screen
+    assert "Sharpe Ratio" in dafin.screening.SCREEN_METRICS
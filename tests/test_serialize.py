@@ -0,0 +1,50 @@
+import pickle
+
+import pandas as pd
+
+from dafin import Performance, ReturnsData
+from dafin.serialize import dumps, loads
+
+from .utils import synthetic_returns
+
+
+def test_pickle_performance():
+
+    returns = synthetic_returns(n_assets=200, n_days=250)
+    benchmark = synthetic_returns(n_assets=1, seed=1, prefix="Benchmark")
+    performance = Performance(returns, returns_benchmark=benchmark)
+    performance.summary
+
+    data = pickle.dumps(performance)
+    full_size = len(pickle.dumps(performance.__dict__))
+    assert len(data) * 3 < full_size
+
+    restored = pickle.loads(data)
+    assert "cov" not in restored.__dict__
+    pd.testing.assert_frame_equal(restored.summary, performance.summary)
+    pd.testing.assert_frame_equal(restored.cov, performance.cov)
+    assert restored.asset_rf == "RiskFree"
+
+    data, buffers = dumps(performance)
+    assert len(data) < returns.to_numpy().nbytes / 10
+    restored = loads(data, buffers)
+    pd.testing.assert_frame_equal(restored.returns_assets, returns)
+
+
+def test_pickle_returns_data():
+
+    prices = (1 + synthetic_returns()).cumprod()
+    returns_data = ReturnsData.__new__(ReturnsData)
+    returns_data.__setstate__(
+        {
+            "assets": prices.columns.tolist(),
+            "col_price": "Close",
+            "_hash": 1,
+            "prices": (prices.to_numpy(), prices.index, prices.columns),
+        }
+    )
+
+    restored = pickle.loads(pickle.dumps(returns_data))
+    pd.testing.assert_frame_equal(restored.prices, prices)
+    pd.testing.assert_frame_equal(restored.get_returns(), returns_data.get_returns())
+    assert hash(restored) == hash(returns_data)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dafin import Performance, SnapshotStore
+
+from .utils import synthetic_returns
+
+
+@pytest.fixture
+def returns():
+    return synthetic_returns(n_assets=6, n_days=400)
+
+
+@pytest.fixture
+def benchmark():
+    return synthetic_returns(n_assets=1, n_days=400, seed=1, prefix="B")
+
+
+def test_snapshots(tmp_path, returns, benchmark):
+
+    store = SnapshotStore.create(
+        tmp_path / "store", returns, window=100, returns_benchmark=benchmark
+    )
+
+    assert len(store) == 301
+    assert store.dates.equals(returns.index[99:])
+
+    # A snapshot matches the Performance of its trailing window
+    date = returns.index[250]
+    summary = Performance(
+        returns.iloc[151:251], returns_benchmark=benchmark.iloc[151:251]
+    ).summary
+    snapshot = store.as_of(date)
+    for metric in ["Sharpe Ratio", "Beta", "Alpha", "Standard Deviation"]:
+        np.testing.assert_allclose(snapshot[metric], summary[metric].astype(float))
+
+    # Between snapshots, the previous one applies
+    pd.testing.assert_series_equal(
+        store.as_of(date + pd.Timedelta(hours=12), "Beta"), snapshot["Beta"]
+    )
+    assert store.as_of(date.strftime("%Y-%m-%d"), "Beta", ["A2"]).index == ["A2"]
+
+    with pytest.raises(KeyError):
+        store.as_of(returns.index[98])
+    with pytest.raises(FileExistsError):
+        SnapshotStore.create(tmp_path / "store", returns)
+
+
+def test_snapshots_update(tmp_path, returns, benchmark):
+
+    full = SnapshotStore.create(
+        tmp_path / "full", returns, window=100, returns_benchmark=benchmark
+    )
+    store = SnapshotStore.create(
+        tmp_path / "store",
+        returns.iloc[:300],
+        window=100,
+        returns_benchmark=benchmark,
+    )
+
+    # An interrupted update leaves uncommitted bytes, which are discarded
+    with open(tmp_path / "store" / "dates.bin", "ab") as file:
+        file.write(b"\0" * 12)
+
+    # Only the new dates are computed, from the returns of their windows
+    assert store.update(returns.iloc[200:], returns_benchmark=benchmark) == 100
+    assert store.update(returns.iloc[200:], returns_benchmark=benchmark) == 0
+
+    store = SnapshotStore(tmp_path / "store")
+    assert store.dates.equals(full.dates)
+    for metric in full.metrics:
+        np.testing.assert_allclose(store.values(metric), full.values(metric))
+    pd.testing.assert_series_equal(
+        store.history("Sharpe Ratio", "A1"), full.history("Sharpe Ratio", "A1")
+    )
+
+    with pytest.raises(ValueError):
+        store.update(returns.iloc[:200], returns_benchmark=benchmark)
+    with pytest.raises(ValueError):
+        store.update(returns.drop(columns="A0"), returns_benchmark=benchmark)
+
+    # The benchmark of the store is required, with the same returns
+    with pytest.raises(ValueError, match="benchmark"):
+        store.update(returns)
+    with pytest.raises(ValueError, match="benchmark"):
+        store.update(returns, returns_benchmark=benchmark * 2)
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dafin import Performance, SyntheticMarket, summary_chunked
+from dafin.chunked import open_memmap
+
+
+@pytest.fixture
+def market():
+    return SyntheticMarket(
+        n_assets=300, n_days=500, seed=3, inception=0.4, gap_prob=0.01
+    )
+
+
+def test_reproducible(market):
+
+    prices = market.prices()
+
+    again = SyntheticMarket(
+        n_assets=300, n_days=500, seed=3, inception=0.4, gap_prob=0.01
+    ).prices()
+    pd.testing.assert_frame_equal(prices, again)
+
+    # Streaming in chunks, or selecting assets, generates the same prices
+    chunks = pd.concat(list(market.iter_chunks(chunk_size=70)), axis=1)
+    pd.testing.assert_frame_equal(chunks, prices)
+    pd.testing.assert_frame_equal(
+        market.prices(assets=["S280", "S3"]), prices[["S280", "S3"]]
+    )
+
+    other = SyntheticMarket(n_assets=300, n_days=500, seed=4).prices()
+    assert not np.allclose(other.fillna(0), prices.fillna(0))
+
+
+def test_fields(market):
+
+    history = market.history("S7")
+
+    assert history.columns.tolist() == ["Open", "High", "Low", "Close", "Volume"]
+    assert not history.isna().any().any()
+    assert (history["High"] >= history[["Open", "Close"]].max(axis=1)).all()
+    assert (history["Low"] <= history[["Open", "Close"]].min(axis=1)).all()
+
+    # Staggered inception and missing bars
+    prices = market.prices()
+    first = prices.apply(pd.Series.first_valid_index)
+    assert first.nunique() > 100
+    assert 0 < prices.loc[first.max() :].isna().mean().mean() < 0.05
+
+    with pytest.raises(ValueError):
+        market.prices("Adj Close")
+    with pytest.raises(ValueError):
+        market.prices(assets=["AAPL"])
+
+
+def test_factor_structure():
+
+    market = SyntheticMarket(n_assets=50, n_days=1000, factor_share=0.5)
+    returns = market.prices().pct_change().dropna()
+
+    corr = returns.corr().to_numpy()[np.triu_indices(50, 1)]
+    assert 0.3 < corr.mean() < 0.7
+    assert (returns.kurt() > 0).mean() > 0.8
+
+    independent = SyntheticMarket(n_assets=50, n_days=1000, n_factors=0)
+    corr = independent.prices().pct_change().corr().to_numpy()[np.triu_indices(50, 1)]
+    assert abs(corr.mean()) < 0.05
+
+
+def test_returns_data(market):
+
+    returns_data = market.returns_data(["S0", "S1", "S2"])
+    returns = returns_data.returns
+    performance = Performance(
+        returns, returns_benchmark=market.factor_returns().loc[returns.index]
+    )
+
+    assert returns_data.assets == ["S0", "S1", "S2"]
+    assert not returns_data.returns.isna().any().any()
+    assert performance.summary.shape[0] == 3
+
+
+def test_write_memmap(tmp_path, market):
+
+    path = market.write_memmap(tmp_path / "universe", returns=True, chunk_size=100)
+    array, index, columns = open_memmap(path)
+
+    expected = market.prices().pct_change(fill_method=None).iloc[1:]
+    np.testing.assert_allclose(array, expected.to_numpy())
+    assert index.equals(pd.DatetimeIndex(expected.index.astype(str)))
+    assert columns == market.assets
+
+    summary = summary_chunked(path, block_size=64)
+    assert summary.index.tolist() == market.assets
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy as sp
+
+from dafin import Performance
+from dafin.utils import calculate_tail_risk, rolling_tail_risk
+
+from .utils import synthetic_returns
+
+
+@pytest.fixture
+def returns():
+    returns = synthetic_returns(n_assets=4, n_days=300)
+    returns.iloc[10:20, 1] = np.nan
+    return returns
+
+
+def test_historical(returns):
+
+    var, cvar = calculate_tail_risk(returns, [0.95, 0.99])
+
+    for asset in returns:
+        x = np.sort(returns[asset].dropna())
+        for level in [0.95, 0.99]:
+            k = int(np.ceil((1 - level) * len(x)))
+            assert var.loc[asset, level] == pytest.approx(-np.quantile(x, 1 - level))
+            assert cvar.loc[asset, level] == pytest.approx(-x[:k].mean())
+
+
+def test_parametric(returns):
+
+    var, cvar = calculate_tail_risk(returns, 0.99, "gaussian")
+
+    z = sp.stats.norm.ppf(0.01)
+    mean, sd = returns.mean(), returns.std()
+    np.testing.assert_allclose(var[0.99], -(mean + z * sd))
+    np.testing.assert_allclose(cvar[0.99], -(mean - sd * sp.stats.norm.pdf(z) / 0.01))
+
+    # Without skewness, fat tails widen the 99% quantile
+    symmetric = pd.concat([returns, -returns]).set_axis(
+        pd.bdate_range("2015-01-01", periods=2 * len(returns), tz="UTC")
+    )
+    var_cf, cvar_cf = calculate_tail_risk(symmetric, 0.99, "cornish_fisher")
+    var_gauss, cvar_gauss = calculate_tail_risk(symmetric, 0.99, "gaussian")
+    kurt = symmetric.kurt()
+    assert ((var_cf[0.99] > var_gauss[0.99]) == (kurt > 0)).all()
+    assert (cvar_cf[0.99] > var_cf[0.99]).all()
+
+    with pytest.raises(ValueError):
+        calculate_tail_risk(returns, 0.95, "bootstrap")
+    with pytest.raises(ValueError):
+        calculate_tail_risk(returns, 95)
+
+
+@pytest.mark.parametrize("method", ["historical", "gaussian", "cornish_fisher"])
+def test_rolling(returns, method):
+
+    var, cvar = rolling_tail_risk(returns, 50, 0.95, method, block_size=1000)
+
+    assert var.index.equals(returns.index[49:])
+    for i in [0, 137, len(var) - 1]:
+        expected = calculate_tail_risk(returns.iloc[i : i + 50], 0.95, method)
+        np.testing.assert_allclose(var.iloc[i], expected[0][0.95])
+        np.testing.assert_allclose(cvar.iloc[i], expected[1][0.95])
+
+    levels = rolling_tail_risk(returns, 50, [0.95, 0.99], method)[0]
+    pd.testing.assert_frame_equal(levels[0.95], var)
+
+
+def test_performance_tail_risk(returns):
+
+    performance = Performance(returns)
+    var, cvar = calculate_tail_risk(returns)
+
+    np.testing.assert_allclose(performance.summary["Value at Risk"], var[0.95])
+    np.testing.assert_allclose(
+        performance.summary["Conditional Value at Risk"], cvar[0.95]
+    )
+
+    tail_risk = performance.tail_risk([0.95, 0.99], "gaussian", window=60)
+    assert tail_risk.columns.nlevels == 3
+    assert len(tail_risk) == len(returns) - 59
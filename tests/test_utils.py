@@ -0,0 +1,25 @@
+import numpy as np
+
+from dafin.utils import calc_annualized_returns, calculate_treynor_ratio
+
+from .utils import synthetic_returns
+
+
+def test_treynor_ratio():
+
+    returns = synthetic_returns(n_assets=3)
+    returns_rf = synthetic_returns(n_assets=1, seed=1, prefix="R") / 100
+    returns_benchmark = synthetic_returns(n_assets=1, seed=2, prefix="B")
+
+    treynor = calculate_treynor_ratio(returns, returns_rf, returns_benchmark)
+
+    # Each asset divides its own excess return by its own beta
+    x = returns.to_numpy()
+    y = returns_benchmark.to_numpy()[:, 0]
+    beta = [np.cov(x[:, i], y)[0, 1] / y.var(ddof=1) for i in range(x.shape[1])]
+    excess = (
+        calc_annualized_returns(returns) - calc_annualized_returns(returns_rf).iloc[0]
+    )
+    np.testing.assert_allclose(
+        np.asarray(treynor, dtype=float).ravel(), excess.to_numpy() / beta
+    )
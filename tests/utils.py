@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 # assets
@@ -39,3 +40,12 @@ params_performance = []
 for a in assets_list:
     for s in [single_asset[0], None]:
         params_performance.append((a, s))
+
+
+def synthetic_returns(n_assets=5, n_days=300, seed=0, prefix="A"):
+
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2015-01-01", periods=n_days, tz="UTC")
+    columns = [f"{prefix}{i}" for i in range(n_assets)]
+    data = rng.normal(0.0005, 0.01, size=(n_days, n_assets))
+    return pd.DataFrame(data=data, index=index, columns=columns)